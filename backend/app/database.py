@@ -1,6 +1,8 @@
 import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -9,18 +11,83 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")  # .env에서 불러오기
 
-engine = create_engine(DATABASE_URL)
+def to_async_url(url: str):
+    """
+    psycopg2용 DATABASE_URL을 asyncpg 드라이버 URL로 변환
+    - libpq 전용 options(-csearch_path=...)는 asyncpg의 server_settings로 옮김
+
+    Returns:
+        (URL, connect_args)
+    """
+    sa_url = make_url(url)
+    if not sa_url.drivername.startswith("postgresql"):
+        return sa_url, {}
+    server_settings = {}
+    for option in str(sa_url.query.get("options", "")).split():
+        if option.startswith("-c") and "=" in option:
+            key, value = option[2:].split("=", 1)
+            server_settings[key] = value
+    sa_url = sa_url.set(drivername="postgresql+asyncpg").difference_update_query(["options"])
+    return sa_url, ({"server_settings": server_settings} if server_settings else {})
+
+# 비동기 라우터용 URL (지정하지 않으면 DATABASE_URL에서 변환)
+ASYNC_DATABASE_URL, ASYNC_CONNECT_ARGS = to_async_url(os.getenv("ASYNC_DATABASE_URL") or DATABASE_URL)
+
+# 커넥션 풀 설정 (환경 변수로 조정)
+# - DB_POOL_SIZE: 유지할 커넥션 수
+# - DB_MAX_OVERFLOW: 순간 부하 시 추가로 열 수 있는 커넥션 수
+# - DB_POOL_TIMEOUT: 풀이 가득 찼을 때 커넥션을 기다리는 시간(초)
+# - DB_POOL_RECYCLE: 커넥션을 재생성하는 주기(초, -1이면 사용 안 함)
+# - DB_POOL_PRE_PING: 커넥션 사용 전 연결 상태 확인 여부
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+}
+
+# 동기 엔진: 마이그레이션 등 CLI 작업용
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진: API 서버용 (이벤트 루프를 막지 않음)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, connect_args=ASYNC_CONNECT_ARGS, **POOL_OPTIONS)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def init_db():
-    from app.models import yj_posts, yj_attachments, yj_comments, yj_users
-    Base.metadata.create_all(bind=engine)
+async def init_db():
+    from app.models import yj_posts, yj_attachments, yj_comments, yj_users, yj_counters, yj_blobs, yj_uploads
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def close_db():
+    """풀에 남은 커넥션을 모두 닫습니다. (서버 종료 시 호출)"""
+    await async_engine.dispose()
+    engine.dispose()
+
+def get_pool_status() -> dict:
+    """API 서버 커넥션 풀의 현재 상태"""
+    pool = async_engine.pool
+    return {
+        "size": pool.size(),
+        "checkedIn": pool.checkedin(),
+        "checkedOut": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "maxOverflow": POOL_OPTIONS["max_overflow"],
+        "timeout": POOL_OPTIONS["pool_timeout"],
+        "recycle": POOL_OPTIONS["pool_recycle"],
+        "prePing": POOL_OPTIONS["pool_pre_ping"],
+    }
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,18 +1,28 @@
-from fastapi import FastAPI
-from app.routers import auth, posts, files, comments
-import asyncpg
-import asyncio
-import os
+from fastapi import FastAPI, Depends
+from app.routers import auth, posts, files, comments, events, uploads
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
-from app.models.yj_users import YJUsers
-from app.database import get_db, init_db
+from sqlalchemy import text
+from app.database import async_engine, AsyncSessionLocal, init_db, close_db, get_pool_status
+from app.utils.token import get_current_user_id
+from app.utils.view_counter import view_counter
+from app.utils.events import event_broker
+from app.utils.upload_sessions import upload_session_cleaner
+from app.utils.thumbnails import thumbnail_pipeline
+from app.utils.blob_gc import blob_gc
+from app.utils.count_reconcile import reconcile_post_total
 from fastapi.openapi.utils import get_openapi
-from fastapi.staticfiles import StaticFiles
+from app.utils.downloads import UploadStaticFiles
+from app.utils.log import setup_logging, shutdown_logging, RequestIdMiddleware
+import logging
 
 # 🔹 .env 파일 로드
 load_dotenv()
 
+# 🔹 로그 설정 (큐 기반 JSON 로그, app.utils.log 참고)
+setup_logging()
+logger = logging.getLogger(__name__)
+
 app = FastAPI()
 
 # 🔹 커스텀 OpenAPI 설정
@@ -52,37 +62,60 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Request-ID", "ETag", "Last-Modified", "Accept-Ranges", "Content-Range",
+        "Location", "Upload-Offset", "Upload-Length", "Upload-Expires",
+        "X-Next-Cursor", "Link",
+    ],
 )
 
+# 요청 ID 부여 및 접근 로그
+app.add_middleware(RequestIdMiddleware)
+
 # 라우터 등록
 app.include_router(auth.router)
 app.include_router(posts.router)
 app.include_router(files.router)
 app.include_router(comments.router)
+app.include_router(events.router)
+app.include_router(uploads.router)
 
-# 정적 파일 경로 설정
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# 정적 파일 경로 설정 (Range/조건부 요청 지원, app.utils.downloads 참고)
+app.mount("/uploads", UploadStaticFiles(directory="uploads"), name="uploads")
 
-# 🔄 DB 연결 함수 (환경 변수 사용)
-async def connect_to_db():
-    conn = await asyncpg.connect(
-        user=os.getenv("ASYNC_DB_USER"),
-        password=os.getenv("ASYNC_DB_PASSWORD"),
-        database=os.getenv("ASYNC_DB_NAME"),
-        host=os.getenv("ASYNC_DB_HOST"),
-        port=int(os.getenv("ASYNC_DB_PORT"))
-    )
-    print("데이터베이스에 연결되었습니다!")
-    return conn
+# 커넥션 풀 상태 조회
+@app.get("/api/health/db")
+async def db_pool_status(user_id: str = Depends(get_current_user_id)):
+    """
+    DB 커넥션 풀 상태 조회 API
+    - 풀 크기, 사용 중/대기 중 커넥션 수, 오버플로 수와 풀 설정값 반환
+    """
+    return get_pool_status()
 
-# 서버 시작 시 DB 연결 및 테이블 생성
+# 서버 시작 시 DB 연결 확인 및 테이블 생성
 @app.on_event("startup")
 async def startup_event():
-    app.state.db = await connect_to_db()
-    init_db()
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    logger.info("데이터베이스에 연결되었습니다!")
+    await init_db()
+    # 전체 게시글 수 카운터가 없으면 만들어 둠 (이후에는 작성/삭제 시 함께 증감)
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(reconcile_post_total, missing_only=True)
+    await event_broker.start()
+    view_counter.start()
+    upload_session_cleaner.start()
+    blob_gc.start()
 
-# 서버 종료 시 DB 연결 종료
+# 서버 종료 시 남은 조회수 반영 후 커넥션 풀 및 캐시 연결 종료
 @app.on_event("shutdown")
 async def shutdown_event():
-    await app.state.db.close()
-    print("데이터베이스 연결이 종료되었습니다.")
+    await view_counter.stop()
+    await upload_session_cleaner.stop()
+    await blob_gc.stop()
+    thumbnail_pipeline.stop()
+    await event_broker.stop()
+    await close_db()
+    logger.info("데이터베이스 연결이 종료되었습니다.")
+    await posts.post_list_cache.backend.close()
+    shutdown_logging()
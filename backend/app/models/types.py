@@ -0,0 +1,20 @@
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+import pytz
+
+# 한국 시간대 설정
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+class LocalDateTime(TypeDecorator):
+    """
+    TIMESTAMP WITHOUT TIME ZONE 컬럼 타입
+    - 타임존 정보가 있는 datetime은 한국 시간으로 변환한 뒤 타임존을 제거해 저장
+      (asyncpg는 타임존이 있는 값을 timestamp 컬럼에 바인딩하지 않음)
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(seoul_tz).replace(tzinfo=None)
+        return value
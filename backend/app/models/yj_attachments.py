@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from datetime import datetime
 from ..database import Base
+from .types import LocalDateTime
 import pytz
 
 # 한국 시간대 설정
@@ -8,7 +9,15 @@ seoul_tz = pytz.timezone('Asia/Seoul')
 
 class YJAttachments(Base):
     __tablename__ = 'yj_attachments'
-    __table_args__ = {'schema': 'vibecoding'}
+    __table_args__ = (
+        # 같은 파일(내용 해시)을 참조하는 첨부파일 조회용 인덱스 (저장 경로 변경, 참조 수 재계산)
+        Index('ix_yj_attachments_file_hash', 'file_hash'),
+        # 게시글별 첨부파일 목록(최신순 커서) 조회용 인덱스
+        Index('ix_yj_attachments_post_no_seq', 'post_no', 'seq'),
+        # 디스크의 파일이 첨부파일에서 사용 중인지 확인하는 GC용 인덱스
+        Index('ix_yj_attachments_file_path', 'file_path'),
+        {'schema': 'vibecoding'}
+    )
 
     seq = Column(Integer, primary_key=True, autoincrement=True)
     post_no = Column(Integer, ForeignKey('vibecoding.yj_posts.post_no'), nullable=False)
@@ -17,5 +26,9 @@ class YJAttachments(Base):
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)
     mime_type = Column(String(100), nullable=False)
+    # 파일 내용의 SHA-256 (hex, 업로드 시 저장과 같은 단계에서 계산)
+    file_hash = Column(String(64), nullable=True)
     is_delete = Column(String(1), default='N', nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(seoul_tz), nullable=True) 
\ No newline at end of file
+    created_at = Column(LocalDateTime, default=lambda: datetime.now(seoul_tz), nullable=True)
+    # 소프트 삭제 시각 (GC 보존 기간 기준, 값이 없으면 created_at 사용)
+    updated_at = Column(LocalDateTime, nullable=True) 
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Integer, Index, text
+from datetime import datetime
+from ..database import Base
+from .types import LocalDateTime
+import pytz
+
+# 한국 시간대 설정
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+class YJBlobs(Base):
+    __tablename__ = 'yj_blobs'
+    __table_args__ = (
+        # 디스크의 파일이 사용 중인지 확인하는 GC용 인덱스
+        Index('ix_yj_blobs_file_path', 'file_path'),
+        # 참조가 없어진 파일을 보존 기간이 지난 순서로 찾는 GC용 인덱스
+        Index('ix_yj_blobs_unreferenced', 'updated_at', postgresql_where=text('ref_cnt <= 0')),
+        {'schema': 'vibecoding'}
+    )
+
+    # 파일 내용의 SHA-256 (hex). 같은 내용의 첨부파일은 하나의 파일을 함께 사용
+    file_hash = Column(String(64), primary_key=True)
+    file_path = Column(String(500), nullable=False)
+    file_size = Column(Integer, nullable=False)
+    # 이 파일을 사용하는 삭제되지 않은 첨부파일 수
+    ref_cnt = Column(Integer, default=0, nullable=False)
+    created_at = Column(LocalDateTime, default=lambda: datetime.now(seoul_tz), nullable=True)
+    updated_at = Column(LocalDateTime, default=lambda: datetime.now(seoul_tz), onupdate=lambda: datetime.now(seoul_tz), nullable=True)
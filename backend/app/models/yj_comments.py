@@ -1,16 +1,27 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from datetime import datetime
 from ..database import Base
+from .types import LocalDateTime
 
 class YJComments(Base):
     __tablename__ = 'yj_comments'
-    __table_args__ = {'schema': 'vibecoding'}
+    __table_args__ = (
+        # 부모별 댓글 페이지(키셋) 조회와 답글 수 집계용 인덱스
+        Index('ix_yj_comments_post_no_parent_seq', 'post_no', 'parent_cmmt_no', 'seq'),
+        # 게시글별 댓글 트리를 path 순서(깊이 우선)로 조회하고, path 접두사로 하위 트리를 찾기 위한 인덱스
+        Index('ix_yj_comments_post_no_path', 'post_no', 'path'),
+        {'schema': 'vibecoding'}
+    )
 
     seq = Column(Integer, primary_key=True, autoincrement=True)
     post_no = Column(Integer, ForeignKey('vibecoding.yj_posts.post_no'), nullable=False)
     author_usrid = Column(String(50), nullable=False)
     contents = Column(String(500), nullable=True)
     parent_cmmt_no = Column(Integer, default=0, nullable=False)
+    # 루트부터 자신까지의 댓글 번호를 고정 길이로 이어 붙인 경로 (예: '0000000001/0000000005/')
+    # 바이트 순서로 비교되도록 C collation 사용 (app.utils.comment_tree 참고)
+    path = Column(String(collation='C'), nullable=True)
+    depth = Column(Integer, default=0, nullable=False)
     is_delete = Column(String(1), default='N', nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, nullable=True) 
\ No newline at end of file
+    created_at = Column(LocalDateTime, default=datetime.utcnow, nullable=True)
+    updated_at = Column(LocalDateTime, default=datetime.utcnow, nullable=True)
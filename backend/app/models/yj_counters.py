@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, BigInteger
+from datetime import datetime
+from ..database import Base
+from .types import LocalDateTime
+import pytz
+
+# 한국 시간대 설정
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+class YJCounters(Base):
+    __tablename__ = 'yj_counters'
+    __table_args__ = {'schema': 'vibecoding'}
+
+    counter_nm = Column(String(50), primary_key=True)
+    counter_val = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(LocalDateTime, default=lambda: datetime.now(seoul_tz), onupdate=lambda: datetime.now(seoul_tz), nullable=True)
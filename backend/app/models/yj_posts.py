@@ -1,6 +1,9 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from datetime import datetime
 from ..database import Base
+from .types import LocalDateTime
 import pytz
 
 # 한국 시간대 설정
@@ -8,7 +11,17 @@ seoul_tz = pytz.timezone('Asia/Seoul')
 
 class YJPosts(Base):
     __tablename__ = 'yj_posts'
-    __table_args__ = {'schema': 'vibecoding'}
+    __table_args__ = (
+        # 목록 키셋 페이지네이션용 (정렬값, post_no) 복합 인덱스
+        Index('ix_yj_posts_created_at_post_no', 'created_at', 'post_no'),
+        Index('ix_yj_posts_view_cnt_post_no', 'view_cnt', 'post_no'),
+        Index('ix_yj_posts_comment_cnt_post_no', 'comment_cnt', 'post_no'),
+        Index('ix_yj_posts_attach_cnt_post_no', 'attach_cnt', 'post_no'),
+        # 전문 검색용 GIN 인덱스 (app.utils.search 참고)
+        Index('ix_yj_posts_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_yj_posts_author_usrid', 'author_usrid'),
+        {'schema': 'vibecoding'},
+    )
 
     post_no = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(200), nullable=False)
@@ -17,6 +30,11 @@ class YJPosts(Base):
     video_url = Column(String(500), nullable=True)
     author_usrid = Column(String(50), nullable=False)
     view_cnt = Column(Integer, default=0, nullable=False)
+    # 삭제되지 않은 댓글/첨부파일 수 (작성/삭제 시 같은 트랜잭션에서 갱신, app.utils.counters 참고)
+    comment_cnt = Column(Integer, default=0, nullable=False)
+    attach_cnt = Column(Integer, default=0, nullable=False)
     is_delete = Column(String(1), default='N', nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(seoul_tz), nullable=True)
-    updated_at = Column(DateTime, default=lambda: datetime.now(seoul_tz), nullable=True) 
\ No newline at end of file
+    created_at = Column(LocalDateTime, default=lambda: datetime.now(seoul_tz), nullable=True)
+    updated_at = Column(LocalDateTime, default=lambda: datetime.now(seoul_tz), nullable=True) 
+    # 제목/본문 n-gram 검색 벡터 (목록 조회 시에는 로드하지 않음)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
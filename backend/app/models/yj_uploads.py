@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, BigInteger, ForeignKey, Index
+from datetime import datetime
+from ..database import Base
+from .types import LocalDateTime
+import pytz
+
+# 한국 시간대 설정
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+# 이어 올리기(resumable) 업로드 세션. 완료되면 첨부파일(yj_attachments)로 옮기고 삭제
+class YJUploads(Base):
+    __tablename__ = 'yj_uploads'
+    __table_args__ = (
+        # 만료된 세션 정리용 인덱스
+        Index('ix_yj_uploads_expires_at', 'expires_at'),
+        {'schema': 'vibecoding'}
+    )
+
+    upload_id = Column(String(32), primary_key=True)
+    post_no = Column(Integer, ForeignKey('vibecoding.yj_posts.post_no'), nullable=False)
+    usr_id = Column(String(50), nullable=False)
+    org_file_nm = Column(String(255), nullable=False)
+    mime_type = Column(String(100), nullable=False)
+    # 전체 파일 크기와 지금까지 받은 크기 (바이트)
+    file_size = Column(BigInteger, nullable=False)
+    upload_offset = Column(BigInteger, default=0, nullable=False)
+    created_at = Column(LocalDateTime, default=lambda: datetime.now(seoul_tz), nullable=True)
+    updated_at = Column(LocalDateTime, default=lambda: datetime.now(seoul_tz), onupdate=lambda: datetime.now(seoul_tz), nullable=True)
+    expires_at = Column(LocalDateTime, nullable=False)
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime
+from sqlalchemy import Column, String, Integer, Boolean
 from datetime import datetime
 from ..database import Base
+from .types import LocalDateTime
 
 class YJUsers(Base):
     __tablename__ = 'yj_users'
@@ -11,5 +12,5 @@ class YJUsers(Base):
     pwd = Column(String(255), nullable=False)
     is_active = Column(String(1), default='Y', nullable=False)
     login_fail_cnt = Column(Integer, default=0, nullable=False)
-    last_login_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=True) 
\ No newline at end of file
+    last_login_at = Column(LocalDateTime, nullable=True)
+    created_at = Column(LocalDateTime, default=datetime.utcnow, nullable=True) 
\ No newline at end of file
@@ -2,14 +2,16 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 import jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.yj_users import YJUsers
-from app.database import get_db
+from app.database import get_async_db
 from fastapi import Form
 from fastapi.security import OAuth2PasswordRequestForm
 import os
 from dotenv import load_dotenv
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 
 # .env 파일 로드
 load_dotenv()
@@ -47,7 +49,7 @@ def create_access_token(data: dict, expires_delta: timedelta):
     return encoded_jwt
 
 @router.post("/api/login")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """
     사용자 로그인 API
     - 아이디와 비밀번호를 받아 JWT 토큰을 발급합니다.
@@ -55,16 +57,17 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
 
     Args:
         form_data (OAuth2PasswordRequestForm): username(아이디), password(비밀번호)
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
 
     Returns:
         access_token (str): JWT 액세스 토큰
         token_type (str): 토큰 타입 (bearer)
         userName (str): 사용자 이름
     """
-    user = db.query(YJUsers).filter(YJUsers.usr_id == form_data.username).first()
+    user = await db.scalar(select(YJUsers).where(YJUsers.usr_id == form_data.username))
 
-    if not user or not verify_password(form_data.password, user.pwd):
+    # bcrypt 검증은 CPU를 오래 사용하므로 이벤트 루프 밖에서 실행
+    if not user or not await run_in_threadpool(verify_password, form_data.password, user.pwd):
         raise HTTPException(status_code=401, detail="아이디 또는 비밀번호가 일치하지 않습니다")
 
     access_token = create_access_token(
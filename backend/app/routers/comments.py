@@ -1,16 +1,28 @@
-from fastapi import APIRouter, HTTPException, Depends, Body, Form, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Body, Form, UploadFile, File, Header, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel
 from ..models.yj_comments import YJComments
 from ..models.yj_posts import YJPosts
-from ..database import get_db
+from ..models.yj_users import YJUsers
+from ..database import get_async_db
 from app.utils.token import get_current_user_id
+from app.utils.etag import get_comments_etag, etag_matches, not_modified, set_etag
+from app.utils.counters import adjust_post_counts
+from app.utils.cache import post_list_cache
+from app.utils.comment_tree import (
+    COMMENT_PAGE_SIZE, THREAD_PAGE_SIZE, make_comment_path, get_comment_page, get_comment_thread, serialize_comment
+)
+from app.utils.events import event_broker, post_channel
 from datetime import datetime
+import logging
 import pytz
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 # 한국 시간대 설정
 seoul_tz = pytz.timezone('Asia/Seoul')
 
@@ -29,99 +41,153 @@ class CommentResponse(BaseModel):
     updatedAt: str
     isDeleted: bool
     parent_id: int
+    depth: int = 0
+    replyCount: int = 0
     replies: List['CommentResponse'] = []
 
-@router.get("/api/posts/{id}/comments")
+class CommentPageResponse(BaseModel):
+    comments: List[CommentResponse]
+    nextCursor: Optional[str] = None
+
+@router.get("/api/posts/{id}/comments", response_model=CommentPageResponse)
 async def get_comments(
     id: int, 
-    db: Session = Depends(get_db)
+    response: Response,
+    after: Optional[str] = None,
+    size: int = COMMENT_PAGE_SIZE,
+    sortOrder: str = 'asc',
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     게시글 댓글 목록 조회 API
-    - 게시글의 모든 댓글과 대댓글을 계층 구조로 반환
-    - 삭제되지 않은 댓글만 조회
-    - 시간순으로 정렬
+    - 최상위 댓글을 커서 방식으로 한 페이지씩 반환 (각 댓글에 직속 답글 수 포함)
+    - 답글은 GET /api/comments/{comment_id}/replies로 조회
+    - 삭제되지 않은 댓글만 조회 (삭제된 댓글의 답글은 제외)
+    - If-None-Match가 현재 ETag와 같으면 댓글을 조회하지 않고 304 반환
 
     Args:
         id (int): 게시글 ID
-        db (Session): 데이터베이스 세션
+        after (str, optional): 이전 응답의 nextCursor 값
+        size (int): 페이지당 댓글 수 (기본값 20, 최대 100)
+        sortOrder (str): 작성 순서 정렬 방향 (asc, desc)
+        if_none_match (str, optional): 이전 응답의 ETag
+        db (AsyncSession): 데이터베이스 세션
 
     Returns:
-        List[CommentResponse]: 댓글 목록 (대댓글 포함)
+        comments (List[CommentResponse]): 최상위 댓글 목록
+        nextCursor (str): 다음 페이지 조회용 커서 (마지막 페이지면 None)
     """
-    post = db.query(YJPosts).filter(YJPosts.post_no == id).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    # 모든 댓글 조회 (시간순 정렬)
-    comments = db.query(YJComments).filter(
-        YJComments.post_no == id,
+    # 변경 여부 확인 (같은 게시글이라도 페이지/정렬마다 다른 ETag)
+    etag = await get_comments_etag(db, id, 0, after, size, sortOrder)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return await get_comment_page(db, id, after=after, size=size, sort_order=sortOrder)
+
+@router.get("/api/comments/{comment_id}/replies", response_model=CommentPageResponse)
+async def get_replies(
+    comment_id: int,
+    response: Response,
+    after: Optional[str] = None,
+    size: int = COMMENT_PAGE_SIZE,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    답글 목록 조회 API
+    - 댓글의 직속 답글을 작성 순으로 커서 방식으로 한 페이지씩 반환 (각 답글에 직속 답글 수 포함)
+
+    Args:
+        comment_id (int): 댓글 ID
+        after (str, optional): 이전 응답의 nextCursor 값
+        size (int): 페이지당 답글 수 (기본값 20, 최대 100)
+        if_none_match (str, optional): 이전 응답의 ETag
+        db (AsyncSession): 데이터베이스 세션
+
+    Returns:
+        comments (List[CommentResponse]): 답글 목록
+        nextCursor (str): 다음 페이지 조회용 커서 (마지막 페이지면 None)
+    """
+    comment = await db.scalar(select(YJComments).where(
+        YJComments.seq == comment_id,
+        YJComments.is_delete == 'N'
+    ))
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    # 변경 여부 확인 (게시글 댓글 전체 기준, 댓글과 페이지마다 다른 ETag)
+    etag = await get_comments_etag(db, comment.post_no, comment.seq, after, size)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return await get_comment_page(db, comment.post_no, parent_no=comment.seq, after=after, size=size)
+
+@router.get("/api/comments/{comment_id}/thread", response_model=CommentPageResponse)
+async def get_thread(
+    comment_id: int,
+    response: Response,
+    after: Optional[str] = None,
+    size: int = THREAD_PAGE_SIZE,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    답글 트리 조회 API
+    - 댓글 아래의 모든 깊이의 답글을 트리 형태로 깊이 우선 순서로 한 페이지씩 반환
+    - 하위 트리는 path 접두사로 조회하므로 스레드 크기만큼만 읽음
+
+    Args:
+        comment_id (int): 댓글 ID
+        after (str, optional): 이전 응답의 nextCursor 값
+        size (int): 페이지당 답글 수 (기본값 100, 최대 500)
+        if_none_match (str, optional): 이전 응답의 ETag
+        db (AsyncSession): 데이터베이스 세션
+
+    Returns:
+        comments (List[CommentResponse]): 직속 답글 목록 (replies에 하위 답글 포함)
+        nextCursor (str): 다음 페이지 조회용 커서 (마지막 페이지면 None)
+    """
+    comment = await db.scalar(select(YJComments).where(
+        YJComments.seq == comment_id,
         YJComments.is_delete == 'N'
-    ).order_by(YJComments.created_at).all()
-
-    print("=== Comments from DB ===")
-    for comment in comments:
-        print(f"ID: {comment.seq}, Parent: {comment.parent_cmmt_no}, Content: {comment.contents}")
-
-    # 댓글과 대댓글을 구조화
-    comment_dict = {}
-    structured_comments = []
-
-    # 먼저 모든 댓글을 딕셔너리에 저장
-    for comment in comments:
-        comment_dict[comment.seq] = {
-            "id": comment.seq,
-            "content": comment.contents,
-            "author": {
-                "id": comment.author_usrid,
-                "name": comment.author_usrid  # 임시로 author_usrid를 name으로 사용
-            },
-            "createdAt": comment.created_at.isoformat() if comment.created_at else "",
-            "updatedAt": comment.updated_at.isoformat() if comment.updated_at else "",
-            "isDeleted": comment.is_delete == 'Y',
-            "parent_id": comment.parent_cmmt_no,
-            "replies": []
-        }
-
-    # 댓글과 대댓글을 구조화
-    for comment in comments:
-        if comment.parent_cmmt_no == 0:  # 일반 댓글
-            structured_comments.append(comment_dict[comment.seq])
-        else:  # 대댓글
-            parent = comment_dict.get(comment.parent_cmmt_no)
-            if parent:
-                parent["replies"].append(comment_dict[comment.seq])
-
-    print("=== Structured Comments ===")
-    for comment in structured_comments:
-        print(f"Comment ID: {comment['id']}, Replies: {len(comment['replies'])}")
-        for reply in comment['replies']:
-            print(f"  Reply ID: {reply['id']}, Parent: {reply['parent_id']}")
-
-    # 대댓글도 시간순으로 정렬
-    for comment in structured_comments:
-        comment["replies"].sort(key=lambda x: x["createdAt"])
-
-    return structured_comments
+    ))
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    # 변경 여부 확인 (답글 목록과 구분되도록 'thread'를 포함)
+    etag = await get_comments_etag(db, comment.post_no, "thread", comment.seq, after, size)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return await get_comment_thread(db, comment, after=after, size=size)
 
 @router.post("/api/posts/{post_id}/comments")
 async def create_comment(
     post_id: int,
     content: str = Form(...),
     parent_comment_id: Optional[int] = Form(0),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     댓글 작성 API
     - 게시글에 새로운 댓글을 작성
-    - 대댓글 작성 지원 (parent_comment_id로 지정)
+    - 답글 작성 지원 (parent_comment_id로 지정, 깊이 제한 없음)
+    - 부모 댓글의 path 뒤에 새 댓글 번호를 붙여 path/depth 저장
 
     Args:
         post_id (int): 게시글 ID
         content (str): 댓글 내용
         parent_comment_id (int, optional): 부모 댓글 ID (대댓글인 경우)
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
@@ -129,17 +195,18 @@ async def create_comment(
         comment_id (int): 작성된 댓글 ID
     """
     # 게시글 존재 여부 확인
-    post = db.query(YJPosts).filter(YJPosts.post_no == post_id).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == post_id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # 부모 댓글이 있는 경우, 해당 댓글이 같은 게시글에 속하는지 확인
+    parent_comment = None
     if parent_comment_id > 0:
-        parent_comment = db.query(YJComments).filter(
+        parent_comment = await db.scalar(select(YJComments).where(
             YJComments.seq == parent_comment_id,
             YJComments.post_no == post_id,
             YJComments.is_delete == 'N'
-        ).first()
+        ))
         if not parent_comment:
             raise HTTPException(status_code=404, detail="Parent comment not found")
 
@@ -149,13 +216,25 @@ async def create_comment(
         author_usrid=user_id,
         contents=content,
         parent_cmmt_no=parent_comment_id,
+        depth=parent_comment.depth + 1 if parent_comment else 0,
         created_at=datetime.now(seoul_tz),
         updated_at=datetime.now(seoul_tz)
     )
     
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    # 댓글 번호가 정해진 뒤 경로 설정
+    await db.flush()
+    new_comment.path = make_comment_path(parent_comment.path if parent_comment else None, new_comment.seq)
+    await adjust_post_counts(db, post_id, comments=1)
+    await db.commit()
+    await post_list_cache.invalidate()
+    await db.refresh(new_comment)
+
+    # 게시글 이벤트 구독자에게 새 댓글 전달
+    author_name = await db.scalar(select(YJUsers.usr_nm).where(YJUsers.usr_id == user_id))
+    await event_broker.publish(
+        post_channel(post_id), "comment.created", serialize_comment(new_comment, author_name, 0)
+    )
     
     return {"message": "Comment created successfully", "comment_id": new_comment.seq}
 
@@ -163,7 +242,7 @@ async def create_comment(
 async def update_comment(
     comment_id: int,
     content: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -173,42 +252,49 @@ async def update_comment(
     Args:
         comment_id (int): 댓글 ID
         content (str): 수정할 댓글 내용
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         message (str): 수정 결과 메시지
     """
-    print(f"Updating comment {comment_id} with content: {content}")
+    logger.debug("댓글 수정 요청", extra={"comment_id": comment_id, "user_id": user_id})
     
-    comment = db.query(YJComments).filter(
+    comment = await db.scalar(select(YJComments).where(
         YJComments.seq == comment_id,
         YJComments.is_delete == 'N'
-    ).first()
+    ))
     
     if not comment:
-        print(f"Comment {comment_id} not found")
         raise HTTPException(status_code=404, detail="Comment not found")
     
     if comment.author_usrid != user_id:
-        print(f"User {user_id} not authorized to update comment {comment_id}")
+        logger.warning("댓글 수정 권한 없음", extra={"comment_id": comment_id, "user_id": user_id})
         raise HTTPException(status_code=403, detail="Not authorized to update this comment")
     
     try:
         comment.contents = content
         comment.updated_at = datetime.now(seoul_tz)
-        db.commit()
-        print(f"Comment {comment_id} updated successfully")
-        return {"message": "Comment updated successfully"}
+        await db.commit()
+        await db.refresh(comment)
+        logger.info("댓글 수정 완료", extra={"comment_id": comment_id})
     except Exception as e:
-        print(f"Error updating comment {comment_id}: {str(e)}")
-        db.rollback()
+        logger.exception("댓글 수정 실패", extra={"comment_id": comment_id})
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating comment: {str(e)}")
 
+    await event_broker.publish(post_channel(comment.post_no), "comment.updated", {
+        "id": comment.seq,
+        "parent_id": comment.parent_cmmt_no,
+        "content": comment.contents,
+        "updatedAt": comment.updated_at.isoformat() if comment.updated_at else ""
+    })
+    return {"message": "Comment updated successfully"}
+
 @router.delete("/api/comments/{comment_id}")
 async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -217,16 +303,16 @@ async def delete_comment(
 
     Args:
         comment_id (int): 댓글 ID
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         message (str): 삭제 결과 메시지
     """
-    comment = db.query(YJComments).filter(
+    comment = await db.scalar(select(YJComments).where(
         YJComments.seq == comment_id,
         YJComments.is_delete == 'N'
-    ).first()
+    ))
     
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -237,6 +323,13 @@ async def delete_comment(
     # 댓글 삭제 처리 (실제로 삭제하지 않고 is_delete 플래그만 변경)
     comment.is_delete = 'Y'
     comment.updated_at = datetime.now(seoul_tz)
+    await adjust_post_counts(db, comment.post_no, comments=-1)
     
-    db.commit()
+    await db.commit()
+    await post_list_cache.invalidate()
+
+    await event_broker.publish(post_channel(comment.post_no), "comment.deleted", {
+        "id": comment.seq,
+        "parent_id": comment.parent_cmmt_no
+    })
     return {"message": "Comment deleted successfully"} 
\ No newline at end of file
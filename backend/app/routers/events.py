@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from ..models.yj_posts import YJPosts
+from ..database import AsyncSessionLocal
+from app.utils.events import event_broker, post_channel
+import asyncio
+import os
+
+router = APIRouter()
+
+# 이벤트가 없을 때 연결 유지용 주석을 보내는 주기(초)
+SSE_KEEPALIVE_INTERVAL = float(os.getenv("SSE_KEEPALIVE_INTERVAL", "15"))
+# 한 연결의 최대 유지 시간(초). 끝나면 브라우저(EventSource)가 retry 간격 후 자동으로 다시 연결
+SSE_MAX_DURATION = float(os.getenv("SSE_MAX_DURATION", "300"))
+SSE_RETRY_MS = 3000
+
+@router.get("/api/posts/{id}/events")
+async def stream_post_events(id: int):
+    """
+    게시글 실시간 이벤트 스트림 API (Server-Sent Events)
+    - 댓글 작성/수정/삭제와 조회수 변경을 data 필드에 {"type": ..., "data": ...} JSON으로 전달
+    - 스트림을 유지하는 동안 DB 커넥션을 점유하지 않도록 게시글 확인 후 바로 세션을 닫음
+
+    Args:
+        id (int): 게시글 ID
+
+    Returns:
+        StreamingResponse: text/event-stream 응답
+    """
+    async with AsyncSessionLocal() as db:
+        post_no = await db.scalar(select(YJPosts.post_no).where(
+            YJPosts.post_no == id,
+            YJPosts.is_delete == 'N'
+        ))
+    if post_no is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SSE_MAX_DURATION
+        async with event_broker.subscribe(post_channel(id)) as subscription:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            while loop.time() < deadline:
+                message = await subscription.get(timeout=SSE_KEEPALIVE_INTERVAL)
+                if message is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"data: {message}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,26 +1,42 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.yj_attachments import YJAttachments
 from ..models.yj_posts import YJPosts
-from ..database import get_db
+from ..database import get_async_db, AsyncSessionLocal
 import os
-from fastapi.responses import FileResponse
-from typing import List
+import json
+from typing import List, Optional
 from pydantic import BaseModel
 from app.utils.token import get_current_user_id
+from app.utils.counters import adjust_post_counts
+from app.utils.cache import post_list_cache
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.uploads import is_allowed_file
+from app.utils.blob_store import store_upload, release_blob
+from app.utils.downloads import file_download_response
+from app.utils.thumbnails import (
+    THUMBNAIL_WIDTHS, THUMBNAIL_FORMAT, THUMBNAIL_MEDIA_TYPES,
+    thumbnail_pipeline, thumbnail_key, is_thumbnail_source
+)
+from app.utils.precompress import schedule_precompress
+from starlette.concurrency import run_in_threadpool
+import logging
 import pytz
 from datetime import datetime
 
 router = APIRouter()
-
-UPLOAD_DIRECTORY = "./uploads"
-
-if not os.path.exists(UPLOAD_DIRECTORY):
-    os.makedirs(UPLOAD_DIRECTORY)
+logger = logging.getLogger(__name__)
 
 # 한국 시간대 설정
 seoul_tz = pytz.timezone('Asia/Seoul')
 
+# 첨부파일 목록 페이지 크기와 스트리밍 시 한 번에 읽는 행 수
+ATTACHMENT_PAGE_SIZE = 50
+MAX_ATTACHMENT_PAGE_SIZE = 100
+ATTACHMENT_STREAM_BATCH = int(os.getenv("ATTACHMENT_STREAM_BATCH", "500"))
+
 class AttachmentResponse(BaseModel):
     id: int
     post_no: int
@@ -31,41 +47,154 @@ class AttachmentResponse(BaseModel):
     mime_type: str
     created_at: str
 
+def serialize_attachment(a: YJAttachments) -> dict:
+    """첨부파일 목록 응답 항목"""
+    return {
+        "id": a.seq,
+        "post_no": a.post_no,
+        "filename": a.file_nm,
+        "original_filename": a.org_file_nm,
+        "file_path": a.file_path.replace('./', '/').replace('\\', '/'),
+        "file_size": a.file_size,
+        "mime_type": a.mime_type,
+        "created_at": a.created_at.isoformat() if a.created_at else None
+    }
+
+def attachment_list_query(
+    post_id: Optional[int],
+    mime_type: Optional[str],
+    deleted: str,
+    created_from: Optional[datetime],
+    created_to: Optional[datetime]
+):
+    """
+    첨부파일 목록 조회 조건 (최신순, seq 내림차순)
+    - mime_type은 정확히 일치하거나 "image/*"처럼 주 타입만 지정
+    - deleted: N(삭제되지 않은 것, 기본값), Y(소프트 삭제된 것), all(전체)
+    - 작성일시는 created_from 이상, created_to 미만
+    """
+    if deleted not in ('N', 'Y', 'all'):
+        raise HTTPException(status_code=400, detail="deleted는 N, Y, all 중 하나여야 합니다")
+
+    query = select(YJAttachments)
+    if post_id is not None:
+        query = query.where(YJAttachments.post_no == post_id)
+    if mime_type:
+        if mime_type.endswith('/*'):
+            query = query.where(YJAttachments.mime_type.startswith(mime_type[:-1], autoescape=True))
+        else:
+            query = query.where(YJAttachments.mime_type == mime_type)
+    if deleted != 'all':
+        query = query.where(YJAttachments.is_delete == deleted)
+    if created_from is not None:
+        query = query.where(YJAttachments.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(YJAttachments.created_at < created_to)
+    return query.order_by(YJAttachments.seq.desc())
+
+def _parse_attachment_cursor(cursor: str) -> int:
+    """커서를 마지막 첨부파일 번호로 복원"""
+    data = decode_cursor(cursor)
+    try:
+        return int(data["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다")
+
 @router.get("/api/attachments", response_model=List[AttachmentResponse])
 async def list_attachments(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    post_id: Optional[int] = None,
+    mime_type: Optional[str] = None,
+    deleted: str = 'N',
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    after: Optional[str] = None,
+    size: int = ATTACHMENT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     첨부파일 목록 조회 API
-    - 모든 첨부파일의 정보를 반환
+    - 조건에 맞는 첨부파일을 최신순으로 size개씩 반환 (첨부파일 번호 키셋 커서)
+    - 응답 본문은 기존과 같은 첨부파일 배열이며, 다음 페이지 커서는 X-Next-Cursor 헤더와
+      Link 헤더(rel="next")로 전달 (마지막 페이지면 헤더 없음)
+    - 전체 목록이 필요하면 GET /api/attachments/stream 사용
 
     Args:
-        db (Session): 데이터베이스 세션
+        post_id (int, optional): 게시글 ID
+        mime_type (str, optional): MIME 타입 ("image/*"처럼 주 타입만 지정 가능)
+        deleted (str): N(기본값), Y(소프트 삭제된 것만), all
+        created_from (datetime, optional): 업로드 일시 시작 (포함)
+        created_to (datetime, optional): 업로드 일시 끝 (미포함)
+        after (str, optional): 이전 응답의 X-Next-Cursor 헤더 값
+        size (int): 페이지당 첨부파일 수 (최대 100)
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
-        첨부파일 목록 (List[AttachmentResponse])
+        List[AttachmentResponse]: 첨부파일 목록
     """
-    attachments = db.query(YJAttachments).all()
-    return [
-        {
-            "id": a.seq,
-            "post_no": a.post_no,
-            "filename": a.file_nm,
-            "original_filename": a.org_file_nm,
-            "file_path": a.file_path.replace('./', '/').replace('\\', '/'),
-            "file_size": a.file_size,
-            "mime_type": a.mime_type,
-            "created_at": a.created_at.isoformat() if a.created_at else None
-        }
-        for a in attachments
-    ]
+    if size < 1 or size > MAX_ATTACHMENT_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"size는 1~{MAX_ATTACHMENT_PAGE_SIZE} 사이여야 합니다")
+
+    query = attachment_list_query(post_id, mime_type, deleted, created_from, created_to)
+    if after:
+        query = query.where(YJAttachments.seq < _parse_attachment_cursor(after))
+
+    # 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+    attachments = (await db.scalars(query.limit(size + 1))).all()
+    if len(attachments) > size:
+        attachments = attachments[:size]
+        next_cursor = encode_cursor({"id": attachments[-1].seq})
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(after=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return [serialize_attachment(a) for a in attachments]
+
+@router.get("/api/attachments/stream")
+async def stream_attachments(
+    post_id: Optional[int] = None,
+    mime_type: Optional[str] = None,
+    deleted: str = 'N',
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    첨부파일 전체 목록 스트리밍 API (NDJSON, 한 줄에 첨부파일 하나)
+    - 서버 측 커서로 ATTACHMENT_STREAM_BATCH건씩 읽어 바로 보내므로 목록 크기와 관계없이 메모리 사용량이 일정
+    - 응답이 끝날 때까지 세션을 유지해야 하므로 요청 의존성 대신 스트림 안에서 세션을 엶
+
+    Args:
+        post_id (int, optional): 게시글 ID
+        mime_type (str, optional): MIME 타입 ("image/*"처럼 주 타입만 지정 가능)
+        deleted (str): N(기본값), Y(소프트 삭제된 것만), all
+        created_from (datetime, optional): 업로드 일시 시작 (포함)
+        created_to (datetime, optional): 업로드 일시 끝 (미포함)
+        user_id (str): 인증된 사용자 ID
+
+    Returns:
+        StreamingResponse: application/x-ndjson 응답
+    """
+    query = attachment_list_query(post_id, mime_type, deleted, created_from, created_to)
+
+    async def ndjson_stream():
+        async with AsyncSessionLocal() as db:
+            result = await db.stream_scalars(query.execution_options(yield_per=ATTACHMENT_STREAM_BATCH))
+            async for attachments in result.partitions():
+                yield "".join(
+                    json.dumps(serialize_attachment(a), ensure_ascii=False) + "\n"
+                    for a in attachments
+                )
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
 
 @router.get("/api/posts/{post_id}/attachments", response_model=List[AttachmentResponse])
 async def list_post_attachments(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -74,19 +203,19 @@ async def list_post_attachments(
 
     Args:
         post_id (int): 게시글 ID
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         List[AttachmentResponse]: 첨부파일 목록
     """
     # 게시물 존재 여부 확인
-    post = db.query(YJPosts).filter(YJPosts.post_no == post_id).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == post_id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # 해당 게시물의 첨부파일 목록 조회
-    attachments = db.query(YJAttachments).filter(YJAttachments.post_no == post_id).all()
+    attachments = (await db.scalars(select(YJAttachments).where(YJAttachments.post_no == post_id))).all()
     return [
         {
             "id": a.seq,
@@ -105,64 +234,75 @@ async def list_post_attachments(
 async def upload_file(
     id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     게시글 첨부파일 업로드 API
     - 게시글에 새로운 첨부파일을 업로드
-    - 기존 첨부파일이 있다면 소프트 삭제 후 새로운 파일 업로드
+    - 새로운 파일을 저장한 뒤 기존 첨부파일을 같은 트랜잭션에서 소프트 삭제 (업로드가 거부되면 기존 첨부파일 유지)
 
     Args:
         id (int): 게시글 ID
         file (UploadFile): 업로드할 파일
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         업로드된 파일 정보 (filename, id)
     """
-    post = db.query(YJPosts).filter(YJPosts.post_no == id).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    # 기존 파일 소프트 삭제 처리
-    existing_files = db.query(YJAttachments).filter(
+    if not is_allowed_file(file.filename):
+        raise HTTPException(status_code=400, detail="허용되지 않는 파일 형식입니다")
+
+    # 교체될 기존 파일 (새 첨부파일을 추가하기 전에 조회)
+    existing_files = (await db.scalars(select(YJAttachments).where(
         YJAttachments.post_no == id,
         YJAttachments.is_delete == 'N'
-    ).all()
-    for existing_file in existing_files:
-        if os.path.exists(existing_file.file_path):
-            os.remove(existing_file.file_path)
-        existing_file.is_delete = 'Y'
-        existing_file.updated_at = datetime.now(seoul_tz)
-    db.commit()
-
-    # 새로운 파일 업로드
-    file_location = os.path.join(UPLOAD_DIRECTORY, file.filename)
-    with open(file_location, "wb") as buffer:
-        buffer.write(await file.read())
-
-    current_time = datetime.now(seoul_tz)  # 현재 시간을 한국 시간으로 설정
-    new_file = YJAttachments(
-        post_no=id,
-        file_nm=file.filename,
-        org_file_nm=file.filename,
-        file_path=file_location,
-        file_size=os.path.getsize(file_location),
-        mime_type=file.content_type,
-        created_at=current_time  # 한국 시간으로 저장
-    )
-    db.add(new_file)
-    db.commit()
-    db.refresh(new_file)
+    ))).all()
+
+    try:
+        # 새로운 파일을 먼저 저장 (내용 해시 기준, 같은 내용의 파일이 이미 있으면 참조 수만 증가)
+        # 업로드가 거부되면 롤백되어 기존 첨부파일은 그대로 유지
+        stored = await store_upload(db, file)
+
+        current_time = datetime.now(seoul_tz)  # 현재 시간을 한국 시간으로 설정
+        new_file = YJAttachments(
+            post_no=id,
+            file_nm=file.filename,
+            org_file_nm=file.filename,
+            file_path=stored.path,
+            file_size=stored.size,
+            file_hash=stored.sha256,
+            mime_type=file.content_type,
+            created_at=current_time  # 한국 시간으로 저장
+        )
+        db.add(new_file)
+
+        # 기존 파일 소프트 삭제 처리 (같은 트랜잭션, 파일은 보존 기간이 지난 뒤 GC가 삭제)
+        for existing_file in existing_files:
+            await release_blob(db, existing_file)
+            existing_file.is_delete = 'Y'
+            existing_file.updated_at = current_time
+        await adjust_post_counts(db, id, attachments=1 - len(existing_files))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    await post_list_cache.invalidate()
+    await db.refresh(new_file)
+    thumbnail_pipeline.schedule(stored.path, stored.sha256, file.filename)
+    schedule_precompress(stored.path)
 
     return {"filename": new_file.file_nm, "id": new_file.seq}
 
 @router.delete("/api/files/{id}")
 async def delete_file(
     id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -171,69 +311,125 @@ async def delete_file(
 
     Args:
         id (int): 첨부파일 ID
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         message (str): 삭제 결과 메시지
     """
     # 첨부파일 존재 여부 확인
-    file_record = db.query(YJAttachments).filter(
+    file_record = await db.scalar(select(YJAttachments).where(
         YJAttachments.seq == id,
         YJAttachments.is_delete == 'N'
-    ).first()
+    ))
     if not file_record:
         raise HTTPException(status_code=404, detail="File not found")
 
     # 게시물 작성자 확인 (선택적)
-    post = db.query(YJPosts).filter(YJPosts.post_no == file_record.post_no).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == file_record.post_no))
     if post and post.author_usrid != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this file")
 
     try:
-        # 파일 시스템에서 파일 삭제
-        if os.path.exists(file_record.file_path):
-            os.remove(file_record.file_path)
+        # 참조 수만 줄이고 파일은 보존 기간이 지난 뒤 GC가 삭제
+        await release_blob(db, file_record)
         
         # 데이터베이스에서 소프트 삭제 처리
         file_record.is_delete = 'Y'
         file_record.updated_at = datetime.now(seoul_tz)
-        db.commit()
+        await adjust_post_counts(db, file_record.post_no, attachments=-1)
+        await db.commit()
+        await post_list_cache.invalidate()
         
         return {"message": "File deleted successfully"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
 
 @router.get("/api/files/{id}")
 async def download_file(
     id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     첨부파일 다운로드 API
     - 첨부파일을 다운로드
+    - Range 요청은 206 부분 응답 (동영상 탐색, 이어받기), ETag/Last-Modified가 같으면 304
+
+    Args:
+        id (int): 첨부파일 ID
+        request (Request): 요청
+        db (AsyncSession): 데이터베이스 세션
+        user_id (str): 인증된 사용자 ID
+
+    Returns:
+        FileResponse: 다운로드할 파일 (부분 응답 206, 변경 없으면 304)
+    """
+    file_record = await db.scalar(select(YJAttachments).where(YJAttachments.seq == id))
+    if not file_record:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    return await file_download_response(request, file_record.file_path, filename=file_record.org_file_nm)
+
+@router.get("/api/files/{id}/thumb")
+async def get_thumbnail(
+    id: int,
+    w: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    이미지 첨부파일 썸네일 API
+    - 업로드 시 미리 만든 썸네일을 반환하고, 아직 없으면 그 자리에서 만들어 반환
+    - 이미지 변환은 별도 프로세스에서 실행되므로 다른 요청을 막지 않음
 
     Args:
         id (int): 첨부파일 ID
-        db (Session): 데이터베이스 세션
+        w (int): 썸네일 너비 (THUMBNAIL_WIDTHS 중 하나)
+        request (Request): 요청
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
-        FileResponse: 다운로드할 파일
+        FileResponse: 썸네일 이미지 (변경 없으면 304)
     """
-    file_record = db.query(YJAttachments).filter(YJAttachments.seq == id).first()
+    if w not in THUMBNAIL_WIDTHS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"썸네일 너비는 {', '.join(map(str, THUMBNAIL_WIDTHS))} 중 하나여야 합니다"
+        )
+
+    file_record = await db.scalar(select(YJAttachments).where(YJAttachments.seq == id))
     if not file_record:
         raise HTTPException(status_code=404, detail="File not found")
+    if not is_thumbnail_source(file_record.org_file_nm):
+        raise HTTPException(status_code=400, detail="이미지 첨부파일이 아닙니다")
+
+    try:
+        key = await run_in_threadpool(thumbnail_key, file_record.file_hash, file_record.file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    try:
+        path = await thumbnail_pipeline.ensure(file_record.file_path, key, w)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception:
+        logger.exception("썸네일 생성 실패", extra={"attachment": id, "width": w})
+        raise HTTPException(status_code=422, detail="이미지를 변환할 수 없습니다")
 
-    return FileResponse(path=file_record.file_path, filename=file_record.org_file_nm)
+    return await file_download_response(request, path, media_type=THUMBNAIL_MEDIA_TYPES.get(THUMBNAIL_FORMAT))
 
 @router.put("/api/posts/{post_id}/attachments/{attachment_id}/delete")
 async def delete_attachment(
     post_id: int,
     attachment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -243,14 +439,14 @@ async def delete_attachment(
     Args:
         post_id (int): 게시글 ID
         attachment_id (int): 첨부파일 ID
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         message (str): 삭제 결과 메시지
     """
     # 게시글 존재 여부 확인
-    post = db.query(YJPosts).filter(YJPosts.post_no == post_id).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == post_id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
@@ -259,21 +455,24 @@ async def delete_attachment(
         raise HTTPException(status_code=403, detail="Not authorized to delete this attachment")
 
     # 첨부파일 존재 여부 확인
-    attachment = db.query(YJAttachments).filter(
+    attachment = await db.scalar(select(YJAttachments).where(
         YJAttachments.seq == attachment_id,
         YJAttachments.post_no == post_id,
         YJAttachments.is_delete == 'N'
-    ).first()
+    ))
     if not attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
 
     try:
         # 첨부파일의 is_delete 필드를 'Y'로 변경
+        await release_blob(db, attachment)
         attachment.is_delete = 'Y'
         attachment.updated_at = datetime.now(seoul_tz)
-        db.commit()
+        await adjust_post_counts(db, post_id, attachments=-1)
+        await db.commit()
+        await post_list_cache.invalidate()
         
         return {"message": "Attachment deleted successfully"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting attachment: {str(e)}") 
\ No newline at end of file
@@ -1,18 +1,33 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel, HttpUrl, validator
 from app.models.yj_posts import YJPosts
 from app.models.yj_users import YJUsers
 from app.models.yj_attachments import YJAttachments
 from app.models.yj_comments import YJComments
-from ..database import get_db
+from ..database import get_async_db
 from app.utils.token import get_current_user_id
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.search import post_search_filter, build_search_vector
+from app.utils.cache import TTLCache, post_list_cache
+from app.utils.counters import POST_TOTAL, get_counter, increment_counter, adjust_post_counts
+from app.utils.view_counter import view_counter
+from app.utils.etag import get_post_etag, etag_matches, not_modified, set_etag
+from app.utils.comment_tree import get_comment_page
+from app.utils.events import event_broker, post_channel
+from app.utils.uploads import MAX_FILE_SIZE, is_allowed_file
+from app.utils.blob_store import store_upload, release_blob
+from app.utils.downloads import file_download_response
+from app.utils.thumbnails import thumbnail_pipeline
+from app.utils.precompress import schedule_precompress
+from app.utils.zip_stream import ZipEntry, stream_zip, unique_name
 from datetime import datetime
 import pytz
 import os
 import logging
-from fastapi.responses import FileResponse
 import re
 
 router = APIRouter()
@@ -20,18 +35,13 @@ router = APIRouter()
 # 한국 시간대 설정
 seoul_tz = pytz.timezone('Asia/Seoul')
 
-UPLOAD_DIRECTORY = "./uploads"
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-ALLOWED_EXTENSIONS = {
-    'image': ['.jpg', '.jpeg', '.png', '.gif'],
-    'document': ['.pdf', '.doc', '.docx', '.txt', '.xls', '.xlsx', '.ppt', '.pptx'],
-    'video': ['.mp4', '.avi', '.mov']
-}
+MAX_PAGE_SIZE = 100
 
-if not os.path.exists(UPLOAD_DIRECTORY):
-    os.makedirs(UPLOAD_DIRECTORY)
+# 검색/필터 조건별 게시글 수 캐시 (초 단위 TTL)
+POST_TOTAL_CACHE_TTL = int(os.getenv("POST_TOTAL_CACHE_TTL", "30"))
+post_total_cache = TTLCache(ttl=POST_TOTAL_CACHE_TTL)
 
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Request Models
 class PostCreateRequest(BaseModel):
@@ -65,6 +75,7 @@ class PostListResponse(BaseModel):
     createdAt: str
     view_cnt: int
     commentCount: int
+    attachmentCount: int = 0
 
 class PostDetailResponse(BaseModel):
     id: int
@@ -76,187 +87,284 @@ class PostDetailResponse(BaseModel):
     createdAt: str
     updatedAt: str
     view_cnt: int
+    commentCount: int = 0
     attachments: List[dict]
     comments: List[dict]
+    commentsNextCursor: Optional[str] = None
 
 class PostsResponse(BaseModel):
     posts: List[PostListResponse]
-    total: int
+    total: Optional[int]
+    nextCursor: Optional[str] = None
+
+# 목록 정렬 기준별 컬럼 (관련도 정렬은 get_posts에서 별도 처리)
+SORT_COLUMNS = {
+    'createdAt': YJPosts.created_at,
+    'view_cnt': YJPosts.view_cnt,
+    'commentCount': YJPosts.comment_cnt,
+    'attachmentCount': YJPosts.attach_cnt,
+}
+
+def make_post_cursor(post: YJPosts, sort_by: str, sort_order: str) -> str:
+    """게시글 목록의 마지막 행으로 다음 페이지 커서 생성 (작성일시가 없는 기존 게시글은 정렬값 None)"""
+    if sort_by == 'createdAt':
+        value = post.created_at.isoformat() if post.created_at else None
+    else:
+        value = getattr(post, SORT_COLUMNS[sort_by].key)
+    return encode_cursor({"s": sort_by, "o": sort_order, "v": value, "id": post.post_no})
+
+def parse_post_cursor(cursor: str, sort_by: str, sort_order: str):
+    """커서를 (정렬값, post_no)로 복원 (정렬 조건이 다르면 400)"""
+    data = decode_cursor(cursor)
+    if data.get("s") != sort_by or data.get("o") != sort_order:
+        raise HTTPException(status_code=400, detail="정렬 조건이 커서와 일치하지 않습니다")
+    try:
+        post_no = int(data["id"])
+        if data["v"] is None:
+            value = None
+        elif sort_by == 'createdAt':
+            value = datetime.fromisoformat(data["v"])
+        else:
+            value = int(data["v"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다")
+    return value, post_no
+
+def post_keyset_filter(sort_column, last_value, last_post_no: int, sort_order: str):
+    """
+    커서 이후 행의 조건 ((정렬값, post_no) 키셋)
+    - PostgreSQL 기본 정렬에서 NULL은 가장 큰 값(asc는 마지막, desc는 처음)이므로 같은 순서로 비교
+    - 행 비교에 NULL이 들어가면 결과가 NULL이 되므로 정렬값이 NULL인 행은 따로 조건을 붙임
+      (ORDER BY와 인덱스는 그대로 사용)
+    """
+    is_null = sort_column.is_(None)
+    if sort_order == 'asc':
+        if last_value is None:
+            return and_(is_null, YJPosts.post_no > last_post_no)
+        return or_(tuple_(sort_column, YJPosts.post_no) > tuple_(last_value, last_post_no), is_null)
+    if last_value is None:
+        return or_(and_(is_null, YJPosts.post_no < last_post_no), sort_column.is_not(None))
+    return tuple_(sort_column, YJPosts.post_no) < tuple_(last_value, last_post_no)
+
+async def count_posts(db: AsyncSession, query, search: Optional[str], search_type: Optional[str], author_id: Optional[str]) -> int:
+    """
+    게시글 목록의 전체 개수
+    - 조건이 없으면 yj_counters에 유지되는 카운터 사용 (서버 시작 시 초기화)
+    - 검색/작성자 조건이 있으면 TTL 캐시에 저장된 COUNT 결과 사용
+    """
+    if not search and not author_id:
+        total = await get_counter(db, POST_TOTAL)
+        if total is not None:
+            return total
+        # 카운터가 아직 없으면(서버 시작 시 만들지 못한 경우) 직접 계산 (조회 요청에서는 저장하지 않음)
+        return await db.scalar(select(func.count()).select_from(YJPosts).where(YJPosts.is_delete == 'N'))
+
+    key = (search, search_type if search else None, author_id)
+    total = post_total_cache.get(key)
+    if total is None:
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        post_total_cache.set(key, total)
+    return total
 
 # GET list with response formatting
 @router.get("/api/posts", response_model=PostsResponse)
 async def get_posts(
     page: int = 1,
+    after: Optional[str] = None,
+    size: int = 10,
     search: Optional[str] = None,
     search_type: Optional[str] = None,
     author_id: Optional[str] = None,
     sortBy: Optional[str] = 'createdAt',
     sortOrder: Optional[str] = 'desc',
-    db: Session = Depends(get_db),
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     게시글 목록 조회 API
     - 페이지네이션, 검색, 작성자 필터링, 정렬 지원
+    - after 커서가 주어지면 OFFSET 대신 키셋(커서) 방식으로 다음 페이지를 조회
 
     Args:
         page (int): 페이지 번호 (기본값 1)
+        after (str, optional): 이전 응답의 nextCursor 값 (지정 시 page 무시)
+        size (int): 페이지당 게시글 수 (기본값 10, 최대 100)
         search (str, optional): 검색어
         search_type (str, optional): 검색 타입 (title, content, author)
         author_id (str, optional): 작성자 ID
-        sortBy (str, optional): 정렬 기준 (createdAt, view_cnt)
+        sortBy (str, optional): 정렬 기준 (createdAt, view_cnt, commentCount, attachmentCount, relevance)
         sortOrder (str, optional): 정렬 순서 (asc, desc)
-        db (Session): 데이터베이스 세션
+        include_total (bool): 전체 게시글 수 포함 여부 (무한 스크롤 등에서는 false)
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         posts (list): 게시글 목록
-        total (int): 전체 게시글 수
+        total (int): 전체 게시글 수 (include_total=false이면 None)
+        nextCursor (str): 다음 페이지 조회용 커서 (마지막 페이지면 None)
     """
     # 페이지 번호 유효성 검사
     if page < 1:
         page = 1
+    size = min(max(size, 1), MAX_PAGE_SIZE)
+
+    # 캐시된 응답이 있으면 바로 반환
+    # (키에 현재 세대 번호가 고정되므로, 조회 중 무효화되면 아래에서 저장한 응답은 이전 세대에 남음)
+    cache_key = await post_list_cache.key((
+        after or page, size, search, search_type, author_id, sortBy, sortOrder, include_total
+    ))
+    cached = await post_list_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # 기본 쿼리 생성
-    query = db.query(YJPosts).filter(YJPosts.is_delete == 'N')
+    query = select(YJPosts).where(YJPosts.is_delete == 'N')
     
-    # 검색어 필터링
+    # 검색어 필터링 (n-gram 전문 검색 인덱스 사용, app.utils.search 참고)
+    rank = None
     if search:
-        if search_type == 'title':
-            query = query.filter(YJPosts.title.ilike(f'%{search}%'))
-        elif search_type == 'content':
-            query = query.filter(YJPosts.contents.ilike(f'%{search}%'))
-        elif search_type == 'author':
-            subquery = db.query(YJUsers.usr_id).filter(YJUsers.usr_nm.ilike(f'%{search}%')).subquery()
-            query = query.filter(YJPosts.author_usrid.in_(subquery))
-        else:
-            query = query.filter(
-                (YJPosts.title.ilike(f'%{search}%')) | 
-                (YJPosts.contents.ilike(f'%{search}%'))
-            )
+        criterion, rank = post_search_filter(search, search_type)
+        query = query.where(criterion)
     
     # 작성자 필터링
     if author_id:
-        query = query.filter(YJPosts.author_usrid == author_id)
+        query = query.where(YJPosts.author_usrid == author_id)
     
-    # 전체 게시글 수 계산
-    total_posts = query.count()
+    # 전체 게시글 수 계산 (매 요청마다 COUNT(*)를 하지 않도록 카운터/캐시 사용)
+    total_posts = None
+    if include_total:
+        total_posts = await count_posts(db, query, search, search_type, author_id)
     
-    # 정렬 적용
-    if sortBy == 'createdAt':
+    # 관련도 정렬은 전문 검색 시에만 가능하며 커서 방식은 지원하지 않음
+    if sortBy == 'relevance' and rank is not None:
+        if after:
+            raise HTTPException(status_code=400, detail="관련도 정렬은 page 방식만 지원합니다")
+        query = query.order_by(rank.desc(), YJPosts.post_no.desc())
+        offset = (page - 1) * size
+    else:
+        # 정렬 적용 (동일 값일 때 순서가 고정되도록 post_no를 보조 정렬 키로 사용)
+        if sortBy not in SORT_COLUMNS:
+            sortBy = 'createdAt'
+        if sortOrder != 'asc':
+            sortOrder = 'desc'
+        sort_column = SORT_COLUMNS[sortBy]
         if sortOrder == 'asc':
-            query = query.order_by(YJPosts.created_at.asc())
+            query = query.order_by(sort_column.asc(), YJPosts.post_no.asc())
         else:
-            query = query.order_by(YJPosts.created_at.desc())
-    elif sortBy == 'view_cnt':
-        if sortOrder == 'asc':
-            query = query.order_by(YJPosts.view_cnt.asc())
+            query = query.order_by(sort_column.desc(), YJPosts.post_no.desc())
+
+        # 커서가 있으면 마지막 행의 (정렬값, post_no) 이후부터 조회
+        if after:
+            last_value, last_post_no = parse_post_cursor(after, sortBy, sortOrder)
+            query = query.where(post_keyset_filter(sort_column, last_value, last_post_no, sortOrder))
+            offset = 0
         else:
-            query = query.order_by(YJPosts.view_cnt.desc())
-    
-    # 페이지네이션 적용
-    items_per_page = 10
-    offset = (page - 1) * items_per_page
-    posts = query.offset(offset).limit(items_per_page).all()
-    
+            offset = (page - 1) * size
+
+    # 페이지네이션 적용 (작성자 이름은 JOIN으로 한 번에 조회)
+    rows = (await db.execute(
+        query.outerjoin(YJUsers, YJUsers.usr_id == YJPosts.author_usrid)
+        .add_columns(YJUsers.usr_nm)
+        .offset(offset)
+        .limit(size)
+    )).all()
+
     result = []
-    for post in posts:
-        user = db.query(YJUsers).filter(YJUsers.usr_id == post.author_usrid).first()
+    for post, author_name in rows:
         result.append({
             "id": post.post_no,
             "title": post.title,
             "author": {
                 "id": post.author_usrid,
-                "name": user.usr_nm if user else "Unknown"
+                "name": author_name or "Unknown"
             },
             "createdAt": post.created_at.isoformat() if post.created_at else "",
             "view_cnt": post.view_cnt,
-            "commentCount": 0
+            "commentCount": post.comment_cnt,
+            "attachmentCount": post.attach_cnt
         })
 
-    return {"posts": result, "total": total_posts}
+    next_cursor = None
+    if len(rows) == size and sortBy != 'relevance':
+        next_cursor = make_post_cursor(rows[-1][0], sortBy, sortOrder)
+
+    response = {"posts": result, "total": total_posts, "nextCursor": next_cursor}
+    await post_list_cache.set(cache_key, response)
+    return response
+
+# GET cache stats
+@router.get("/api/cache/stats")
+async def get_cache_stats(
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    캐시 통계 조회 API
+    - 게시글 목록 캐시의 적중/실패 횟수와 적중률 반환 (현재 워커 기준)
+
+    Args:
+        user_id (str): 인증된 사용자 ID
+
+    Returns:
+        posts (dict): 게시글 목록 캐시 통계
+    """
+    return {"posts": await post_list_cache.stats()}
 
 # GET detail
 @router.get("/api/posts/{id}", response_model=PostDetailResponse)
 async def get_post(
     id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)  # 인증 추가
 ):
     """
     게시글 상세 조회 API
-    - 게시글, 첨부파일, 댓글(대댓글 포함) 정보를 반환
+    - 게시글, 첨부파일, 최상위 댓글 첫 페이지(최신순, 답글 수 포함) 정보를 반환
+    - 작성자 이름/답글 수는 함께 조회하므로 댓글 수와 관계없이 쿼리 3번으로 처리
+    - If-None-Match가 현재 ETag와 같으면 응답을 만들지 않고 304 반환 (재방문이므로 조회수는 증가)
 
     Args:
         id (int): 게시글 ID
-        db (Session): 데이터베이스 세션
+        if_none_match (str, optional): 이전 응답의 ETag
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         게시글 상세 정보 (PostDetailResponse)
     """
-    # 게시글 조회
-    post = db.query(YJPosts).filter(YJPosts.post_no == id, YJPosts.is_delete == 'N').first()
-    if not post:
+    # 변경 여부 확인 (게시글/댓글/첨부파일 버전으로 ETag 계산)
+    etag = await get_post_etag(db, id)
+    if etag is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    # 조회수 증가
-    post.view_cnt += 1
-    db.commit()
+    # 조회수 증가 (메모리에 누적 후 일괄 반영, app.utils.view_counter 참고)
+    # 브라우저는 재방문마다 If-None-Match를 보내므로 304 응답도 조회로 집계
+    view_counter.add(id)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    # 게시글 + 작성자 이름 조회
+    row = (await db.execute(
+        select(YJPosts, YJUsers.usr_nm)
+        .outerjoin(YJUsers, YJUsers.usr_id == YJPosts.author_usrid)
+        .where(YJPosts.post_no == id, YJPosts.is_delete == 'N')
+    )).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Post not found")
+    post, author_name = row
 
-    # 작성자 정보 조회
-    user = db.query(YJUsers).filter(YJUsers.usr_id == post.author_usrid).first()
-    
     # 첨부파일 조회
-    attachments = db.query(YJAttachments).filter(
+    attachments = (await db.scalars(select(YJAttachments).where(
         YJAttachments.post_no == id,
         YJAttachments.is_delete == 'N'  # 삭제되지 않은 첨부파일만 조회
-    ).all()
-    
-    # 댓글 조회 (삭제되지 않은 댓글만, 시간순 정렬)
-    comments = db.query(YJComments).filter(
-        YJComments.post_no == id,
-        YJComments.is_delete == 'N'
-    ).order_by(YJComments.created_at.desc()).all()  # 최신순으로 정렬
+    ))).all()
     
-    # 댓글 작성자 정보 조회
-    comment_authors = {}
-    for comment in comments:
-        if comment.author_usrid not in comment_authors:
-            author = db.query(YJUsers).filter(YJUsers.usr_id == comment.author_usrid).first()
-            comment_authors[comment.author_usrid] = author.usr_nm if author else "Unknown"
-    
-    # 댓글과 대댓글을 구조화
-    comment_dict = {}
-    structured_comments = []
-
-    # 먼저 모든 댓글을 딕셔너리에 저장
-    for comment in comments:
-        comment_dict[comment.seq] = {
-            "id": comment.seq,
-            "content": comment.contents,
-            "author": {
-                "id": comment.author_usrid,
-                "name": comment_authors.get(comment.author_usrid, "Unknown")
-            },
-            "createdAt": comment.created_at.isoformat() if comment.created_at else "",
-            "updatedAt": comment.updated_at.isoformat() if comment.updated_at else "",
-            "isDeleted": comment.is_delete == 'Y',
-            "parent_id": comment.parent_cmmt_no,
-            "replies": []
-        }
-
-    # 댓글과 대댓글을 구조화
-    for comment in comments:
-        if comment.parent_cmmt_no == 0:  # 일반 댓글
-            structured_comments.append(comment_dict[comment.seq])
-        else:  # 대댓글
-            parent = comment_dict.get(comment.parent_cmmt_no)
-            if parent:
-                parent["replies"].append(comment_dict[comment.seq])
-
-    # 대댓글도 시간순으로 정렬 (최신순)
-    for comment in structured_comments:
-        comment["replies"].sort(key=lambda x: x["createdAt"], reverse=True)
+    # 최상위 댓글 첫 페이지만 조회 (최신순, 이후 페이지/답글은 댓글 API로 조회)
+    comment_page = await get_comment_page(db, id, sort_order='desc')
     
     return {
         "id": post.post_no,
@@ -264,10 +372,11 @@ async def get_post(
         "content": post.contents,
         "videoUrl": post.video_url,
         "imgUrl": post.img_url,
-        "author": {"id": post.author_usrid, "name": user.usr_nm if user else "Unknown"},
+        "author": {"id": post.author_usrid, "name": author_name or "Unknown"},
         "createdAt": post.created_at.isoformat() if post.created_at else "",
         "updatedAt": post.updated_at.isoformat() if post.updated_at else "",
-        "view_cnt": post.view_cnt,
+        "view_cnt": post.view_cnt + view_counter.pending(post.post_no),
+        "commentCount": post.comment_cnt,
         "attachments": [
             {
                 "id": a.seq,
@@ -278,7 +387,8 @@ async def get_post(
                 "mime_type": a.mime_type
             } for a in attachments
         ],
-        "comments": structured_comments
+        "comments": comment_page["comments"],
+        "commentsNextCursor": comment_page["nextCursor"]
     }
 
 def is_valid_video_url(url: str) -> bool:
@@ -301,7 +411,7 @@ async def create_post(
     video_url: Optional[str] = Form(None),
     img_url: Optional[str] = Form(None),  # 이미지 URL 필드 추가
     files: List[UploadFile] = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -314,7 +424,7 @@ async def create_post(
         video_url (str, optional): 동영상 URL
         img_url (str, optional): 이미지 URL
         files (List[UploadFile], optional): 첨부파일 리스트
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
@@ -349,35 +459,47 @@ async def create_post(
         author_usrid=user_id,
         created_at=current_time
     )
+    author_name = await db.scalar(select(YJUsers.usr_nm).where(YJUsers.usr_id == user_id))
+    new_post.search_vector = build_search_vector(new_post.title, new_post.contents, author_name)
     db.add(new_post)
-    db.commit()
-    db.refresh(new_post)
+    await increment_counter(db, POST_TOTAL, 1)
+    await db.commit()
+    post_total_cache.clear()
+    await post_list_cache.invalidate()
+    await db.refresh(new_post)
 
     # 첨부파일 처리 (파일이 있는 경우에만)
     if files:
-        for file in files:
-            # 파일명 중복 처리
-            safe_filename = get_unique_filename(file.filename)
-            file_location = os.path.join(UPLOAD_DIRECTORY, safe_filename)
-            
-            # 파일 저장
-            with open(file_location, "wb") as buffer:
-                content = await file.read()
-                if len(content) > MAX_FILE_SIZE:
-                    raise HTTPException(status_code=400, detail="파일 크기가 너무 큽니다")
-                buffer.write(content)
-
-            new_file = YJAttachments(
-                post_no=new_post.post_no,
-                file_nm=safe_filename,
-                org_file_nm=file.filename,
-                file_path=file_location,
-                file_size=os.path.getsize(file_location),
-                mime_type=file.content_type,
-                created_at=current_time
-            )
-            db.add(new_file)
-        db.commit()
+        stored_files = []
+        try:
+            for file in files:
+                # 내용 해시 기준으로 저장 (같은 내용의 파일이 이미 있으면 참조 수만 증가)
+                stored = await store_upload(db, file)
+                stored_files.append((stored, file.filename))
+
+                new_file = YJAttachments(
+                    post_no=new_post.post_no,
+                    file_nm=file.filename,
+                    org_file_nm=file.filename,
+                    file_path=stored.path,
+                    file_size=stored.size,
+                    file_hash=stored.sha256,
+                    mime_type=file.content_type,
+                    created_at=current_time
+                )
+                db.add(new_file)
+        except Exception:
+            # 첨부파일 추가와 참조 수 증가를 취소 (참조되지 않게 된 파일은 GC 대상)
+            await db.rollback()
+            raise
+        await adjust_post_counts(db, new_post.post_no, attachments=len(files))
+        await db.commit()
+        await post_list_cache.invalidate()
+
+        # 이미지 첨부파일의 썸네일과 문서의 압축본을 백그라운드에서 미리 생성
+        for stored, filename in stored_files:
+            thumbnail_pipeline.schedule(stored.path, stored.sha256, filename)
+            schedule_precompress(stored.path)
 
     return {
         "id": new_post.post_no,
@@ -403,7 +525,7 @@ async def update_post(
     img_url: Optional[str] = Form(None),  # 이미지 URL 필드 추가
     files: List[UploadFile] = File(None),
     existing_files: List[int] = Form([]),  # 기존 첨부파일 id 목록 추가
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -418,13 +540,13 @@ async def update_post(
         img_url (str, optional): 이미지 URL
         files (List[UploadFile], optional): 첨부파일 리스트
         existing_files (List[int], optional): 기존 첨부파일 id 목록
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         수정된 게시글 상세 정보 (PostDetailResponse)
     """
-    post = db.query(YJPosts).filter(YJPosts.post_no == id).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
@@ -440,50 +562,75 @@ async def update_post(
     if img_url and not is_valid_image_url(img_url):
         raise HTTPException(status_code=400, detail="유효한 이미지 URL을 입력해주세요")
 
+    # 파일 검증 (기존 첨부파일을 삭제하기 전에 확인)
+    if files:
+        for file in files:
+            if file.size > MAX_FILE_SIZE:
+                raise HTTPException(status_code=400, detail=f"파일 크기는 {MAX_FILE_SIZE/1024/1024}MB를 초과할 수 없습니다")
+            if not is_allowed_file(file.filename):
+                raise HTTPException(status_code=400, detail="허용되지 않는 파일 형식입니다")
+
     post.title = title
     post.contents = content
+    author_name = await db.scalar(select(YJUsers.usr_nm).where(YJUsers.usr_id == user_id))
+    post.search_vector = build_search_vector(title, content, author_name)
     if video_url:
         post.video_url = video_url
     if img_url:
         post.img_url = img_url
     post.updated_at = datetime.now(seoul_tz)
 
-    # 기존 첨부파일 소프트 삭제 (existing_files에 없는 것만)
-    all_existing_files = db.query(YJAttachments).filter(
-        YJAttachments.post_no == id,
-        YJAttachments.is_delete == 'N'
-    ).all()
-    for existing_file in all_existing_files:
-        if existing_file.seq not in existing_files:
-            if os.path.exists(existing_file.file_path):
-                os.remove(existing_file.file_path)
-            existing_file.is_delete = 'Y'
-            existing_file.updated_at = datetime.now(seoul_tz)
+    # 삭제할 기존 첨부파일 (existing_files에 없는 것만, 새 첨부파일을 추가하기 전에 조회)
+    removed_files = [
+        existing_file for existing_file in (await db.scalars(select(YJAttachments).where(
+            YJAttachments.post_no == id,
+            YJAttachments.is_delete == 'N'
+        ))).all()
+        if existing_file.seq not in existing_files
+    ]
 
-    # 새로운 파일 업로드
-    if files:
-        for file in files:
-            file_location = os.path.join(UPLOAD_DIRECTORY, file.filename)
-            with open(file_location, "wb") as buffer:
-                buffer.write(await file.read())
+    stored_files = []
+    try:
+        # 새로운 파일 업로드 (먼저 저장하므로 업로드가 거부되면 롤백되어 기존 첨부파일은 그대로 유지)
+        for file in files or []:
+            stored = await store_upload(db, file)
+            stored_files.append((stored, file.filename))
 
             new_file = YJAttachments(
                 post_no=id,
                 file_nm=file.filename,
                 org_file_nm=file.filename,
-                file_path=file_location,
-                file_size=os.path.getsize(file_location),
+                file_path=stored.path,
+                file_size=stored.size,
+                file_hash=stored.sha256,
                 mime_type=file.content_type,
                 created_at=datetime.now(seoul_tz)
             )
             db.add(new_file)
 
-    db.commit()
-    db.refresh(post)
+        # 기존 첨부파일 소프트 삭제 (참조 수만 줄이고 파일은 보존 기간이 지난 뒤 GC가 삭제)
+        for existing_file in removed_files:
+            await release_blob(db, existing_file)
+            existing_file.is_delete = 'Y'
+            existing_file.updated_at = datetime.now(seoul_tz)
+    except Exception:
+        await db.rollback()
+        raise
+
+    # 첨부파일 수 갱신 (삭제된 수만큼 감소, 새로 올린 수만큼 증가)
+    await adjust_post_counts(db, id, attachments=len(files or []) - len(removed_files))
+    await db.commit()
+    for stored, filename in stored_files:
+        thumbnail_pipeline.schedule(stored.path, stored.sha256, filename)
+        schedule_precompress(stored.path)
+    await db.refresh(post)
+    # 제목/내용이 바뀌면 검색 조건별 게시글 수도 달라지므로 함께 비움
+    post_total_cache.clear()
+    await post_list_cache.invalidate()
 
     # 첨부파일 목록 조회
-    attachments = db.query(YJAttachments).filter(YJAttachments.post_no == id).all()
-    user = db.query(YJUsers).filter(YJUsers.usr_id == post.author_usrid).first()
+    attachments = (await db.scalars(select(YJAttachments).where(YJAttachments.post_no == id))).all()
+    user = await db.get(YJUsers, post.author_usrid)
 
     return {
         "id": post.post_no,
@@ -511,47 +658,75 @@ async def update_post(
 async def download_attachment(
     post_id: int,
     attachment_id: int,
+    request: Request,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # 게시글 존재 여부 확인
-    post = db.query(YJPosts).filter(YJPosts.post_no == post_id).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == post_id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # 첨부파일 존재 여부 확인
-    attachment = db.query(YJAttachments).filter(
+    attachment = await db.scalar(select(YJAttachments).where(
         YJAttachments.seq == attachment_id,
         YJAttachments.post_no == post_id
-    ).first()
+    ))
     if not attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
 
-    # 파일 경로 확인
-    file_path = attachment.file_path
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-
-    # 파일 다운로드
-    return FileResponse(
-        path=file_path,
+    # 파일 다운로드 (Range 요청은 206 부분 응답, 파일이 없으면 404)
+    return await file_download_response(
+        request,
+        attachment.file_path,
         filename=attachment.org_file_nm,
         media_type=attachment.mime_type
     )
 
-# 파일 확장자 검증 함수
-def is_allowed_file(filename: str) -> bool:
-    ext = os.path.splitext(filename)[1].lower()
-    return any(ext in exts for exts in ALLOWED_EXTENSIONS.values())
+@router.get("/api/posts/{id}/attachments.zip")
+async def download_attachments_zip(
+    id: int,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    게시글 첨부파일 일괄 다운로드 API
+    - 삭제되지 않은 첨부파일 전체를 ZIP 하나로 묶어 스트리밍 (아카이브를 메모리나 임시 파일에 만들지 않음)
+    - 이미지/동영상 등 이미 압축된 형식은 압축 없이 저장하고, 파일명이 겹치면 "이름 (1).확장자"로 변경
 
-# 파일명 중복 처리 함수
-def get_unique_filename(filename: str) -> str:
-    name, ext = os.path.splitext(filename)
-    counter = 1
-    while os.path.exists(os.path.join(UPLOAD_DIRECTORY, filename)):
-        filename = f"{name}_{counter}{ext}"
-        counter += 1
-    return filename
+    Args:
+        id (int): 게시글 ID
+        user_id (str): 인증된 사용자 ID
+        db (AsyncSession): 데이터베이스 세션
+
+    Returns:
+        StreamingResponse: application/zip 응답
+    """
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == id, YJPosts.is_delete == 'N'))
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    attachments = (await db.scalars(
+        select(YJAttachments)
+        .where(YJAttachments.post_no == id, YJAttachments.is_delete == 'N')
+        .order_by(YJAttachments.seq)
+    )).all()
+    if not attachments:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    used_names = set()
+    entries = [
+        ZipEntry(unique_name(a.org_file_nm, used_names), a.file_path, a.created_at)
+        for a in attachments
+    ]
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="post-{id}-attachments.zip"',
+            "Cache-Control": "private, no-store"
+        }
+    )
 
 # XSS 방지를 위한 입력값 sanitization
 def sanitize_input(text: str) -> str:
@@ -576,7 +751,7 @@ def is_valid_image_url(url: str) -> bool:
 @router.delete("/api/posts/{id}")
 async def delete_post(
     id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -585,14 +760,14 @@ async def delete_post(
 
     Args:
         id (int): 게시글 ID
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         message (str): 삭제 결과 메시지
     """
     # 게시글 조회
-    post = db.query(YJPosts).filter(YJPosts.post_no == id).first()
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
@@ -601,30 +776,39 @@ async def delete_post(
         raise HTTPException(status_code=403, detail="Not authorized to delete this post")
 
     try:
+        # 삭제되지 않은 게시글일 때만 전체 게시글 수 감소
+        if post.is_delete == 'N':
+            await increment_counter(db, POST_TOTAL, -1)
+
         # 게시글의 is_delete 필드를 'Y'로 변경
         post.is_delete = 'Y'
         post.updated_at = datetime.now(seoul_tz)
 
         # 첨부파일도 소프트 삭제 처리
-        attachments = db.query(YJAttachments).filter(
+        attachments = (await db.scalars(select(YJAttachments).where(
             YJAttachments.post_no == id,
             YJAttachments.is_delete == 'N'
-        ).all()
+        ))).all()
         
         for attachment in attachments:
+            await release_blob(db, attachment)
             attachment.is_delete = 'Y'
             attachment.updated_at = datetime.now(seoul_tz)
+        await adjust_post_counts(db, id, attachments=-len(attachments))
         
-        db.commit()
+        await db.commit()
+        post_total_cache.clear()
+        await post_list_cache.invalidate()
         return {"message": "Post and its attachments deleted successfully"}
     except Exception as e:
-        db.rollback()
+        logger.exception("게시글 삭제 실패", extra={"post_no": id})
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting post: {str(e)}")
 
 @router.delete("/api/comments/{comment_id}")
 async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -633,14 +817,14 @@ async def delete_comment(
 
     Args:
         comment_id (int): 댓글 ID
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         user_id (str): 인증된 사용자 ID
 
     Returns:
         message (str): 삭제 결과 메시지
     """
     # 댓글 조회
-    comment = db.query(YJComments).filter(YJComments.seq == comment_id).first()
+    comment = await db.scalar(select(YJComments).where(YJComments.seq == comment_id))
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
     
@@ -649,12 +833,24 @@ async def delete_comment(
         raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
 
     try:
+        # 삭제되지 않은 댓글일 때만 게시글 댓글 수 감소
+        was_live = comment.is_delete == 'N'
+        if was_live:
+            await adjust_post_counts(db, comment.post_no, comments=-1)
+
         # 댓글 소프트 삭제
         comment.is_delete = 'Y'
         comment.updated_at = datetime.now(seoul_tz)
-        db.commit()
+        await db.commit()
         
+        if was_live:
+            await post_list_cache.invalidate()
+            await event_broker.publish(post_channel(comment.post_no), "comment.deleted", {
+                "id": comment.seq,
+                "parent_id": comment.parent_cmmt_no
+            })
         return {"message": "Comment deleted successfully"}
     except Exception as e:
-        db.rollback()
+        logger.exception("댓글 삭제 실패", extra={"comment_id": comment_id})
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting comment: {str(e)}")
@@ -0,0 +1,298 @@
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from pydantic import BaseModel
+from email.utils import format_datetime
+from datetime import datetime, timezone
+import mimetypes
+import uuid
+import pytz
+from ..models.yj_attachments import YJAttachments
+from ..models.yj_posts import YJPosts
+from ..models.yj_uploads import YJUploads
+from ..database import get_async_db
+from app.utils.token import get_current_user_id
+from app.utils.counters import adjust_post_counts
+from app.utils.cache import post_list_cache
+from app.utils.uploads import is_allowed_file, remove_file
+from app.utils.blob_store import store_file
+from app.utils.thumbnails import thumbnail_pipeline
+from app.utils.precompress import schedule_precompress
+from app.utils.upload_sessions import (
+    MAX_RESUMABLE_FILE_SIZE, part_path, chunk_path, session_expires_at, write_chunk, append_chunk, finish_part
+)
+
+router = APIRouter()
+
+# 한국 시간대 설정
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+# PATCH 요청 본문 형식 (tus 프로토콜과 동일)
+OFFSET_CONTENT_TYPE = "application/offset+octet-stream"
+
+class UploadCreateRequest(BaseModel):
+    filename: str
+    size: int
+    mimeType: Optional[str] = None
+
+class UploadSessionResponse(BaseModel):
+    uploadId: str
+    offset: int
+    size: int
+    expiresAt: str
+
+def upload_headers(session: YJUploads) -> dict:
+    """업로드 세션 상태 헤더 (Upload-Offset, Upload-Length, Upload-Expires)"""
+    expires_at = session.expires_at
+    if expires_at.tzinfo is None:
+        expires_at = seoul_tz.localize(expires_at)
+    return {
+        "Upload-Offset": str(session.upload_offset),
+        "Upload-Length": str(session.file_size),
+        "Upload-Expires": format_datetime(expires_at.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": "no-store",
+    }
+
+async def get_upload_session(db: AsyncSession, upload_id: str, user_id: str, for_update: bool = False) -> YJUploads:
+    """
+    본인의 만료되지 않은 업로드 세션 조회 (없으면 404)
+    - for_update가 True이면 커밋까지 행 잠금 유지
+    """
+    query = select(YJUploads).where(
+        YJUploads.upload_id == upload_id,
+        YJUploads.usr_id == user_id,
+        YJUploads.expires_at >= datetime.now(seoul_tz)
+    )
+    if for_update:
+        # 이미 조회한 세션이어도 잠근 시점의 값으로 다시 채움
+        query = query.with_for_update().execution_options(populate_existing=True)
+    session = await db.scalar(query)
+    if not session:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다")
+    return session
+
+@router.post("/api/posts/{id}/uploads", response_model=UploadSessionResponse, status_code=201)
+async def create_upload(
+    id: int,
+    upload: UploadCreateRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    이어 올리기 업로드 세션 생성 API
+    - 파일 이름과 전체 크기를 먼저 등록하고, 파일 내용은 PATCH /api/uploads/{upload_id}로 나누어 전송
+
+    Args:
+        id (int): 게시글 ID
+        upload (UploadCreateRequest): 파일 이름, 전체 크기, MIME 타입
+        response (Response): 응답 (Location 헤더 설정)
+        db (AsyncSession): 데이터베이스 세션
+        user_id (str): 인증된 사용자 ID
+
+    Returns:
+        UploadSessionResponse: 업로드 세션 ID, 받은 크기, 전체 크기, 만료 시각
+    """
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == id, YJPosts.is_delete == 'N'))
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if not is_allowed_file(upload.filename):
+        raise HTTPException(status_code=400, detail="허용되지 않는 파일 형식입니다")
+    if upload.size <= 0:
+        raise HTTPException(status_code=400, detail="파일 크기가 올바르지 않습니다")
+    if upload.size > MAX_RESUMABLE_FILE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"파일 크기는 {MAX_RESUMABLE_FILE_SIZE/1024/1024}MB를 초과할 수 없습니다"
+        )
+
+    session = YJUploads(
+        upload_id=uuid.uuid4().hex,
+        post_no=id,
+        usr_id=user_id,
+        org_file_nm=upload.filename,
+        mime_type=upload.mimeType or mimetypes.guess_type(upload.filename)[0] or "application/octet-stream",
+        file_size=upload.size,
+        upload_offset=0,
+        expires_at=session_expires_at()
+    )
+    db.add(session)
+    await db.commit()
+    await db.refresh(session)
+
+    response.headers["Location"] = f"/api/uploads/{session.upload_id}"
+    response.headers.update(upload_headers(session))
+    return {
+        "uploadId": session.upload_id,
+        "offset": session.upload_offset,
+        "size": session.file_size,
+        "expiresAt": session.expires_at.isoformat()
+    }
+
+@router.head("/api/uploads/{upload_id}")
+async def get_upload_offset(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    업로드 세션 상태 조회 API
+    - 연결이 끊긴 뒤 이어 보낼 위치를 Upload-Offset 헤더로 반환
+
+    Args:
+        upload_id (str): 업로드 세션 ID
+        db (AsyncSession): 데이터베이스 세션
+        user_id (str): 인증된 사용자 ID
+
+    Returns:
+        Response: 본문 없이 Upload-Offset, Upload-Length, Upload-Expires 헤더
+    """
+    session = await get_upload_session(db, upload_id, user_id)
+    return Response(status_code=200, headers=upload_headers(session))
+
+@router.patch("/api/uploads/{upload_id}", status_code=204)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(...),
+    content_type: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    업로드 데이터 전송 API
+    - 본문(application/offset+octet-stream)을 받는 대로 Upload-Offset 위치부터 디스크에 이어 씀
+    - 연결이 끊기면 그때까지 받은 만큼 반영되며, HEAD로 위치를 확인해 이어 보내면 됨
+    - 데이터를 받는 동안에는 DB 커넥션을 잡지 않도록 요청마다 임시 파일에 받고, 끝난 뒤 세션 행을 잠근 상태에서
+      위치를 다시 확인해 받는 중인 파일에 옮겨 씀 (같은 위치에 동시에 보낸 요청 중 하나만 반영되고 나머지는 409)
+
+    Args:
+        upload_id (str): 업로드 세션 ID
+        request (Request): 요청 (본문 스트림)
+        upload_offset (int): 이번 데이터의 시작 위치 (Upload-Offset 헤더)
+        content_type (str): Content-Type 헤더
+        db (AsyncSession): 데이터베이스 세션
+        user_id (str): 인증된 사용자 ID
+
+    Returns:
+        Response: 204, 반영 후 Upload-Offset 헤더
+    """
+    if content_type != OFFSET_CONTENT_TYPE:
+        raise HTTPException(status_code=415, detail=f"Content-Type은 {OFFSET_CONTENT_TYPE}이어야 합니다")
+
+    session = await get_upload_session(db, upload_id, user_id)
+    # 본문을 받는 동안 커넥션을 풀에 돌려주기 위해 트랜잭션 종료 (expire_on_commit=False라 조회한 값은 유지)
+    await db.commit()
+    if upload_offset != session.upload_offset:
+        raise HTTPException(
+            status_code=409,
+            detail="업로드 위치가 일치하지 않습니다",
+            headers={"Upload-Offset": str(session.upload_offset)}
+        )
+
+    chunk = chunk_path(upload_id)
+    try:
+        written, _ = await write_chunk(chunk, 0, request.stream(), session.file_size - upload_offset)
+
+        # 먼저 행 잠금을 잡은 요청만 받은 데이터를 옮겨 쓰고 위치를 반영
+        session = await get_upload_session(db, upload_id, user_id, for_update=True)
+        current_offset = session.upload_offset
+        if current_offset != upload_offset:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail="업로드 위치가 일치하지 않습니다",
+                headers={"Upload-Offset": str(current_offset)}
+            )
+        if written:
+            await append_chunk(part_path(upload_id), upload_offset, chunk)
+        session.upload_offset = upload_offset + written
+        session.expires_at = session_expires_at()
+        await db.commit()
+    finally:
+        await remove_file(chunk)
+
+    headers = upload_headers(session)
+    del headers["Upload-Length"]
+    return Response(status_code=204, headers=headers)
+
+@router.post("/api/uploads/{upload_id}/complete")
+async def complete_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    업로드 완료 API
+    - 모든 데이터를 받은 세션을 첨부파일로 등록하고 세션 삭제
+    - 받은 파일은 다시 복사하지 않고 내용 해시 경로로 이름만 바꿔 옮김 (같은 내용이 이미 있으면 참조 수만 증가)
+
+    Args:
+        upload_id (str): 업로드 세션 ID
+        db (AsyncSession): 데이터베이스 세션
+        user_id (str): 인증된 사용자 ID
+
+    Returns:
+        업로드된 파일 정보 (filename, id)
+    """
+    session = await get_upload_session(db, upload_id, user_id, for_update=True)
+    if session.upload_offset < session.file_size:
+        raise HTTPException(
+            status_code=409,
+            detail="아직 모든 데이터를 받지 않았습니다",
+            headers={"Upload-Offset": str(session.upload_offset)}
+        )
+
+    post = await db.scalar(select(YJPosts).where(YJPosts.post_no == session.post_no, YJPosts.is_delete == 'N'))
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    path = part_path(upload_id)
+    try:
+        sha256 = await finish_part(path, session.file_size)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다")
+    stored = await store_file(db, path, session.org_file_nm, session.file_size, sha256)
+
+    new_file = YJAttachments(
+        post_no=session.post_no,
+        file_nm=session.org_file_nm,
+        org_file_nm=session.org_file_nm,
+        file_path=stored.path,
+        file_size=stored.size,
+        file_hash=stored.sha256,
+        mime_type=session.mime_type,
+        created_at=datetime.now(seoul_tz)
+    )
+    db.add(new_file)
+    await db.delete(session)
+    await adjust_post_counts(db, session.post_no, attachments=1)
+    await db.commit()
+    await post_list_cache.invalidate()
+    await db.refresh(new_file)
+    thumbnail_pipeline.schedule(stored.path, stored.sha256, new_file.org_file_nm)
+    schedule_precompress(stored.path)
+
+    return {"filename": new_file.file_nm, "id": new_file.seq}
+
+@router.delete("/api/uploads/{upload_id}", status_code=204)
+async def cancel_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    업로드 취소 API
+    - 업로드 세션과 받는 중이던 파일을 삭제
+
+    Args:
+        upload_id (str): 업로드 세션 ID
+        db (AsyncSession): 데이터베이스 세션
+        user_id (str): 인증된 사용자 ID
+    """
+    session = await get_upload_session(db, upload_id, user_id, for_update=True)
+    await db.delete(session)
+    await db.commit()
+    await remove_file(part_path(upload_id))
+    return Response(status_code=204)
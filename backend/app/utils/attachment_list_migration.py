@@ -0,0 +1,25 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+def migrate_attachment_list_index(db: Session):
+    """
+    기존 DB에 첨부파일 목록 조회용 인덱스를 추가합니다.
+    - 이미 생성된 테이블에는 create_all이 인덱스를 추가하지 않으므로 직접 생성
+    - 게시글 필터가 없는 목록은 기본 키(seq) 순서로 읽으므로 추가 인덱스가 필요 없음
+    """
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_attachments_post_no_seq "
+        "ON vibecoding.yj_attachments (post_no, seq)"
+    ))
+    db.commit()
+
+    print("첨부파일 목록 인덱스 마이그레이션이 완료되었습니다.")
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        migrate_attachment_list_index(db)
+    finally:
+        db.close()
@@ -0,0 +1,44 @@
+import os
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from ..models.yj_attachments import YJAttachments
+from .uploads import file_sha256
+
+def migrate_attachment_hash(db: Session, batch_size: int = 500):
+    """
+    기존 첨부파일에 file_hash 컬럼을 추가하고 SHA-256 값을 채웁니다.
+    - 이미 생성된 테이블에는 create_all이 컬럼을 추가하지 않으므로 직접 ALTER
+    - 디스크에 파일이 없는 첨부파일은 NULL로 남김
+    """
+    db.execute(text("ALTER TABLE vibecoding.yj_attachments ADD COLUMN IF NOT EXISTS file_hash VARCHAR(64)"))
+    db.commit()
+
+    last_seq = 0
+    updated = 0
+    missing = 0
+    while True:
+        attachments = db.query(YJAttachments).filter(
+            YJAttachments.seq > last_seq,
+            YJAttachments.file_hash.is_(None)
+        ).order_by(YJAttachments.seq).limit(batch_size).all()
+        if not attachments:
+            break
+        for attachment in attachments:
+            if os.path.exists(attachment.file_path):
+                attachment.file_hash = file_sha256(attachment.file_path)
+                updated += 1
+            else:
+                missing += 1
+        last_seq = attachments[-1].seq
+        db.commit()
+
+    print(f"첨부파일 해시 마이그레이션이 완료되었습니다. ({updated}건, 파일 없음 {missing}건)")
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        migrate_attachment_hash(db)
+    finally:
+        db.close()
@@ -0,0 +1,390 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+import pytz
+from sqlalchemy import delete, exists, func, or_, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from ..models.yj_attachments import YJAttachments
+from ..models.yj_blobs import YJBlobs
+from ..models.yj_uploads import YJUploads
+from .precompress import ENCODING_SUFFIXES
+from .thumbnails import THUMBNAIL_DIRECTORY
+from .upload_sessions import UPLOAD_SESSION_DIRECTORY, UPLOAD_SESSION_TTL
+from .uploads import UPLOAD_DIRECTORY
+
+logger = logging.getLogger(__name__)
+
+# 한국 시간대 설정
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+# GC 설정 (환경 변수로 조정)
+# - BLOB_GC_RETENTION_DAYS: 소프트 삭제된 첨부파일, 참조가 없어진 파일, DB에 없는 파일을 남겨 두는 기간(일)
+# - BLOB_GC_BATCH_SIZE: 한 번에 조회/삭제하는 행(파일) 수 (배치마다 커밋)
+# - BLOB_GC_INTERVAL: 백그라운드 GC 주기(초), 0이면 서버에서 실행하지 않음 (CLI로만 실행)
+BLOB_GC_RETENTION_DAYS = float(os.getenv("BLOB_GC_RETENTION_DAYS", "7"))
+BLOB_GC_BATCH_SIZE = int(os.getenv("BLOB_GC_BATCH_SIZE", "500"))
+BLOB_GC_INTERVAL = float(os.getenv("BLOB_GC_INTERVAL", "0"))
+
+# 여러 워커/CLI가 동시에 GC를 실행하지 않도록 잡는 advisory lock 키
+_GC_LOCK_KEY = 0x6a625f6763
+
+# 방금 만든 디렉터리는 업로드가 파일을 쓰기 직전일 수 있으므로 이 시간(초)이 지나야 비어 있어도 삭제
+_DIRECTORY_GRACE = 60
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def _remove(path: str) -> int:
+    """파일을 지우고 지운 크기를 반환 (이미 없으면 0)"""
+    size = _file_size(path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return 0
+    return size
+
+def _normalize(path: str) -> str:
+    # 저장 당시 OS에 따라 "./uploads\\a.jpg"처럼 구분자가 다를 수 있으므로 비교용으로 통일
+    return os.path.normpath(path.replace("\\", "/"))
+
+def _stored_forms(path: str) -> List[str]:
+    """디스크 경로가 file_path 컬럼에 저장되었을 수 있는 형태 (/ 또는 \\ 구분자)"""
+    relative = os.path.relpath(path, UPLOAD_DIRECTORY).replace("\\", "/")
+    return [f"{UPLOAD_DIRECTORY}{sep}{relative.replace('/', sep)}" for sep in ("/", "\\")]
+
+def _walk_files(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """root 아래의 파일을 (경로, stat) 순서로 반환 (숨김 파일 제외)"""
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.startswith("."):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                yield path, os.stat(path)
+            except FileNotFoundError:
+                continue
+
+def _batches(items: Iterator, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _thumbnail_files(file_hash: str) -> List[str]:
+    """파일 해시로 만든 썸네일 경로 (모든 너비)"""
+    directory = os.path.join(THUMBNAIL_DIRECTORY, file_hash[:2], file_hash[2:4])
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in names if name.startswith(f"{file_hash}_w")]
+
+def _remove_empty_directories(root: str, dry_run: bool) -> int:
+    """root 아래의 빈 디렉터리를 안쪽부터 삭제 (root 자체와 방금 만든 디렉터리는 남김)"""
+    removed = 0
+    threshold = time.time() - _DIRECTORY_GRACE
+    for directory, _, _ in os.walk(root, topdown=False):
+        if os.path.normpath(directory) == os.path.normpath(root):
+            continue
+        try:
+            if os.listdir(directory) or os.stat(directory).st_mtime > threshold:
+                continue
+            if not dry_run:
+                os.rmdir(directory)
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+class BlobGarbageCollector:
+    """
+    첨부파일 저장소 GC
+    - 첨부파일 삭제/교체는 참조 수만 줄이므로(release_blob) 디스크의 첨부파일을 지우는 곳은 여기뿐
+    - 참조가 없어진 지 보존 기간이 지난 yj_blobs 파일(압축본, 썸네일 포함) 삭제
+    - uploads 디렉터리를 yj_blobs/yj_attachments와 대조해 어디에서도 쓰지 않는 파일 삭제
+      (소프트 삭제된 첨부파일의 파일은 삭제 후 보존 기간 동안 유지)
+    - 원본이 없어진 썸네일, 세션이 없는 이어 올리기 임시 파일, 빈 디렉터리 삭제
+    - 모든 단계는 BLOB_GC_BATCH_SIZE 단위로 조회/커밋하며, 지운 파일 수와 크기를 반환
+    - CLI(python -m app.utils.blob_gc)로 실행하거나 BLOB_GC_INTERVAL을 설정해 서버에서 주기적으로 실행
+    """
+
+    def __init__(
+        self,
+        retention_days: float = BLOB_GC_RETENTION_DAYS,
+        batch_size: int = BLOB_GC_BATCH_SIZE,
+        interval: float = BLOB_GC_INTERVAL
+    ):
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        # 서버 종료 시 실행 중인 GC를 다음 배치 전에 멈추기 위한 표시
+        self._stopping = False
+
+    def collect(self, db: Session, dry_run: bool = False) -> Optional[Dict[str, int]]:
+        """
+        GC 한 번 실행
+
+        Args:
+            db (Session): 동기 데이터베이스 세션
+            dry_run (bool): True면 지우지 않고 대상만 집계
+
+        Returns:
+            Dict[str, int]: 단계별 삭제 수와 회수한 크기(bytes), 다른 곳에서 GC가 실행 중이면 None
+        """
+        # 세션의 커넥션은 커밋마다 풀로 돌아가므로 잠금은 별도 커넥션에서 잡고 끝날 때 해제
+        with db.get_bind().connect() as lock_connection:
+            locked = lock_connection.scalar(select(func.pg_try_advisory_lock(_GC_LOCK_KEY)))
+            lock_connection.commit()
+            if not locked:
+                return None
+
+            cutoff = datetime.now(seoul_tz) - timedelta(days=self.retention_days)
+            report = {
+                "blobs": 0, "orphans": 0, "thumbnails": 0, "upload_parts": 0, "directories": 0, "bytes": 0
+            }
+            try:
+                self._collect_blobs(db, cutoff, dry_run, report)
+                self._collect_orphans(db, cutoff, dry_run, report)
+                self._collect_thumbnails(db, cutoff, dry_run, report)
+                self._collect_upload_parts(db, dry_run, report)
+                for root in (UPLOAD_DIRECTORY, THUMBNAIL_DIRECTORY):
+                    report["directories"] += _remove_empty_directories(root, dry_run)
+            finally:
+                db.rollback()
+                lock_connection.execute(select(func.pg_advisory_unlock(_GC_LOCK_KEY)))
+                lock_connection.commit()
+        return report
+
+    def _collect_blobs(self, db: Session, cutoff: datetime, dry_run: bool, report: Dict[str, int]):
+        """
+        참조 수가 0이 된 지 보존 기간이 지난 yj_blobs 행과 파일(압축본, 썸네일 포함) 삭제
+        - 행을 잠근 채로 파일을 지운 뒤 커밋하므로, 같은 내용을 새로 올리는 요청은 커밋 후 파일을 다시 저장
+        - 참조 수와 달리 삭제되지 않은 첨부파일이 남아 있는 파일은 건너뜀
+        """
+        conditions = (
+            YJBlobs.ref_cnt <= 0,
+            YJBlobs.updated_at < cutoff,
+            ~exists().where(YJAttachments.file_hash == YJBlobs.file_hash, YJAttachments.is_delete == 'N'),
+        )
+        if dry_run:
+            last_hash = ""
+            while not self._stopping:
+                rows = db.execute(
+                    select(YJBlobs.file_hash, YJBlobs.file_path)
+                    .where(*conditions, YJBlobs.file_hash > last_hash)
+                    .order_by(YJBlobs.file_hash)
+                    .limit(self.batch_size)
+                ).all()
+                db.rollback()
+                if not rows:
+                    return
+                for file_hash, path in rows:
+                    thumbnails = _thumbnail_files(file_hash)
+                    report["blobs"] += 1
+                    report["thumbnails"] += len(thumbnails)
+                    report["bytes"] += sum(_file_size(f) for f in [path, *thumbnails])
+                    report["bytes"] += sum(_file_size(f"{path}{suffix}") for suffix in ENCODING_SUFFIXES.values())
+                last_hash = rows[-1].file_hash
+            return
+
+        stale = (
+            select(YJBlobs.file_hash)
+            .where(*conditions)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True, of=YJBlobs)
+        )
+        while not self._stopping:
+            rows = db.execute(
+                delete(YJBlobs)
+                .where(YJBlobs.file_hash.in_(stale.scalar_subquery()), YJBlobs.ref_cnt <= 0)
+                .returning(YJBlobs.file_hash, YJBlobs.file_path)
+            ).all()
+            if not rows:
+                db.rollback()
+                return
+            for file_hash, path in rows:
+                report["blobs"] += 1
+                report["bytes"] += _remove(path)
+                report["bytes"] += sum(_remove(f"{path}{suffix}") for suffix in ENCODING_SUFFIXES.values())
+                thumbnails = _thumbnail_files(file_hash)
+                report["thumbnails"] += len(thumbnails)
+                report["bytes"] += sum(_remove(f) for f in thumbnails)
+            db.commit()
+
+    def _referenced_paths(self, db: Session, paths: List[str], cutoff: datetime) -> set:
+        """paths 중 yj_blobs 또는 첨부파일(삭제되지 않았거나 보존 기간 내에 삭제된 것)이 사용하는 경로"""
+        forms = [form for path in paths for form in _stored_forms(path)]
+        blob_paths = db.scalars(select(YJBlobs.file_path).where(YJBlobs.file_path.in_(forms))).all()
+        attachment_paths = db.scalars(
+            select(YJAttachments.file_path).where(
+                YJAttachments.file_path.in_(forms),
+                or_(
+                    YJAttachments.is_delete == 'N',
+                    func.coalesce(YJAttachments.updated_at, YJAttachments.created_at) >= cutoff
+                )
+            )
+        ).all()
+        db.rollback()
+        return {_normalize(path) for path in [*blob_paths, *attachment_paths]}
+
+    def _collect_orphans(self, db: Session, cutoff: datetime, dry_run: bool, report: Dict[str, int]):
+        """
+        uploads 아래에서 어디에서도 사용하지 않고 보존 기간보다 오래된 파일 삭제
+        - 롤백된 업로드가 남긴 파일, 보존 기간이 지난 소프트 삭제 첨부파일(해시 이전 경로 포함), 남은 임시 파일
+        - 압축본(.gz/.br)은 원본이 사용 중이면 유지
+        """
+        threshold = cutoff.timestamp()
+        candidates = (
+            (path, stat_result) for path, stat_result in _walk_files(UPLOAD_DIRECTORY)
+            if stat_result.st_mtime < threshold
+        )
+        for batch in _batches(candidates, self.batch_size):
+            if self._stopping:
+                return
+            owners = {}
+            for path, _ in batch:
+                owner = path
+                for suffix in ENCODING_SUFFIXES.values():
+                    if path.endswith(suffix):
+                        owner = path[:-len(suffix)]
+                owners[path] = owner
+            referenced = self._referenced_paths(db, sorted(set(owners.values())), cutoff)
+            for path, stat_result in batch:
+                if _normalize(owners[path]) in referenced:
+                    continue
+                report["orphans"] += 1
+                report["bytes"] += stat_result.st_size if dry_run else _remove(path)
+
+    def _collect_thumbnails(self, db: Session, cutoff: datetime, dry_run: bool, report: Dict[str, int]):
+        """
+        yj_blobs에 없는 원본의 썸네일 중 보존 기간보다 오래된 것 삭제
+        - 해시가 없는 기존 첨부파일의 썸네일도 여기서 정리되며, 필요하면 요청 시 다시 생성됨
+        """
+        threshold = cutoff.timestamp()
+        candidates = (
+            (path, stat_result) for path, stat_result in _walk_files(THUMBNAIL_DIRECTORY)
+            if stat_result.st_mtime < threshold
+        )
+        for batch in _batches(candidates, self.batch_size):
+            if self._stopping:
+                return
+            keys = {path: os.path.basename(path).split("_w")[0] for path, _ in batch}
+            existing = set(db.scalars(
+                select(YJBlobs.file_hash).where(YJBlobs.file_hash.in_(set(keys.values())))
+            ).all())
+            db.rollback()
+            for path, stat_result in batch:
+                # 변환 중 남은 임시 파일(.part)은 원본이 있어도 삭제
+                if keys[path] in existing and not path.endswith(".part"):
+                    continue
+                report["thumbnails"] += 1
+                report["bytes"] += stat_result.st_size if dry_run else _remove(path)
+
+    def _collect_upload_parts(self, db: Session, dry_run: bool, report: Dict[str, int]):
+        """
+        세션(yj_uploads)이 없는 이어 올리기 임시 파일 삭제
+        - 세션 정리 중 서버가 종료되는 등으로 남은 파일이며, 세션 유지 시간(UPLOAD_SESSION_TTL)이 지난 것만 삭제
+        """
+        threshold = time.time() - UPLOAD_SESSION_TTL
+        candidates = (
+            (path, stat_result) for path, stat_result in _walk_files(UPLOAD_SESSION_DIRECTORY)
+            if stat_result.st_mtime < threshold
+        )
+        for batch in _batches(candidates, self.batch_size):
+            if self._stopping:
+                return
+            upload_ids = {path: os.path.basename(path).split(".")[0] for path, _ in batch}
+            existing = set(db.scalars(
+                select(YJUploads.upload_id).where(YJUploads.upload_id.in_(set(upload_ids.values())))
+            ).all())
+            db.rollback()
+            for path, stat_result in batch:
+                if upload_ids[path] in existing:
+                    continue
+                report["upload_parts"] += 1
+                report["bytes"] += stat_result.st_size if dry_run else _remove(path)
+
+    def _run_once_sync(self) -> Optional[Dict[str, int]]:
+        from ..database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return self.collect(db)
+        finally:
+            db.close()
+
+    async def run_once(self) -> Optional[Dict[str, int]]:
+        """GC를 스레드풀에서 한 번 실행 (파일 시스템 탐색과 삭제가 이벤트 루프를 막지 않도록)"""
+        try:
+            report = await run_in_threadpool(self._run_once_sync)
+        except Exception:
+            logger.exception("첨부파일 GC 실패")
+            return None
+        if report:
+            logger.info("첨부파일 GC 완료", extra={"gc": report})
+        return report
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    def start(self):
+        """주기적 GC 시작 (서버 시작 시 호출, BLOB_GC_INTERVAL이 0이면 실행하지 않음)"""
+        self._stopping = False
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """GC 중지 (서버 종료 시 호출, 실행 중이면 진행 중인 배치까지만 처리)"""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+blob_gc = BlobGarbageCollector()
+
+def _format_report(report: Dict[str, int]) -> str:
+    return (
+        f"파일 {report['blobs']}건, 사용하지 않는 파일 {report['orphans']}건, "
+        f"썸네일 {report['thumbnails']}건, 이어 올리기 임시 파일 {report['upload_parts']}건, "
+        f"빈 디렉터리 {report['directories']}건, 회수한 크기 {report['bytes']} bytes"
+    )
+
+if __name__ == "__main__":
+    import argparse
+    from ..database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="첨부파일 저장소 GC")
+    parser.add_argument("--dry-run", action="store_true", help="지우지 않고 대상만 집계")
+    parser.add_argument("--retention-days", type=float, default=BLOB_GC_RETENTION_DAYS, help="보존 기간(일)")
+    parser.add_argument("--batch-size", type=int, default=BLOB_GC_BATCH_SIZE, help="배치 크기")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        collector = BlobGarbageCollector(retention_days=args.retention_days, batch_size=args.batch_size)
+        report = collector.collect(db, dry_run=args.dry_run)
+    finally:
+        db.close()
+    if report is None:
+        print("다른 곳에서 GC가 실행 중입니다.")
+    else:
+        prefix = "GC 대상 (dry-run)" if args.dry_run else "GC가 완료되었습니다."
+        print(f"{prefix} ({_format_report(report)})")
@@ -0,0 +1,106 @@
+import os
+import shutil
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..models.yj_attachments import YJAttachments
+from ..models.yj_blobs import YJBlobs
+from .uploads import file_sha256
+from .blob_store import blob_path
+
+def link_or_copy(source: str, destination: str):
+    """원본을 지우기 전에 새 경로에서도 읽을 수 있도록 하드 링크 (안 되면 복사)"""
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+def migrate_blob_store(db: Session, batch_size: int = 500):
+    """
+    기존 첨부파일을 내용 해시 기반 저장소(yj_blobs)로 옮기고 중복 파일을 정리합니다.
+    - 첨부파일을 seq 순으로 batch_size씩 읽어 파일 해시를 계산하고, 해시 경로로 옮기거나(같은 내용이 이미 있으면) 버림
+    - 배치마다 file_path/file_hash를 커밋한 뒤 원래 파일을 삭제하므로, 중간에 멈춰도 다시 실행하면 이어서 처리
+    - 마지막에 삭제되지 않은 첨부파일 수로 yj_blobs의 참조 수를 다시 계산
+    - 업로드가 없는 시간에 실행 (실행 중 올라온 파일은 참조 수 계산에서 빠질 수 있음)
+    """
+    YJBlobs.__table__.create(bind=db.get_bind(), checkfirst=True)
+    db.execute(text("ALTER TABLE vibecoding.yj_attachments ADD COLUMN IF NOT EXISTS file_hash VARCHAR(64)"))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_attachments_file_hash "
+        "ON vibecoding.yj_attachments (file_hash)"
+    ))
+    db.commit()
+
+    moved = {}   # 기존 경로 -> (해시, 저장 경로)
+    blobs = {}   # 해시 -> [저장 경로, 크기, 참조 수]
+    migrated = duplicates = missing = reclaimed = 0
+    last_seq = 0
+    while True:
+        attachments = db.query(YJAttachments).filter(
+            YJAttachments.seq > last_seq
+        ).order_by(YJAttachments.seq).limit(batch_size).all()
+        if not attachments:
+            break
+
+        sources = []
+        for attachment in attachments:
+            source = attachment.file_path
+            if source not in moved:
+                if not os.path.exists(source):
+                    missing += 1
+                    continue
+                file_hash = file_sha256(source)
+                if file_hash not in blobs:
+                    # 이미 저장소에 있는 내용이면 그 경로를 그대로 사용
+                    blob = db.get(YJBlobs, file_hash)
+                    path = blob.file_path if blob else blob_path(file_hash, source)
+                    blobs[file_hash] = [path, os.path.getsize(source), 0]
+                path = blobs[file_hash][0]
+                if os.path.abspath(source) != os.path.abspath(path):
+                    if os.path.exists(path):
+                        duplicates += 1
+                        reclaimed += os.path.getsize(source)
+                    else:
+                        link_or_copy(source, path)
+                        migrated += 1
+                    sources.append(source)
+                moved[source] = (file_hash, path)
+
+            file_hash, path = moved[source]
+            attachment.file_hash = file_hash
+            attachment.file_path = path
+            if attachment.is_delete == 'N':
+                blobs[file_hash][2] += 1
+        last_seq = attachments[-1].seq
+        db.commit()
+
+        for source in sources:
+            if os.path.exists(source):
+                os.remove(source)
+
+    items = list(blobs.items())
+    for start in range(0, len(items), batch_size):
+        statement = insert(YJBlobs).values([
+            {"file_hash": file_hash, "file_path": path, "file_size": size, "ref_cnt": ref_cnt}
+            for file_hash, (path, size, ref_cnt) in items[start:start + batch_size]
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[YJBlobs.file_hash],
+            set_={"file_path": statement.excluded.file_path, "ref_cnt": statement.excluded.ref_cnt}
+        ))
+        db.commit()
+
+    print(
+        f"첨부파일 저장소 마이그레이션이 완료되었습니다. "
+        f"(이동 {migrated}건, 중복 제거 {duplicates}건, 확보 {reclaimed}바이트, 파일 없음 {missing}건)"
+    )
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        migrate_blob_store(db)
+    finally:
+        db.close()
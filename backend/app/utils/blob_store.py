@@ -0,0 +1,123 @@
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime
+import pytz
+from fastapi import UploadFile
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from ..models.yj_attachments import YJAttachments
+from ..models.yj_blobs import YJBlobs
+from .uploads import UPLOAD_DIRECTORY, MAX_FILE_SIZE, StoredFile, save_upload, remove_file
+
+# 한국 시간대 설정
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+# 저장 파일명에 붙일 수 있는 확장자 (정적 파일 서빙 시 MIME 타입 판단용)
+_EXTENSION_PATTERN = re.compile(r'^\.[a-z0-9]{1,10}$')
+
+def blob_path(file_hash: str, filename: str) -> str:
+    """
+    내용 해시로 정한 저장 경로 (UPLOAD_DIRECTORY/ab/cd/<sha256><확장자>, ab/cd는 해시 앞 4자리)
+    - 해시가 곧 고유 이름이므로 이름 충돌 확인(파일 존재 여부 반복 조회)이 필요 없음
+    - 앞 두 단계 디렉터리로 나누어 한 디렉터리의 파일 수가 계속 늘어나지 않게 함
+    - 같은 내용이면 원본 파일명과 관계없이 같은 경로
+    """
+    ext = os.path.splitext(filename or "")[1].lower()
+    if not _EXTENSION_PATTERN.match(ext):
+        ext = ""
+    return os.path.join(UPLOAD_DIRECTORY, file_hash[:2], file_hash[2:4], f"{file_hash}{ext}")
+
+async def _claim_blob(db: AsyncSession, sha256: str, filename: str, size: int) -> str:
+    """yj_blobs 행을 추가하거나 참조 수를 1 증가시키고(커밋까지 행 잠금 유지) 저장 경로를 반환"""
+    now = datetime.now(seoul_tz)
+    return await db.scalar(
+        insert(YJBlobs)
+        .values(file_hash=sha256, file_path=blob_path(sha256, filename), file_size=size,
+                ref_cnt=1, created_at=now, updated_at=now)
+        .on_conflict_do_update(
+            index_elements=[YJBlobs.file_hash],
+            set_={"ref_cnt": YJBlobs.ref_cnt + 1, "updated_at": now}
+        )
+        .returning(YJBlobs.file_path)
+    )
+
+def _move_into_place(source: str, path: str):
+    """source를 저장 경로로 옮김 (이미 같은 내용의 파일이 있으면 source만 삭제, 스레드에서 실행)"""
+    if os.path.exists(path):
+        os.remove(source)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        os.replace(source, path)
+    except OSError:
+        # 다른 파일 시스템이면 이름 변경이 안 되므로 복사 후 삭제
+        shutil.move(source, path)
+
+async def store_upload(db: AsyncSession, file: UploadFile, max_size: int = MAX_FILE_SIZE) -> StoredFile:
+    """
+    업로드 파일을 내용 해시 기준으로 한 번만 저장하고 참조 수를 1 증가 (호출한 쪽의 트랜잭션에서 함께 커밋)
+    - 업로드 파일은 한 번만 읽음: uploads 아래 임시 파일로 복사하면서 크기와 해시를 함께 계산(save_upload)한 뒤
+      store_file로 저장 경로로 이름만 바꿔 옮김. 같은 내용의 파일이 이미 있으면 임시 파일만 삭제
+    - yj_blobs 행을 INSERT ... ON CONFLICT로 잡은 뒤(커밋까지 행 잠금 유지) 파일을 확인/저장하므로
+      같은 내용을 동시에 올려도 한 번만 저장되고, 참조 수가 0이 되어 지워지는 중인 파일과도 겹치지 않음
+    - 트랜잭션이 롤백되어 참조되지 않는 파일은 다른 요청이 이미 사용 중일 수 있으므로 여기서 지우지 않음
+
+    Args:
+        db (AsyncSession): 데이터베이스 세션
+        file (UploadFile): 업로드 파일
+        max_size (int): 최대 크기 (넘으면 400)
+
+    Returns:
+        StoredFile: 저장 경로, 크기, SHA-256(hex)
+    """
+    # 저장 경로와 같은 파일 시스템에 받아 두어야 옮길 때 다시 복사하지 않음
+    await run_in_threadpool(os.makedirs, UPLOAD_DIRECTORY, exist_ok=True)
+    staged = await save_upload(file, os.path.join(UPLOAD_DIRECTORY, f"{uuid.uuid4().hex}.upload"), max_size)
+    try:
+        return await store_file(db, staged.path, file.filename, staged.size, staged.sha256)
+    except BaseException:
+        await remove_file(staged.path)
+        raise
+
+async def store_file(db: AsyncSession, source: str, filename: str, size: int, sha256: str) -> StoredFile:
+    """
+    이미 디스크에 다 받은 파일(source)을 저장소로 옮기고 참조 수를 1 증가 (호출한 쪽의 트랜잭션에서 함께 커밋)
+    - 다시 복사하지 않고 이름만 바꿔 옮기며, 같은 내용의 파일이 이미 있으면 source는 삭제
+    - 행 잠금, 롤백 시 동작은 store_upload와 동일
+
+    Args:
+        db (AsyncSession): 데이터베이스 세션
+        source (str): 받은 파일 경로 (같은 파일 시스템이면 이름 변경으로 옮김)
+        filename (str): 원본 파일명 (확장자 결정용)
+        size (int): 파일 크기
+        sha256 (str): 파일 내용의 SHA-256(hex)
+
+    Returns:
+        StoredFile: 저장 경로, 크기, SHA-256(hex)
+    """
+    path = await _claim_blob(db, sha256, filename, size)
+    await run_in_threadpool(_move_into_place, source, path)
+    return StoredFile(path, size, sha256)
+
+async def release_blob(db: AsyncSession, attachment: YJAttachments):
+    """
+    첨부파일이 사용하던 파일의 참조 수를 1 감소 (호출한 쪽의 트랜잭션에서 함께 커밋)
+    - 파일과 yj_blobs 행은 지우지 않음 (롤백되면 참조 수만 되돌아가고, 소프트 삭제 후 복구 가능)
+    - 참조 수가 0이 된 파일은 보존 기간(BLOB_GC_RETENTION_DAYS)이 지난 뒤 GC(blob_gc)가 삭제
+    - yj_blobs에 없는 경로의 기존 첨부파일(blob_migration 이전)은 아무것도 하지 않음 (GC가 보존 기간 후 정리)
+
+    Args:
+        db (AsyncSession): 데이터베이스 세션
+        attachment (YJAttachments): 삭제되는 첨부파일
+    """
+    if not attachment.file_hash:
+        return
+    await db.execute(
+        update(YJBlobs)
+        .where(YJBlobs.file_hash == attachment.file_hash, YJBlobs.file_path == attachment.file_path)
+        .values(ref_cnt=YJBlobs.ref_cnt - 1, updated_at=datetime.now(seoul_tz))
+    )
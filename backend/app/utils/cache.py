@@ -0,0 +1,212 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    """
+    만료 시간(TTL)과 최대 크기가 있는 프로세스 내 캐시
+    - 최대 크기를 넘으면 가장 오래된 항목부터 제거
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class CacheBackend:
+    """
+    응답 캐시 저장소 인터페이스
+    - 단일 워커는 MemoryCacheBackend, 여러 워커는 RedisCacheBackend 사용
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def size(self) -> Optional[int]:
+        return None
+
+    async def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거하는(LRU) 프로세스 내 저장소"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    async def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    async def size(self) -> Optional[int]:
+        return len(self._data)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis 프로토콜 저장소 (여러 워커가 캐시를 공유할 때 사용)
+    - redis 패키지가 필요하며, 최대 크기/LRU 제거는 서버의 maxmemory 정책을 따름
+    - 세대 번호 키는 TTL이 없으므로 volatile-lru 정책을 사용하면 제거되지 않음
+    - client를 넘기면 url 대신 그 클라이언트를 사용 (테스트에서 fakeredis 등 대체 서버 사용, decode_responses=True 필요)
+    """
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            try:
+                from redis import asyncio as redis_asyncio
+            except ImportError:
+                raise RuntimeError("RedisCacheBackend를 사용하려면 redis 패키지를 설치해야 합니다")
+            client = redis_asyncio.from_url(url, decode_responses=True)
+        self._client = client
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        await self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def counter(self, key: str) -> int:
+        return int(await self._client.get(key) or 0)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_cache_backend(maxsize: int = 1024) -> CacheBackend:
+    """CACHE_BACKEND 환경 변수(memory, redis)에 따라 캐시 저장소 생성"""
+    backend = os.getenv("CACHE_BACKEND", "memory")
+    if backend == "redis":
+        return RedisCacheBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    return MemoryCacheBackend(maxsize=maxsize)
+
+
+class ResponseCache:
+    """
+    API 응답(JSON) 캐시
+    - 키는 namespace + 세대(generation) 번호 + 요청 조건으로 구성 (key()로 생성한 키를 get/set에 사용)
+    - invalidate()는 세대 번호만 올리므로 저장소 종류와 관계없이 O(1)로 전체 무효화
+      (이전 세대 항목은 TTL 만료 또는 LRU 제거로 정리됨)
+    - 적중/실패 횟수는 워커(프로세스)별로 집계
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: Optional[float] = None):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def _generation(self) -> int:
+        return await self.backend.counter(f"{self.namespace}:gen")
+
+    async def key(self, key_parts: tuple) -> str:
+        """
+        요청 조건으로 캐시 키 생성 (현재 세대 번호를 한 번만 읽어 키에 고정)
+        - 같은 요청의 get/set에 이 키를 함께 사용해야, 조회 도중 invalidate()가 일어났을 때
+          이전 데이터로 만든 응답이 새 세대에 저장되지 않음
+        """
+        generation = await self._generation()
+        return f"{self.namespace}:{generation}:" + json.dumps(key_parts, ensure_ascii=False, default=str)
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def set(self, key: str, value: Any):
+        await self.backend.set(key, json.dumps(value, ensure_ascii=False), self.ttl)
+
+    async def invalidate(self):
+        await self.backend.incr(f"{self.namespace}:gen")
+
+    async def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / total, 4) if total else 0.0,
+            "size": await self.backend.size(),
+        }
+
+
+# 게시글 목록 응답 캐시 (게시글 생성/수정/삭제와 댓글/첨부파일 수가 바뀔 때 무효화)
+# 조회수는 최대 POST_LIST_CACHE_TTL초까지 이전 값이 보일 수 있음
+POST_LIST_CACHE_TTL = int(os.getenv("POST_LIST_CACHE_TTL", "60"))
+POST_LIST_CACHE_SIZE = int(os.getenv("POST_LIST_CACHE_SIZE", "1024"))
+post_list_cache = ResponseCache(
+    create_cache_backend(maxsize=POST_LIST_CACHE_SIZE),
+    namespace="posts:list",
+    ttl=POST_LIST_CACHE_TTL
+)
@@ -0,0 +1,49 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from .comment_tree import PATH_WIDTH, PATH_SEPARATOR
+
+def migrate_comment_path(db: Session):
+    """
+    기존 댓글에 path/depth 컬럼과 댓글 조회용 인덱스를 추가하고 값을 채웁니다.
+    - 이미 생성된 테이블에는 create_all이 컬럼을 추가하지 않으므로 직접 ALTER
+    - 최상위 댓글부터 재귀 CTE로 경로와 깊이를 계산 (부모가 없는 댓글은 NULL로 남아 트리에서 제외)
+    """
+    db.execute(text('ALTER TABLE vibecoding.yj_comments ADD COLUMN IF NOT EXISTS path VARCHAR COLLATE "C"'))
+    db.execute(text("ALTER TABLE vibecoding.yj_comments ADD COLUMN IF NOT EXISTS depth INTEGER NOT NULL DEFAULT 0"))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_comments_post_no_path "
+        "ON vibecoding.yj_comments (post_no, path)"
+    ))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_comments_post_no_parent_seq "
+        "ON vibecoding.yj_comments (post_no, parent_cmmt_no, seq)"
+    ))
+    result = db.execute(text(
+        """
+        WITH RECURSIVE tree AS (
+            SELECT seq, lpad(seq::text, :width, '0') || :sep AS path, 0 AS depth
+            FROM vibecoding.yj_comments
+            WHERE parent_cmmt_no = 0
+            UNION ALL
+            SELECT c.seq, tree.path || lpad(c.seq::text, :width, '0') || :sep, tree.depth + 1
+            FROM vibecoding.yj_comments c
+            JOIN tree ON c.parent_cmmt_no = tree.seq
+        )
+        UPDATE vibecoding.yj_comments AS c
+        SET path = tree.path, depth = tree.depth
+        FROM tree
+        WHERE c.seq = tree.seq AND (c.path IS DISTINCT FROM tree.path OR c.depth <> tree.depth)
+        """
+    ), {"width": PATH_WIDTH, "sep": PATH_SEPARATOR})
+    db.commit()
+
+    print(f"댓글 경로 마이그레이션이 완료되었습니다. ({result.rowcount}건)")
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        migrate_comment_path(db)
+    finally:
+        db.close()
@@ -0,0 +1,247 @@
+import os
+from typing import Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from ..models.yj_comments import YJComments
+from ..models.yj_users import YJUsers
+from .cursor import encode_cursor, decode_cursor
+
+# 댓글/답글 한 페이지의 기본/최대 개수
+COMMENT_PAGE_SIZE = int(os.getenv("COMMENT_PAGE_SIZE", "20"))
+MAX_COMMENT_PAGE_SIZE = 100
+# 페이지의 각 댓글에 미리 포함할 직속 답글 수 (나머지는 replies 엔드포인트로 조회)
+REPLY_PREVIEW_SIZE = int(os.getenv("REPLY_PREVIEW_SIZE", "3"))
+# 하위 트리(thread) 한 페이지의 기본/최대 댓글 수
+THREAD_PAGE_SIZE = int(os.getenv("THREAD_PAGE_SIZE", "100"))
+MAX_THREAD_PAGE_SIZE = 500
+
+# path 한 단계의 자릿수 (Integer 댓글 번호의 최대 자릿수)
+PATH_WIDTH = 10
+PATH_SEPARATOR = '/'
+
+def make_comment_path(parent_path: Optional[str], seq: int) -> str:
+    """
+    댓글 경로 생성
+    - 댓글 번호를 고정 길이로 이어 붙이므로 path 문자열 순서 = 트리의 깊이 우선 순서
+    - 같은 부모 아래에서는 댓글 번호(작성 순서) 순으로 정렬됨
+    """
+    return f"{parent_path or ''}{seq:0{PATH_WIDTH}d}{PATH_SEPARATOR}"
+
+def serialize_comment(comment: YJComments, author_name: Optional[str], reply_count: int) -> dict:
+    """댓글 응답 형식으로 변환 (replies에는 미리보기 답글을 채움)"""
+    return {
+        "id": comment.seq,
+        "content": comment.contents,
+        "author": {
+            "id": comment.author_usrid,
+            "name": author_name or "Unknown"
+        },
+        "createdAt": comment.created_at.isoformat() if comment.created_at else "",
+        "updatedAt": comment.updated_at.isoformat() if comment.updated_at else "",
+        "isDeleted": comment.is_delete == 'Y',
+        "parent_id": comment.parent_cmmt_no,
+        "depth": comment.depth,
+        "replyCount": reply_count,
+        "replies": []
+    }
+
+def build_comment_tree(rows: Iterable[Tuple[YJComments, Optional[str], int]], root_parent_id: int = 0) -> List[dict]:
+    """
+    부모가 자식보다 먼저 나오도록 정렬된 (댓글, 작성자 이름, 직속 답글 수) 목록을 한 번 순회해 트리로 구성
+    - path 순서(깊이 우선) 또는 부모 댓글 페이지 뒤에 답글이 이어지는 순서면 별도 정렬 없이 부모의 replies에 차례로 추가
+    - 부모가 목록에 없는 댓글(부모가 이전 페이지에 있는 댓글)은 최상위에 두며 parent_id로 위치를 알 수 있음
+
+    Args:
+        rows: (댓글, 작성자 이름, 직속 답글 수) 목록
+        root_parent_id: 최상위로 취급할 부모 댓글 번호 (하위 트리/답글 조회 시 해당 댓글 번호)
+
+    Returns:
+        최상위 댓글 목록 (각 댓글의 replies에 하위 댓글 포함)
+    """
+    nodes = {}
+    roots = []
+    for comment, author_name, reply_count in rows:
+        node = serialize_comment(comment, author_name, reply_count)
+        parent = nodes.get(comment.parent_cmmt_no) if comment.parent_cmmt_no != root_parent_id else None
+        if parent is None:
+            roots.append(node)
+        else:
+            parent["replies"].append(node)
+        nodes[comment.seq] = node
+    return roots
+
+def _reply_count():
+    """삭제되지 않은 직속 답글 수 (상관 서브쿼리)"""
+    reply = aliased(YJComments)
+    return (
+        select(func.count(reply.seq))
+        .where(
+            reply.post_no == YJComments.post_no,
+            reply.parent_cmmt_no == YJComments.seq,
+            reply.is_delete == 'N'
+        )
+        .correlate(YJComments)
+        .scalar_subquery()
+    )
+
+def _comment_rows(post_no: int):
+    """(댓글, 작성자 이름, 직속 답글 수) 조회 쿼리"""
+    return (
+        select(YJComments, YJUsers.usr_nm, _reply_count())
+        .outerjoin(YJUsers, YJUsers.usr_id == YJComments.author_usrid)
+        .where(YJComments.post_no == post_no, YJComments.is_delete == 'N')
+    )
+
+async def _reply_preview_rows(db: AsyncSession, post_no: int, rows: list) -> list:
+    """
+    페이지의 각 댓글의 직속 답글을 작성 순으로 REPLY_PREVIEW_SIZE개까지 조회
+    - 부모별 row_number()로 한 번의 쿼리에서 모든 댓글의 미리보기를 조회
+    """
+    parent_ids = [comment.seq for comment, _, count in rows if count > 0]
+    if REPLY_PREVIEW_SIZE <= 0 or not parent_ids:
+        return []
+    ranked = (
+        select(
+            YJComments.seq,
+            func.row_number().over(
+                partition_by=YJComments.parent_cmmt_no, order_by=YJComments.seq
+            ).label("rn")
+        )
+        .where(
+            YJComments.post_no == post_no,
+            YJComments.parent_cmmt_no.in_(parent_ids),
+            YJComments.is_delete == 'N'
+        )
+        .subquery()
+    )
+    return (await db.execute(
+        _comment_rows(post_no)
+        .join(ranked, ranked.c.seq == YJComments.seq)
+        .where(ranked.c.rn <= REPLY_PREVIEW_SIZE)
+        .order_by(YJComments.parent_cmmt_no, YJComments.seq)
+    )).all()
+
+def _parse_comment_cursor(cursor: str, parent_no: int, sort_order: str) -> int:
+    """커서를 마지막 댓글 번호로 복원 (다른 부모/정렬 조건의 커서면 400)"""
+    data = decode_cursor(cursor)
+    if data.get("p") != parent_no or data.get("o") != sort_order:
+        raise HTTPException(status_code=400, detail="정렬 조건이 커서와 일치하지 않습니다")
+    try:
+        return int(data["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다")
+
+async def get_comment_page(
+    db: AsyncSession,
+    post_no: int,
+    parent_no: int = 0,
+    after: Optional[str] = None,
+    size: int = COMMENT_PAGE_SIZE,
+    sort_order: str = 'asc'
+) -> dict:
+    """
+    한 부모 아래의 삭제되지 않은 댓글을 댓글 번호 키셋으로 한 페이지 조회
+    - parent_no가 0이면 최상위 댓글, 아니면 해당 댓글의 직속 답글
+    - 각 댓글의 삭제되지 않은 직속 답글 수(replyCount)와 작성자 이름을 함께 조회
+    - 각 댓글의 replies에는 처음 REPLY_PREVIEW_SIZE개의 답글만 포함 (쿼리 최대 2번)
+
+    Args:
+        db (AsyncSession): 데이터베이스 세션
+        post_no (int): 게시글 번호
+        parent_no (int): 부모 댓글 번호 (최상위는 0)
+        after (str, optional): 이전 페이지의 nextCursor 값
+        size (int): 페이지당 댓글 수 (최대 100)
+        sort_order (str): 댓글 번호(작성 순서) 정렬 방향 (asc, desc)
+
+    Returns:
+        comments (list): 댓글 목록
+        nextCursor (str): 다음 페이지 조회용 커서 (마지막 페이지면 None)
+    """
+    if size < 1 or size > MAX_COMMENT_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"size는 1~{MAX_COMMENT_PAGE_SIZE} 사이여야 합니다")
+    if sort_order not in ('asc', 'desc'):
+        raise HTTPException(status_code=400, detail="Invalid sort order")
+
+    query = _comment_rows(post_no).where(YJComments.parent_cmmt_no == parent_no)
+    if after:
+        last_seq = _parse_comment_cursor(after, parent_no, sort_order)
+        query = query.where(YJComments.seq > last_seq if sort_order == 'asc' else YJComments.seq < last_seq)
+    order = YJComments.seq.asc() if sort_order == 'asc' else YJComments.seq.desc()
+
+    # 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+    rows = (await db.execute(query.order_by(order).limit(size + 1))).all()
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor({"p": parent_no, "o": sort_order, "id": rows[-1][0].seq})
+
+    # 페이지 댓글 뒤에 미리보기 답글을 이어 붙여 한 번에 트리로 구성
+    rows = list(rows) + list(await _reply_preview_rows(db, post_no, rows))
+    return {"comments": build_comment_tree(rows, parent_no), "nextCursor": next_cursor}
+
+def _deleted_ancestor_within(root: YJComments):
+    """root 아래(root 제외)에 삭제된 조상 댓글이 있는지 (path 접두사로 확인)"""
+    ancestor = aliased(YJComments)
+    return exists().where(
+        ancestor.post_no == YJComments.post_no,
+        ancestor.is_delete == 'Y',
+        ancestor.path > root.path,
+        ancestor.path < YJComments.path,
+        YJComments.path.startswith(ancestor.path)
+    )
+
+def _parse_thread_cursor(cursor: str, root_no: int) -> str:
+    """커서를 마지막 댓글의 path로 복원 (다른 댓글의 커서면 400)"""
+    data = decode_cursor(cursor)
+    if data.get("r") != root_no:
+        raise HTTPException(status_code=400, detail="정렬 조건이 커서와 일치하지 않습니다")
+    path = data.get("path")
+    if not isinstance(path, str):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다")
+    return path
+
+async def get_comment_thread(
+    db: AsyncSession,
+    root: YJComments,
+    after: Optional[str] = None,
+    size: int = THREAD_PAGE_SIZE
+) -> dict:
+    """
+    댓글의 하위 트리(모든 깊이의 답글)를 path 순서(깊이 우선)로 한 페이지 조회
+    - path 접두사와 (post_no, path) 인덱스로 하위 트리만 찾고 정렬까지 SQL에서 처리
+    - 삭제된 댓글과 그 하위 댓글은 제외
+    - 다음 페이지의 댓글 중 부모가 이전 페이지에 있는 댓글은 최상위에 위치 (build_comment_tree 참고)
+
+    Args:
+        db (AsyncSession): 데이터베이스 세션
+        root (YJComments): 하위 트리를 조회할 댓글
+        after (str, optional): 이전 페이지의 nextCursor 값
+        size (int): 페이지당 댓글 수 (최대 500)
+
+    Returns:
+        comments (list): root의 직속 답글 목록 (각 답글의 replies에 하위 답글 포함)
+        nextCursor (str): 다음 페이지 조회용 커서 (마지막 페이지면 None)
+    """
+    if size < 1 or size > MAX_THREAD_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"size는 1~{MAX_THREAD_PAGE_SIZE} 사이여야 합니다")
+    if root.path is None:
+        # 경로 마이그레이션 전의 댓글
+        return {"comments": [], "nextCursor": None}
+
+    last_path = _parse_thread_cursor(after, root.seq) if after else root.path
+    query = _comment_rows(root.post_no).where(
+        YJComments.path.startswith(root.path, autoescape=True),
+        YJComments.path > last_path,
+        ~_deleted_ancestor_within(root)
+    )
+
+    # 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+    rows = (await db.execute(query.order_by(YJComments.path).limit(size + 1))).all()
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor({"r": root.seq, "path": rows[-1][0].path})
+
+    return {"comments": build_comment_tree(rows, root.seq), "nextCursor": next_cursor}
@@ -0,0 +1,90 @@
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..models.yj_counters import YJCounters
+from ..models.yj_posts import YJPosts
+from .counters import POST_TOTAL
+
+def reconcile_post_total(db: Session, missing_only: bool = False) -> int:
+    """
+    삭제되지 않은 전체 게시글 수 카운터(POST_TOTAL)를 실제 값과 맞춥니다.
+    - 카운터 행을 먼저 만들어 커밋한 뒤 그 행을 잠근 상태에서 개수를 세므로,
+      세는 동안 작성/삭제된 게시글의 increment_counter는 잠금을 기다렸다가 새 값에 더해짐
+    - missing_only가 True이면 카운터가 없을 때만 채움 (서버 시작 시 사용)
+
+    Returns:
+        int: 카운터 값
+    """
+    if missing_only:
+        value = db.scalar(select(YJCounters.counter_val).where(YJCounters.counter_nm == POST_TOTAL))
+        if value is not None:
+            return value
+
+    db.execute(
+        insert(YJCounters)
+        .values(counter_nm=POST_TOTAL, counter_val=0)
+        .on_conflict_do_nothing(index_elements=[YJCounters.counter_nm])
+    )
+    db.commit()
+
+    db.execute(select(YJCounters.counter_val).where(YJCounters.counter_nm == POST_TOTAL).with_for_update())
+    value = db.scalar(select(func.count()).select_from(YJPosts).where(YJPosts.is_delete == 'N'))
+    db.execute(update(YJCounters).where(YJCounters.counter_nm == POST_TOTAL).values(counter_val=value))
+    db.commit()
+    return value
+
+def reconcile_post_counts(db: Session, batch_size: int = 1000):
+    """
+    게시글의 댓글/첨부파일 수(comment_cnt, attach_cnt)를 실제 값과 맞춥니다.
+    - 이미 생성된 테이블에는 create_all이 컬럼을 추가하지 않으므로 직접 ALTER
+    - post_no 구간을 batch_size 단위로 나누어 실제 개수를 세고, 값이 다른 게시글만 갱신
+    - 처음 실행 시 컬럼 추가와 값 채우기를 함께 처리하며, 이후에는 어긋난 값 보정용으로 실행
+    """
+    db.execute(text("ALTER TABLE vibecoding.yj_posts ADD COLUMN IF NOT EXISTS comment_cnt INTEGER NOT NULL DEFAULT 0"))
+    db.execute(text("ALTER TABLE vibecoding.yj_posts ADD COLUMN IF NOT EXISTS attach_cnt INTEGER NOT NULL DEFAULT 0"))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_posts_comment_cnt_post_no "
+        "ON vibecoding.yj_posts (comment_cnt, post_no)"
+    ))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_posts_attach_cnt_post_no "
+        "ON vibecoding.yj_posts (attach_cnt, post_no)"
+    ))
+    db.commit()
+
+    max_post_no = db.scalar(select(func.max(YJPosts.post_no))) or 0
+    fixed = 0
+    for lower in range(0, max_post_no, batch_size):
+        result = db.execute(text(
+            """
+            WITH actual AS (
+                SELECT p.post_no,
+                       (SELECT count(*) FROM vibecoding.yj_comments c
+                        WHERE c.post_no = p.post_no AND c.is_delete = 'N') AS comment_cnt,
+                       (SELECT count(*) FROM vibecoding.yj_attachments a
+                        WHERE a.post_no = p.post_no AND a.is_delete = 'N') AS attach_cnt
+                FROM vibecoding.yj_posts p
+                WHERE p.post_no > :lower AND p.post_no <= :upper
+            )
+            UPDATE vibecoding.yj_posts AS p
+            SET comment_cnt = actual.comment_cnt, attach_cnt = actual.attach_cnt
+            FROM actual
+            WHERE p.post_no = actual.post_no
+              AND (p.comment_cnt <> actual.comment_cnt OR p.attach_cnt <> actual.attach_cnt)
+            """
+        ), {"lower": lower, "upper": lower + batch_size})
+        db.commit()
+        fixed += result.rowcount
+
+    print(f"게시글 댓글/첨부파일 수 보정이 완료되었습니다. ({fixed}건 수정)")
+    return fixed
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        reconcile_post_counts(db)
+        print(f"전체 게시글 수 카운터를 {reconcile_post_total(db)}건으로 맞췄습니다.")
+    finally:
+        db.close()
@@ -0,0 +1,40 @@
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.yj_counters import YJCounters
+from ..models.yj_posts import YJPosts
+
+# 삭제되지 않은 전체 게시글 수
+POST_TOTAL = 'post_total'
+
+async def get_counter(db: AsyncSession, name: str) -> Optional[int]:
+    """
+    카운터 값을 조회합니다. (읽기만 하며, 카운터가 없으면 None)
+    - 카운터는 서버 시작 시 또는 count_reconcile로 만들어 둠 (app.utils.count_reconcile.reconcile_post_total 참고)
+    """
+    return await db.scalar(select(YJCounters.counter_val).where(YJCounters.counter_nm == name))
+
+async def increment_counter(db: AsyncSession, name: str, delta: int = 1):
+    """
+    카운터를 delta만큼 증감합니다. (호출한 쪽의 트랜잭션에서 함께 커밋)
+    - 카운터가 아직 없으면 아무 것도 하지 않음 (서버 시작 시 또는 count_reconcile로 초기화)
+    """
+    await db.execute(
+        update(YJCounters)
+        .where(YJCounters.counter_nm == name)
+        .values(counter_val=YJCounters.counter_val + delta)
+    )
+
+async def adjust_post_counts(db: AsyncSession, post_no: int, comments: int = 0, attachments: int = 0):
+    """
+    게시글의 댓글/첨부파일 수를 증감합니다. (호출한 쪽의 트랜잭션에서 함께 커밋)
+    - 현재 값에 더하는 UPDATE이므로 동시에 여러 요청이 갱신해도 값이 유실되지 않음
+    """
+    values = {}
+    if comments:
+        values["comment_cnt"] = YJPosts.comment_cnt + comments
+    if attachments:
+        values["attach_cnt"] = YJPosts.attach_cnt + attachments
+    if not values:
+        return
+    await db.execute(update(YJPosts).where(YJPosts.post_no == post_no).values(**values))
@@ -0,0 +1,21 @@
+import base64
+import json
+from fastapi import HTTPException
+
+
+def encode_cursor(data: dict) -> str:
+    """커서 데이터를 URL에 안전한 불투명 문자열로 인코딩"""
+    raw = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> dict:
+    """encode_cursor로 만든 문자열을 다시 딕셔너리로 복원 (실패 시 400)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다")
+    return data
@@ -0,0 +1,173 @@
+import os
+import re
+import stat
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+from .etag import CACHE_CONTROL, etag_matches
+from .precompress import ENCODING_SUFFIXES, is_compressible, variant_path
+
+# 내용 해시 경로(blob_store.blob_path)로 저장된 파일명의 해시 부분
+_HASH_NAME = re.compile(r'^[0-9a-f]{64}$')
+
+# /uploads 캐시 정책
+# - 내용 해시 경로의 파일은 같은 URL의 내용이 바뀌지 않으므로 1년 동안 재검증 없이 사용 (immutable)
+# - 그 외(해시 이전의 기존 파일)는 캐시하되 매번 ETag/Last-Modified로 재검증
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_CACHE_CONTROL = "public, no-cache"
+
+def content_etag(path: str) -> Optional[str]:
+    """
+    내용 해시 경로로 저장된 파일이면 해시로 만든 강한(strong) ETag (아니면 None)
+    - 해시 경로의 파일은 내용이 바뀌지 않으므로 파일 시각과 관계없이 항상 같은 ETag
+    - None이면 FileResponse 기본값(수정 시각과 크기로 만든 ETag)을 사용
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f'"{name}"' if _HASH_NAME.match(name) else None
+
+def is_not_modified(request_headers: Headers, response_headers) -> bool:
+    """If-None-Match(우선) 또는 If-Modified-Since로 304 응답이 가능한지 확인"""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, response_headers["etag"])
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return parsedate_to_datetime(response_headers["last-modified"]) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+def accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """
+    Accept-Encoding 헤더에서 보낼 수 있는 압축 형식을 선호 순서대로 반환
+    - q 값이 높은 순, 같으면 br > gzip 순 (q=0은 거부)
+    - 헤더가 없으면 압축하지 않은 원본만 보냄
+    """
+    if not accept_encoding:
+        return []
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    order = list(ENCODING_SUFFIXES)
+    candidates = [
+        (qualities.get(encoding, qualities.get("*", 0.0)), -order.index(encoding), encoding)
+        for encoding in order
+    ]
+    return [encoding for quality, _, encoding in sorted(candidates, reverse=True) if quality > 0]
+
+async def file_download_response(
+    request: Request,
+    path: str,
+    filename: Optional[str] = None,
+    media_type: Optional[str] = None,
+    headers: Optional[dict] = None
+) -> Response:
+    """
+    첨부파일 다운로드 응답
+    - ETag/Last-Modified를 붙이고 If-None-Match/If-Modified-Since가 맞으면 304
+    - Range 요청은 206(부분 응답), If-Range가 현재 ETag/Last-Modified와 다르면 전체 응답 (FileResponse가 처리)
+      동영상 탐색이나 끊긴 다운로드 이어받기에 사용
+
+    Args:
+        request (Request): 요청 (조건부 요청 헤더 확인용)
+        path (str): 파일 경로
+        filename (str, optional): 다운로드 파일명 (Content-Disposition)
+        media_type (str, optional): Content-Type (없으면 확장자로 추정)
+        headers (dict, optional): 추가 응답 헤더
+
+    Returns:
+        Response: FileResponse 또는 304 응답
+    """
+    try:
+        stat_result = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    response_headers = {"Cache-Control": CACHE_CONTROL, **(headers or {})}
+    etag = content_etag(path)
+    if etag:
+        response_headers["ETag"] = etag
+    response = FileResponse(
+        path=path,
+        headers=response_headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result
+    )
+    if is_not_modified(request.headers, response.headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+def _static_headers(path: str) -> dict:
+    """/uploads 응답의 캐시 헤더 (내용 해시 경로면 해시 ETag와 immutable)"""
+    etag = content_etag(path)
+    if etag:
+        headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    else:
+        headers = {"Cache-Control": STATIC_CACHE_CONTROL}
+    if is_compressible(path):
+        headers["Vary"] = "Accept-Encoding"
+    return headers
+
+class UploadStaticFiles(StaticFiles):
+    """
+    /uploads 정적 파일 서빙
+    - 내용 해시 경로의 파일은 해시로 만든 강한 ETag와 Cache-Control: immutable (그 외에는 수정 시각과 크기로 만든 ETag로 재검증)
+    - 미리 만든 압축본(precompress)이 있고 Accept-Encoding이 허용하면 압축본을 Content-Encoding과 함께 보냄
+      (압축본은 표현이 다르므로 ETag에 -br/-gzip을 붙이고, 공유 캐시가 구분하도록 Vary: Accept-Encoding)
+    - Range/If-Range(206), If-None-Match/If-Modified-Since(304) 처리는 StaticFiles/FileResponse와 동일
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        path = str(full_path)
+        response = FileResponse(full_path, status_code=status_code, headers=_static_headers(path), stat_result=stat_result)
+        if is_compressible(path):
+            # 보낼 표현(압축본)을 정한 뒤 get_response에서 304 여부 확인
+            return response
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def is_not_modified(self, response_headers, request_headers) -> bool:
+        # If-None-Match가 있으면 If-Modified-Since는 보지 않음 (압축본 ETag와 원본 시각이 섞여 304가 나지 않도록)
+        return is_not_modified(request_headers, response_headers)
+
+    async def _encoded_response(self, response: FileResponse, request_headers: Headers) -> FileResponse:
+        """Accept-Encoding에 맞는 압축본이 있으면 압축본 응답, 없으면 원본 응답 그대로 반환"""
+        for encoding in accepted_encodings(request_headers.get("accept-encoding")):
+            path = variant_path(str(response.path), encoding)
+            try:
+                stat_result = await run_in_threadpool(os.stat, path)
+            except FileNotFoundError:
+                continue
+            headers = _static_headers(str(response.path))
+            headers["ETag"] = f'{response.headers["etag"][:-1]}-{encoding}"'
+            headers["Content-Encoding"] = encoding
+            return FileResponse(path, headers=headers, media_type=response.media_type, stat_result=stat_result)
+        return response
+
+    async def get_response(self, path: str, scope) -> Response:
+        response = await super().get_response(path, scope)
+        if isinstance(response, FileResponse) and response.status_code == 200 and is_compressible(str(response.path)):
+            request_headers = Headers(scope=scope)
+            response = await self._encoded_response(response, request_headers)
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+        return response
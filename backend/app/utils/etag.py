@@ -0,0 +1,73 @@
+import hashlib
+from typing import Optional
+from fastapi import Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.yj_posts import YJPosts
+from ..models.yj_comments import YJComments
+from ..models.yj_attachments import YJAttachments
+
+# 인증이 필요한 응답이므로 공유 캐시에는 저장하지 않고, 브라우저는 매번 재검증
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(*parts, weak: bool = False) -> str:
+    """
+    주어진 값들로 ETag 생성
+    - 본문 일부(조회수 등)가 같은 ETag에서도 바뀔 수 있는 응답은 weak=True로 약한(W/) ETag 사용
+    """
+    digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 포함되어 있는지 확인 (약한 비교, W/ 접두사는 무시)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return any(tag.removeprefix('W/') == etag.removeprefix('W/') for tag in candidates)
+
+def not_modified(etag: str) -> Response:
+    """304 Not Modified 응답"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+def _comment_version(post_no: int):
+    # 댓글 작성/수정/삭제 모두 updated_at을 갱신하므로 (최신 updated_at, 전체 건수)로 변경을 감지
+    return (
+        select(func.max(YJComments.updated_at)).where(YJComments.post_no == post_no).scalar_subquery(),
+        select(func.count(YJComments.seq)).where(YJComments.post_no == post_no).scalar_subquery(),
+    )
+
+def _attachment_version(post_no: int):
+    # 추가는 최신 seq, 소프트 삭제는 updated_at(삭제 시각)으로 감지 (삭제된 첨부파일도 포함해 비교)
+    rows = (YJAttachments.post_no == post_no,)
+    return (
+        select(func.max(YJAttachments.seq)).where(*rows).scalar_subquery(),
+        select(func.max(YJAttachments.updated_at)).where(*rows).scalar_subquery(),
+    )
+
+async def get_post_etag(db: AsyncSession, post_no: int) -> Optional[str]:
+    """
+    게시글 상세 응답의 ETag (게시글이 없으면 None)
+    - 게시글 updated_at, 댓글 변경, 첨부파일 변경을 한 번의 쿼리로 조회해 계산
+    - 조회수는 매 조회마다 바뀌므로 포함하지 않으며, 같은 ETag에서도 본문의 view_cnt가 달라질 수 있어 약한 ETag 사용
+    """
+    row = (await db.execute(
+        select(YJPosts.updated_at, *_comment_version(post_no), *_attachment_version(post_no))
+        .where(YJPosts.post_no == post_no, YJPosts.is_delete == 'N')
+    )).first()
+    if row is None:
+        return None
+    return make_etag("post", post_no, *row, weak=True)
+
+async def get_comments_etag(db: AsyncSession, post_no: int, *page) -> str:
+    """
+    게시글 댓글/답글 페이지 응답의 ETag
+    - page에는 응답을 구분하는 값(부모 댓글, 커서, 페이지 크기, 정렬 등)을 넘겨 페이지마다 다른 ETag 생성
+    """
+    row = (await db.execute(select(*_comment_version(post_no)))).first()
+    return make_etag("comments", post_no, *page, *row)
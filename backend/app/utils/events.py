@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 구독자별 대기 이벤트 수 (넘치면 쌓인 이벤트를 버리고 resync 이벤트를 보냄)
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+# Redis 구독 연결이 끊겼을 때 다시 연결하기까지 기다리는 시간(초, 실패할 때마다 두 배로 늘려 최대값까지)
+EVENT_RECONNECT_DELAY = float(os.getenv("EVENT_RECONNECT_DELAY", "1"))
+EVENT_RECONNECT_MAX_DELAY = float(os.getenv("EVENT_RECONNECT_MAX_DELAY", "30"))
+
+def post_channel(post_no: int) -> str:
+    """게시글 이벤트 채널 이름"""
+    return f"post:{post_no}"
+
+
+class EventBackend:
+    """
+    이벤트 전달 인터페이스
+    - publish()로 보낸 메시지를 모든 워커의 deliver 콜백으로 전달
+    - 수신이 끊겼다가 다시 연결되면 on_reconnect 콜백 호출 (그 사이의 이벤트는 유실됨)
+    - 단일 워커(또는 로컬 테스트)는 MemoryEventBackend, 여러 워커는 RedisEventBackend 사용
+    """
+
+    async def start(self, deliver: Callable[[str, str], None], on_reconnect: Optional[Callable[[], None]] = None):
+        raise NotImplementedError
+
+    async def publish(self, channel: str, message: str):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryEventBackend(EventBackend):
+    """같은 프로세스 안의 구독자에게만 바로 전달하는 저장소"""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[str, str], None]] = None
+
+    async def start(self, deliver: Callable[[str, str], None], on_reconnect: Optional[Callable[[], None]] = None):
+        self._deliver = deliver
+
+    async def publish(self, channel: str, message: str):
+        if self._deliver is not None:
+            self._deliver(channel, message)
+
+
+class RedisEventBackend(EventBackend):
+    """
+    Redis pub/sub으로 워커 간에 이벤트를 전달하는 저장소
+    - redis 패키지가 필요하며, 워커마다 하나의 구독 연결로 모든 채널을 받아 프로세스 안에서 나눠 전달
+    - client를 넘기면 url 대신 그 클라이언트를 사용 (테스트에서 fakeredis 등 대체 서버 사용, decode_responses=True 필요)
+    - 구독 연결이 끊기면 로그를 남기고 reconnect_delay초부터 두 배씩(최대 max_reconnect_delay초) 기다리며 다시 구독
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        prefix: str = "events:",
+        client=None,
+        reconnect_delay: float = EVENT_RECONNECT_DELAY,
+        max_reconnect_delay: float = EVENT_RECONNECT_MAX_DELAY
+    ):
+        if client is None:
+            try:
+                from redis import asyncio as redis_asyncio
+            except ImportError:
+                raise RuntimeError("RedisEventBackend를 사용하려면 redis 패키지를 설치해야 합니다")
+            client = redis_asyncio.from_url(url, decode_responses=True)
+        self._client = client
+        self._prefix = prefix
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _subscribe(self):
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.psubscribe(f"{self._prefix}*")
+
+    async def _close_pubsub(self):
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.aclose()
+        except Exception:
+            pass
+        self._pubsub = None
+
+    async def start(self, deliver: Callable[[str, str], None], on_reconnect: Optional[Callable[[], None]] = None):
+        await self._subscribe()
+        self._task = asyncio.create_task(self._listen(deliver, on_reconnect))
+
+    async def _listen(self, deliver: Callable[[str, str], None], on_reconnect: Optional[Callable[[], None]]):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._subscribe()
+                    logger.info("이벤트 구독을 다시 연결했습니다")
+                    if on_reconnect is not None:
+                        on_reconnect()
+                async for item in self._pubsub.listen():
+                    delay = self.reconnect_delay
+                    if item["type"] != "pmessage":
+                        continue
+                    deliver(item["channel"][len(self._prefix):], item["data"])
+                raise ConnectionError("이벤트 구독 연결이 종료되었습니다")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("이벤트 구독 연결이 끊어졌습니다. %.1f초 뒤 다시 연결합니다", delay)
+                await self._close_pubsub()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def publish(self, channel: str, message: str):
+        await self._client.publish(f"{self._prefix}{channel}", message)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close_pubsub()
+        await self._client.aclose()
+
+
+def create_event_backend() -> EventBackend:
+    """EVENT_BACKEND 환경 변수(memory, redis)에 따라 이벤트 저장소 생성"""
+    backend = os.getenv("EVENT_BACKEND", "memory")
+    if backend == "redis":
+        return RedisEventBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    return MemoryEventBackend()
+
+
+class Subscription:
+    """한 채널의 구독 (async for로 이벤트 메시지(JSON 문자열)를 차례로 받음)"""
+
+    def __init__(self, broker: "EventBroker", channel: str, queue_size: int):
+        self.broker = broker
+        self.channel = channel
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+    def put(self, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 느린 구독자는 쌓인 이벤트를 버리고 전체를 다시 조회하도록 알림
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(json.dumps({"type": "resync", "data": {}}))
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """다음 이벤트 메시지 (timeout 안에 없으면 None)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def __aenter__(self):
+        self.broker._subscribers.setdefault(self.channel, set()).add(self)
+        return self
+
+    async def __aexit__(self, *exc):
+        subscribers = self.broker._subscribers.get(self.channel)
+        if subscribers is not None:
+            subscribers.discard(self)
+            if not subscribers:
+                del self.broker._subscribers[self.channel]
+
+
+class EventBroker:
+    """
+    프로세스 내 pub/sub 브로커
+    - publish()는 저장소(EventBackend)로 보내고, 저장소가 전달한 메시지를 이 프로세스의 구독자 큐에 나눠 넣음
+    - 구독자가 없는 채널의 메시지는 버림
+    """
+
+    def __init__(self, backend: EventBackend, queue_size: int = EVENT_QUEUE_SIZE):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def _deliver(self, channel: str, message: str):
+        for subscription in list(self._subscribers.get(channel, ())):
+            subscription.put(message)
+
+    def _resync(self):
+        # 수신이 끊긴 동안의 이벤트는 받지 못했으므로 모든 구독자에게 전체를 다시 조회하도록 알림
+        message = json.dumps({"type": "resync", "data": {}})
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                subscription.put(message)
+
+    async def start(self):
+        """저장소 수신 시작 (서버 시작 시 호출)"""
+        await self.backend.start(self._deliver, self._resync)
+
+    async def stop(self):
+        await self.backend.close()
+
+    def subscribe(self, channel: str) -> Subscription:
+        """async with broker.subscribe(channel) as subscription 형태로 사용"""
+        return Subscription(self, channel, self.queue_size)
+
+    def subscriber_count(self, channel: str) -> int:
+        """이 프로세스에서 채널을 구독 중인 수"""
+        return len(self._subscribers.get(channel, ()))
+
+    async def publish(self, channel: str, event_type: str, data: Any):
+        """
+        이벤트 발행 (실패해도 예외를 올리지 않음)
+        - 이벤트는 부가 기능이므로 전달에 실패해도 호출한 쪽의 쓰기 요청은 성공으로 처리
+        """
+        message = json.dumps({"type": event_type, "data": data}, ensure_ascii=False, default=str)
+        try:
+            await self.backend.publish(channel, message)
+        except Exception:
+            logger.exception("이벤트 발행 실패", extra={"channel": channel, "event_type": event_type})
+
+event_broker = EventBroker(create_event_backend())
@@ -0,0 +1,34 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+def migrate_gc_schema(db: Session):
+    """
+    기존 DB에 GC(blob_gc)가 사용하는 컬럼과 인덱스를 추가합니다.
+    - 이미 생성된 테이블에는 create_all이 컬럼/인덱스를 추가하지 않으므로 직접 ALTER/CREATE
+    - yj_attachments.updated_at: 소프트 삭제 시각 (이전에 삭제된 첨부파일은 NULL로 남고 GC는 created_at을 기준으로 사용)
+    """
+    db.execute(text("ALTER TABLE vibecoding.yj_attachments ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP"))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_attachments_file_path "
+        "ON vibecoding.yj_attachments (file_path)"
+    ))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_blobs_file_path "
+        "ON vibecoding.yj_blobs (file_path)"
+    ))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_blobs_unreferenced "
+        "ON vibecoding.yj_blobs (updated_at) WHERE ref_cnt <= 0"
+    ))
+    db.commit()
+
+    print("GC 컬럼/인덱스 마이그레이션이 완료되었습니다.")
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        migrate_gc_schema(db)
+    finally:
+        db.close()
@@ -0,0 +1,217 @@
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders
+
+# 로그 설정 (환경 변수로 조정)
+# - LOG_LEVEL: 기본 로그 레벨
+# - LOG_LEVELS: 로거별 레벨 (예: "app.routers.comments=DEBUG,sqlalchemy.engine=WARNING")
+# - LOG_SAMPLING: 로거별 샘플링 비율, WARNING 미만 로그에만 적용 (예: "app.routers.posts=0.1")
+# - LOG_FORMAT: json 또는 text
+# - LOG_QUEUE_SIZE: 출력 대기 큐 크기 (가득 차면 요청을 막지 않고 로그를 버림)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# 현재 요청의 ID (요청 처리 중인 코루틴/스레드에서만 값이 있음)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord 기본 속성 (JSON 출력 시 extra 필드와 구분하기 위함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+def parse_logger_map(value: str) -> Dict[str, str]:
+    """'name=value,name=value' 형식의 설정을 딕셔너리로 변환"""
+    result = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, setting = item.split("=", 1)
+            result[name.strip()] = setting.strip()
+    return result
+
+_REQUEST_ID_MAX_LENGTH = 128
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+def _valid_request_id(value: Optional[str]) -> bool:
+    """클라이언트가 보낸 요청 ID는 길이가 짧고 출력 가능한 ASCII일 때만 사용"""
+    return bool(value) and len(value) <= _REQUEST_ID_MAX_LENGTH and value.isascii() and value.isprintable()
+
+class RequestIdFilter(logging.Filter):
+    """로그에 현재 요청 ID를 붙이는 필터 (큐에 넣기 전, 요청 컨텍스트 안에서 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    로거별 샘플링 필터
+    - 로거 이름(또는 상위 로거 이름)에 지정된 비율만큼만 남김
+    - WARNING 이상은 항상 남김
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def _rate(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 출력 (extra로 넘긴 값도 필드로 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            data["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+class NonBlockingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 로그를 버리는 QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 다른 스레드에서 출력되므로 메시지와 예외 정보를 미리 문자열로 고정 (출력 형식은 리스너 쪽에서 적용)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_exception_formatter = logging.Formatter()
+_listener: Optional[QueueListener] = None
+
+def setup_logging():
+    """
+    루트 로거를 큐 기반 핸들러로 구성하고 출력 스레드를 시작 (여러 번 호출해도 한 번만 적용)
+    - 요청 처리 쪽에서는 큐에 넣기만 하고, 표준 출력 쓰기는 별도 스레드(QueueListener)가 담당
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        ))
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter({
+        name: float(rate) for name, rate in parse_logger_map(LOG_SAMPLING).items()
+    }))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+    for name, level in parse_logger_map(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    # uvicorn 로그도 같은 큐/형식으로 출력
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력하고 출력 스레드 종료 (서버 종료 시 호출)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+access_logger = logging.getLogger("app.access")
+
+class RequestIdMiddleware:
+    """
+    요청마다 ID를 정해 로그 컨텍스트에 넣고, 응답 헤더와 접근 로그에 남기는 ASGI 미들웨어
+    - 클라이언트가 X-Request-ID를 보내면 그 값을, 없으면 새 ID를 사용
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if not _valid_request_id(request_id):
+            request_id = new_request_id()
+        token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            access_logger.info(
+                "%s %s %d", scope["method"], scope["path"], status_code,
+                extra={"status": status_code, "duration_ms": round((time.perf_counter() - started) * 1000, 2)}
+            )
+            request_id_var.reset(token)
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import uuid
+import zlib
+from typing import Callable, Dict, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from ..models.yj_blobs import YJBlobs
+from .uploads import UPLOAD_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# 미리 압축 설정 (환경 변수로 조정)
+# - PRECOMPRESS_EXTENSIONS: 업로드 시 압축본을 미리 만들 확장자
+#   (docx/xlsx/pptx 등 OOXML 문서와 jpg/mp4 등은 이미 압축된 형식이라 제외)
+# - PRECOMPRESS_MIN_SIZE: 이보다 작은 파일은 압축하지 않음(바이트)
+# - PRECOMPRESS_MIN_RATIO: 압축본이 원본의 이 비율보다 크면 버림 (효과가 적은 압축본은 저장하지 않음)
+PRECOMPRESS_EXTENSIONS = {
+    ext.strip().lower()
+    for ext in os.getenv("PRECOMPRESS_EXTENSIONS", ".txt,.doc,.xls,.ppt").split(",")
+    if ext.strip()
+}
+PRECOMPRESS_MIN_SIZE = int(os.getenv("PRECOMPRESS_MIN_SIZE", "1024"))
+PRECOMPRESS_MIN_RATIO = float(os.getenv("PRECOMPRESS_MIN_RATIO", "0.9"))
+
+# Content-Encoding별 압축본 파일 접미사 (협상 시 앞의 것을 우선)
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+def is_compressible(path: str) -> bool:
+    """미리 압축 대상 확장자인지 확인"""
+    return os.path.splitext(path or "")[1].lower() in PRECOMPRESS_EXTENSIONS
+
+def variant_path(path: str, encoding: str) -> str:
+    """압축본 경로 (원본 경로 + .br/.gz)"""
+    return f"{path}{ENCODING_SUFFIXES[encoding]}"
+
+def _compressors() -> Dict[str, Tuple[Callable[[bytes], bytes], Callable[[], bytes]]]:
+    """사용할 수 있는 압축기 {Content-Encoding: (압축 함수, 마무리 함수)}"""
+    # wbits=16+MAX_WBITS: gzip 형식 (파일명/시각을 헤더에 넣지 않아 같은 내용이면 항상 같은 압축본)
+    gzip_compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    compressors = {"gzip": (gzip_compressor.compress, gzip_compressor.flush)}
+    # brotli는 선택 패키지 (설치되어 있지 않으면 gzip만 생성)
+    try:
+        import brotli
+    except ImportError:
+        return compressors
+    brotli_compressor = brotli.Compressor(quality=11)
+    compressors["br"] = (brotli_compressor.process, brotli_compressor.finish)
+    return compressors
+
+def precompress_file(path: str) -> List[str]:
+    """
+    원본 파일의 gzip/br 압축본을 옆에 만들어 둠 (스레드에서 실행)
+    - 원본을 UPLOAD_CHUNK_SIZE씩 한 번만 읽으면서 모든 형식을 함께 압축 (파일 전체를 메모리에 올리지 않음)
+    - 임시 파일에 쓴 뒤 이름을 바꾸므로 서빙 중인 요청이 반쯤 쓴 압축본을 읽지 않음
+    - 이미 압축본이 있는 형식은 건너뜀 (같은 내용을 다시 올려도 다시 압축하지 않음)
+
+    Args:
+        path (str): 원본 파일 경로
+
+    Returns:
+        List[str]: 새로 만든 압축본 경로
+    """
+    if not is_compressible(path):
+        return []
+    size = os.path.getsize(path)
+    if size < PRECOMPRESS_MIN_SIZE:
+        return []
+
+    targets = {}
+    try:
+        for encoding, (compress, finish) in _compressors().items():
+            destination = variant_path(path, encoding)
+            if os.path.exists(destination):
+                continue
+            temp_path = f"{destination}.{uuid.uuid4().hex}.part"
+            targets[encoding] = (compress, finish, destination, temp_path, open(temp_path, "wb"))
+        if not targets:
+            return []
+
+        created = []
+        with open(path, "rb") as source:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                for compress, _, _, _, target in targets.values():
+                    target.write(compress(chunk))
+        for _, finish, destination, temp_path, target in targets.values():
+            target.write(finish())
+            target.close()
+            if os.path.getsize(temp_path) <= size * PRECOMPRESS_MIN_RATIO:
+                os.replace(temp_path, destination)
+                created.append(destination)
+    finally:
+        for _, _, _, temp_path, target in targets.values():
+            target.close()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    return created
+
+_tasks = set()
+
+async def _precompress(path: str):
+    try:
+        await run_in_threadpool(precompress_file, path)
+    except Exception:
+        logger.exception("압축본 생성 실패", extra={"path": path})
+
+def schedule_precompress(path: str):
+    """
+    저장된 파일의 압축본 생성을 백그라운드로 예약 (압축 대상 확장자가 아니면 무시)
+
+    Args:
+        path (str): 저장된 파일 경로
+    """
+    if not is_compressible(path):
+        return
+    task = asyncio.create_task(_precompress(path))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+def precompress_existing(db: Session, batch_size: int = 500):
+    """
+    이미 저장된 파일(yj_blobs) 중 압축 대상의 압축본을 만듭니다.
+    - file_hash 순으로 batch_size씩 조회하며, 압축본이 이미 있으면 건너뛰므로 여러 번 실행해도 됨
+    """
+    last_hash = ""
+    created = 0
+    missing = 0
+    while True:
+        blobs = db.execute(
+            select(YJBlobs.file_hash, YJBlobs.file_path)
+            .where(YJBlobs.file_hash > last_hash)
+            .order_by(YJBlobs.file_hash)
+            .limit(batch_size)
+        ).all()
+        if not blobs:
+            break
+        for blob in blobs:
+            if not is_compressible(blob.file_path):
+                continue
+            if not os.path.exists(blob.file_path):
+                missing += 1
+                continue
+            created += len(precompress_file(blob.file_path))
+        last_hash = blobs[-1].file_hash
+        db.rollback()
+
+    print(f"압축본 생성이 완료되었습니다. ({created}건, 파일 없음 {missing}건)")
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        precompress_existing(db)
+    finally:
+        db.close()
@@ -0,0 +1,94 @@
+import html
+import re
+from typing import List, Optional
+from sqlalchemy import func, false, literal, literal_column
+from app.models.yj_posts import YJPosts
+
+# 한국어는 형태소 분석 없이도 부분 일치 검색이 되도록 2-gram 단위로 색인
+NGRAM_SIZE = 2
+TS_CONFIG = 'simple'
+
+# search_type별 tsvector 가중치 (title은 A, content는 B, 작성자 이름은 C로 저장)
+# search_type을 지정하지 않으면 제목+내용(AB)만 검색
+SEARCH_WEIGHTS = {
+    'title': 'A',
+    'content': 'B',
+    'author': 'C',
+}
+DEFAULT_SEARCH_WEIGHT = 'AB'
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def _words(text: str) -> List[str]:
+    """HTML 태그/엔티티를 제거하고 소문자 단어 목록으로 분리"""
+    text = html.unescape(_TAG_PATTERN.sub(' ', text or ''))
+    return _WORD_PATTERN.findall(text.lower())
+
+
+def ngram_tokens(text: str) -> List[str]:
+    """
+    색인용 n-gram 토큰 생성
+    - 단어마다 2-gram을 순서대로 만들고, 마지막 글자를 1-gram으로 덧붙임
+    - 한 글자 검색어는 '글자:*' 접두 검색으로 찾으므로 모든 글자가 어떤 토큰의 첫 글자가 되도록 함
+    """
+    tokens = []
+    for word in _words(text):
+        if len(word) <= NGRAM_SIZE:
+            tokens.append(word)
+            continue
+        tokens.extend(word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+        tokens.append(word[-1])
+    return tokens
+
+
+def build_search_vector(title: Optional[str], contents: Optional[str], author_name: Optional[str] = None):
+    """
+    게시글 제목(A)/본문(B)/작성자 이름(C) 가중치가 적용된 tsvector SQL 표현식 생성
+    - 작성자 검색도 yj_users를 훑지 않고 같은 GIN 인덱스로 찾도록 작성자 이름을 함께 색인
+    """
+    vectors = [
+        func.setweight(func.to_tsvector(TS_CONFIG, ' '.join(ngram_tokens(text))), literal_column(f"'{weight}'"))
+        for text, weight in ((title, 'A'), (contents, 'B'), (author_name, 'C'))
+    ]
+    return vectors[0].op('||')(vectors[1]).op('||')(vectors[2])
+
+
+def build_tsquery(search: str, weight: Optional[str] = None):
+    """
+    검색어를 tsquery SQL 표현식으로 변환
+    - 단어 안의 2-gram은 인접(<->) 조건으로, 단어끼리는 AND(&)로 연결
+    - 사용할 수 있는 토큰이 없으면 None
+    """
+    suffix = f':{weight}' if weight else ''
+    terms = []
+    for word in _words(search):
+        if len(word) < NGRAM_SIZE:
+            terms.append(f'{word}:*{weight or ""}')
+        else:
+            grams = [word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)]
+            terms.append('(' + ' <-> '.join(f'{g}{suffix}' for g in grams) + ')')
+    if not terms:
+        return None
+    return func.to_tsquery(TS_CONFIG, literal(' & '.join(terms)))
+
+
+def post_search_filter(search: str, search_type: Optional[str]):
+    """
+    게시글 검색 조건과 관련도(rank) 표현식을 반환
+    - title/content/author/기본(제목+내용) 검색 모두 search_vector GIN 인덱스 사용
+    - 한두 글자 검색어도 1-gram 접두/2-gram 토큰으로 인덱스에서 찾음
+    - 특수문자만으로 된 검색어처럼 토큰이 없으면 색인된 단어와 일치할 수 없으므로 결과 없음
+      (ILIKE '%...%'로 전체 게시글을 훑지 않음)
+
+    Returns:
+        (criterion, rank): rank는 관련도 정렬이 불가능한 경우 None
+    """
+    ts_query = build_tsquery(search, SEARCH_WEIGHTS.get(search_type, DEFAULT_SEARCH_WEIGHT))
+    if ts_query is None:
+        return false(), None
+
+    criterion = YJPosts.search_vector.op('@@')(ts_query)
+    rank = func.ts_rank(YJPosts.search_vector, ts_query)
+    return criterion, rank
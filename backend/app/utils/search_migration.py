@@ -0,0 +1,50 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from ..models.yj_posts import YJPosts
+from ..models.yj_users import YJUsers
+from .search import build_search_vector
+
+def migrate_search_index(db: Session, batch_size: int = 500):
+    """
+    기존 게시글에 전문 검색 컬럼/인덱스를 추가하고 search_vector를 채웁니다.
+    - 이미 생성된 테이블에는 create_all이 컬럼을 추가하지 않으므로 직접 ALTER
+    - 게시글을 batch_size 단위로 나누어 갱신
+    - 작성자 이름도 함께 색인하므로 DB에서 직접 사용자 이름을 바꾼 뒤에는 다시 실행
+    """
+    db.execute(text("ALTER TABLE vibecoding.yj_posts ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_posts_search_vector "
+        "ON vibecoding.yj_posts USING gin (search_vector)"
+    ))
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_posts_author_usrid "
+        "ON vibecoding.yj_posts (author_usrid)"
+    ))
+    db.commit()
+
+    last_post_no = 0
+    updated = 0
+    while True:
+        rows = db.query(YJPosts, YJUsers.usr_nm).outerjoin(
+            YJUsers, YJUsers.usr_id == YJPosts.author_usrid
+        ).filter(
+            YJPosts.post_no > last_post_no
+        ).order_by(YJPosts.post_no).limit(batch_size).all()
+        if not rows:
+            break
+        for post, author_name in rows:
+            post.search_vector = build_search_vector(post.title, post.contents, author_name)
+        last_post_no = rows[-1][0].post_no
+        db.commit()
+        updated += len(rows)
+
+    print(f"검색 인덱스 마이그레이션이 완료되었습니다. ({updated}건)")
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        migrate_search_index(db)
+    finally:
+        db.close()
@@ -0,0 +1,78 @@
+import os
+from sqlalchemy import select, text, update
+from sqlalchemy.orm import Session
+from ..models.yj_attachments import YJAttachments
+from ..models.yj_blobs import YJBlobs
+from .blob_migration import link_or_copy
+from .blob_store import blob_path
+
+def migrate_blob_shards(db: Session, batch_size: int = 500):
+    """
+    uploads 바로 아래에 저장된 파일을 해시 앞 4자리로 나눈 디렉터리(ab/cd/<sha256><확장자>)로 옮기고
+    yj_blobs, yj_attachments의 file_path를 새 경로로 바꿉니다.
+    - yj_blobs를 file_hash 순으로 batch_size씩 처리하며, 배치를 커밋한 뒤 원래 파일을 삭제
+      (커밋 전까지는 두 경로 모두에서 읽을 수 있으므로 옮기는 중에도 다운로드가 끊기지 않음)
+    - 행을 먼저 UPDATE해 잠그므로 같은 파일을 동시에 업로드/삭제하는 요청과 겹치지 않음
+    - 이미 옮겨진 파일은 건너뛰므로 여러 번 실행해도 됨
+    """
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_yj_attachments_file_hash "
+        "ON vibecoding.yj_attachments (file_hash)"
+    ))
+    db.commit()
+
+    last_hash = ""
+    moved = 0
+    missing = 0
+    while True:
+        blobs = db.execute(
+            select(YJBlobs.file_hash, YJBlobs.file_path)
+            .where(YJBlobs.file_hash > last_hash)
+            .order_by(YJBlobs.file_hash)
+            .limit(batch_size)
+        ).all()
+        if not blobs:
+            break
+
+        sources = []
+        for file_hash, source in blobs:
+            path = blob_path(file_hash, source)
+            if source == path:
+                continue
+            if not os.path.exists(source) and not os.path.exists(path):
+                missing += 1
+                continue
+            locked = db.execute(
+                update(YJBlobs)
+                .where(YJBlobs.file_hash == file_hash, YJBlobs.file_path == source)
+                .values(file_path=path)
+                .returning(YJBlobs.file_hash)
+            ).first()
+            if locked is None:
+                continue
+            if not os.path.exists(path):
+                link_or_copy(source, path)
+            db.execute(
+                update(YJAttachments)
+                .where(YJAttachments.file_hash == file_hash, YJAttachments.file_path == source)
+                .values(file_path=path)
+            )
+            sources.append(source)
+            moved += 1
+        last_hash = blobs[-1].file_hash
+        db.commit()
+
+        for source in sources:
+            if os.path.exists(source):
+                os.remove(source)
+
+    print(f"첨부파일 디렉터리 분산 마이그레이션이 완료되었습니다. ({moved}건, 파일 없음 {missing}건)")
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        migrate_blob_shards(db)
+    finally:
+        db.close()
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+from .uploads import ALLOWED_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+# 썸네일 설정 (환경 변수로 조정)
+# - THUMBNAIL_WIDTHS: 만들 수 있는 너비 목록 (업로드 시 모두 미리 생성, 요청은 이 중 하나만 허용)
+# - THUMBNAIL_FORMAT: 저장 형식 (webp, jpeg, png)
+# - THUMBNAIL_QUALITY: webp/jpeg 품질
+# - THUMBNAIL_DIRECTORY: 썸네일 캐시 디렉터리
+# - THUMBNAIL_WORKERS: 이미지 변환 프로세스 수
+THUMBNAIL_WIDTHS = sorted({int(width) for width in os.getenv("THUMBNAIL_WIDTHS", "200,400,800").split(",") if width.strip()})
+THUMBNAIL_FORMAT = os.getenv("THUMBNAIL_FORMAT", "webp").lower()
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "80"))
+THUMBNAIL_DIRECTORY = os.getenv("THUMBNAIL_DIRECTORY", "./thumbnails")
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+
+THUMBNAIL_MEDIA_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+
+if not os.path.exists(THUMBNAIL_DIRECTORY):
+    os.makedirs(THUMBNAIL_DIRECTORY)
+
+def is_thumbnail_source(filename: str) -> bool:
+    """썸네일을 만들 수 있는 이미지 첨부파일인지 확인 (ALLOWED_EXTENSIONS['image'])"""
+    return os.path.splitext(filename or "")[1].lower() in ALLOWED_EXTENSIONS['image']
+
+def thumbnail_key(file_hash: Optional[str], path: str) -> str:
+    """
+    썸네일 캐시 키
+    - 내용 해시가 있으면 해시를 그대로 사용
+    - 해시가 없는 기존 첨부파일은 경로와 수정 시각/크기로 만든 값 (파일이 바뀌면 키도 바뀜)
+    """
+    if file_hash:
+        return file_hash
+    stat_result = os.stat(path)
+    return hashlib.sha256(f"{path}:{stat_result.st_mtime_ns}:{stat_result.st_size}".encode()).hexdigest()
+
+def thumbnail_path(key: str, width: int) -> str:
+    """
+    썸네일 캐시 경로 (THUMBNAIL_DIRECTORY/ab/cd/<key>_w<너비>.<형식>)
+    - key는 원본 파일 내용 해시이므로 같은 내용의 첨부파일은 썸네일도 함께 사용
+    """
+    return os.path.join(THUMBNAIL_DIRECTORY, key[:2], key[2:4], f"{key}_w{width}.{THUMBNAIL_FORMAT}")
+
+def render_thumbnail(source: str, destination: str, width: int, fmt: str, quality: int) -> str:
+    """
+    원본 이미지를 width 너비로 줄여 destination에 저장 (변환 프로세스에서 실행)
+    - 원본이 더 작으면 늘리지 않고 원래 크기로 저장
+    - 임시 파일에 쓴 뒤 이름을 바꾸므로 다른 요청이 반쯤 쓴 파일을 읽지 않음
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise RuntimeError("썸네일을 만들려면 Pillow 패키지를 설치해야 합니다")
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        # 너비 기준으로 비율을 유지하며 축소 (높이 제한은 원본 높이라서 너비로만 결정됨)
+        image.thumbnail((width, image.height))
+        if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        temp_path = f"{destination}.{uuid.uuid4().hex}.part"
+        try:
+            image.save(temp_path, format=fmt.upper(), quality=quality)
+            os.replace(temp_path, destination)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    return destination
+
+class ThumbnailPipeline:
+    """
+    썸네일 생성 파이프라인
+    - 이미지 디코딩/리사이즈는 CPU 작업이므로 프로세스 풀에서 실행해 이벤트 루프와 다른 요청을 막지 않음
+    - 업로드 직후 schedule()로 설정된 너비를 모두 미리 만들고, 없는 썸네일은 요청 시 ensure()로 생성
+    - 같은 썸네일을 동시에 요청하면 한 번만 만들고 결과를 함께 사용
+    """
+
+    def __init__(self, workers: int = THUMBNAIL_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._tasks = set()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def ensure(self, source: str, key: str, width: int) -> str:
+        """
+        썸네일이 있으면 경로를 바로 반환하고, 없으면 만들어서 반환
+
+        Args:
+            source (str): 원본 이미지 경로
+            key (str): 원본 내용 해시 (캐시 키)
+            width (int): 너비
+
+        Returns:
+            str: 썸네일 경로
+        """
+        destination = thumbnail_path(key, width)
+        if os.path.exists(destination):
+            return destination
+
+        future = self._pending.get(destination)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._get_executor(), render_thumbnail,
+                source, destination, width, THUMBNAIL_FORMAT, THUMBNAIL_QUALITY
+            )
+            self._pending[destination] = future
+            future.add_done_callback(lambda _: self._pending.pop(destination, None))
+        return await asyncio.shield(future)
+
+    async def _generate_all(self, source: str, key: str):
+        for width in THUMBNAIL_WIDTHS:
+            try:
+                await self.ensure(source, key, width)
+            except Exception:
+                logger.exception("썸네일 생성 실패", extra={"source": source, "width": width})
+                return
+
+    def schedule(self, source: str, key: str, filename: str):
+        """
+        업로드된 이미지의 썸네일 생성을 백그라운드로 예약 (이미지가 아니면 무시)
+
+        Args:
+            source (str): 원본 이미지 경로
+            key (str): 원본 내용 해시
+            filename (str): 원본 파일명 (이미지 여부 판단용)
+        """
+        if not is_thumbnail_source(filename):
+            return
+        task = asyncio.create_task(self._generate_all(source, key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stop(self):
+        """대기 중인 변환을 취소하고 프로세스 풀 종료 (서버 종료 시 호출)"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+thumbnail_pipeline = ThumbnailPipeline()
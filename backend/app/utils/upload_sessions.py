@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional, Tuple
+import pytz
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from ..database import AsyncSessionLocal
+from ..models.yj_uploads import YJUploads
+from .uploads import MAX_FILE_SIZE, UPLOAD_CHUNK_SIZE, file_sha256, remove_file
+
+logger = logging.getLogger(__name__)
+
+# 한국 시간대 설정
+seoul_tz = pytz.timezone('Asia/Seoul')
+
+# 이어 올리기 설정 (환경 변수로 조정)
+# - UPLOAD_SESSION_DIRECTORY: 받는 중인 파일을 두는 디렉터리 (완료 시 이름만 바꿔 옮기므로 uploads와 같은 파일 시스템 권장)
+# - UPLOAD_SESSION_TTL: 마지막으로 받은 뒤 세션을 유지하는 시간(초)
+# - UPLOAD_SESSION_CLEANUP_INTERVAL: 만료된 세션을 정리하는 주기(초)
+# - MAX_RESUMABLE_FILE_SIZE: 이어 올리기로 받을 수 있는 최대 파일 크기(바이트, 기본값은 일반 업로드와 같은 MAX_FILE_SIZE)
+UPLOAD_SESSION_DIRECTORY = os.getenv("UPLOAD_SESSION_DIRECTORY", "./upload_sessions")
+UPLOAD_SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", str(24 * 60 * 60)))
+UPLOAD_SESSION_CLEANUP_INTERVAL = float(os.getenv("UPLOAD_SESSION_CLEANUP_INTERVAL", "600"))
+MAX_RESUMABLE_FILE_SIZE = int(os.getenv("MAX_RESUMABLE_FILE_SIZE", str(MAX_FILE_SIZE)))
+
+if not os.path.exists(UPLOAD_SESSION_DIRECTORY):
+    os.makedirs(UPLOAD_SESSION_DIRECTORY)
+
+def part_path(upload_id: str) -> str:
+    """업로드 세션이 받는 중인 파일 경로"""
+    return os.path.join(UPLOAD_SESSION_DIRECTORY, f"{upload_id}.part")
+
+def chunk_path(upload_id: str) -> str:
+    """PATCH 요청 하나가 받은 데이터를 임시로 두는 파일 경로 (요청마다 다름)"""
+    return os.path.join(UPLOAD_SESSION_DIRECTORY, f"{upload_id}.{uuid.uuid4().hex}.chunk")
+
+def session_expires_at() -> datetime:
+    """지금부터 UPLOAD_SESSION_TTL 뒤의 만료 시각"""
+    return datetime.now(seoul_tz) + timedelta(seconds=UPLOAD_SESSION_TTL)
+
+def _open_part(path: str):
+    # 처음이면 만들고, 이미 있으면 기존 내용을 유지한 채로 열기
+    return os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), "r+b")
+
+async def write_chunk(path: str, offset: int, stream: AsyncIterator[bytes], max_length: int) -> Tuple[int, bool]:
+    """
+    요청 본문을 받는 대로 파일의 offset 위치부터 이어 씀
+    - 받은 데이터를 UPLOAD_CHUNK_SIZE까지 모아 스레드풀에서 쓰므로 본문 전체를 메모리에 올리지 않음
+    - 연결이 중간에 끊기면 그때까지 받은 만큼만 쓰고 정상 반환 (다음 요청에서 이어서 받음)
+
+    Args:
+        path (str): 쓸 파일 경로 (PATCH 요청마다 만드는 임시 파일)
+        offset (int): 쓰기 시작할 위치
+        stream (AsyncIterator[bytes]): 요청 본문 (request.stream())
+        max_length (int): 받을 수 있는 최대 길이 (넘으면 413)
+
+    Returns:
+        Tuple[int, bool]: (쓴 바이트 수, 본문을 끝까지 받았는지 여부)
+    """
+    target = await run_in_threadpool(_open_part, path)
+    written = 0
+    buffer = bytearray()
+    complete = True
+    try:
+        await run_in_threadpool(target.seek, offset)
+        try:
+            async for data in stream:
+                if written + len(buffer) + len(data) > max_length:
+                    raise HTTPException(status_code=413, detail="업로드할 파일 크기를 초과했습니다")
+                buffer += data
+                if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                    await run_in_threadpool(target.write, bytes(buffer))
+                    written += len(buffer)
+                    buffer.clear()
+        except ClientDisconnect:
+            complete = False
+        if buffer:
+            await run_in_threadpool(target.write, bytes(buffer))
+            written += len(buffer)
+    finally:
+        await run_in_threadpool(target.close)
+    return written, complete
+
+def _append_chunk(path: str, offset: int, chunk: str):
+    with _open_part(path) as target, open(chunk, "rb") as source:
+        target.seek(offset)
+        shutil.copyfileobj(source, target, UPLOAD_CHUNK_SIZE)
+
+async def append_chunk(path: str, offset: int, chunk: str):
+    """
+    요청 하나가 받은 임시 파일(chunk)을 받는 중인 파일의 offset 위치에 복사 (스레드풀에서 실행)
+    - 업로드 세션 행 잠금을 잡은 상태에서 호출해, 같은 위치에 동시에 보낸 요청이 서로의 데이터를 덮어쓰지 않게 함
+    """
+    await run_in_threadpool(_append_chunk, path, offset, chunk)
+
+def _finish_part(path: str, size: int) -> str:
+    # 중복 요청으로 선언한 크기 뒤에 쓰인 데이터가 있으면 잘라낸 뒤 해시 계산
+    os.truncate(path, size)
+    return file_sha256(path)
+
+async def finish_part(path: str, size: int) -> str:
+    """다 받은 파일을 전체 크기로 맞추고 SHA-256(hex) 계산 (스레드풀에서 실행, 복사하지 않고 읽기만 함)"""
+    return await run_in_threadpool(_finish_part, path, size)
+
+async def expire_upload_sessions(db: AsyncSession, now: Optional[datetime] = None) -> int:
+    """
+    만료된 업로드 세션과 받는 중이던 파일을 삭제
+
+    Returns:
+        int: 삭제한 세션 수
+    """
+    upload_ids = (await db.scalars(
+        delete(YJUploads)
+        .where(YJUploads.expires_at < (now or datetime.now(seoul_tz)))
+        .returning(YJUploads.upload_id)
+    )).all()
+    await db.commit()
+    for upload_id in upload_ids:
+        await remove_file(part_path(upload_id))
+    return len(upload_ids)
+
+class UploadSessionCleaner:
+    """만료된 업로드 세션을 주기적으로 정리하는 백그라운드 작업"""
+
+    def __init__(self, interval: float = UPLOAD_SESSION_CLEANUP_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        try:
+            async with AsyncSessionLocal() as db:
+                expired = await expire_upload_sessions(db)
+        except Exception:
+            logger.exception("만료된 업로드 세션 정리 실패")
+            return 0
+        if expired:
+            logger.info("만료된 업로드 세션 %d건을 정리했습니다", expired)
+        return expired
+
+    async def _run(self):
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """주기적 정리 작업 시작 (서버 시작 시 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """정리 작업 중지 (서버 종료 시 호출)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+upload_session_cleaner = UploadSessionCleaner()
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import uuid
+from typing import BinaryIO, NamedTuple, Optional
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_DIRECTORY = "./uploads"
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+# 업로드 파일을 디스크로 옮길 때 한 번에 읽는 크기 (메모리 사용량 상한)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+ALLOWED_EXTENSIONS = {
+    'image': ['.jpg', '.jpeg', '.png', '.gif'],
+    'document': ['.pdf', '.doc', '.docx', '.txt', '.xls', '.xlsx', '.ppt', '.pptx'],
+    'video': ['.mp4', '.avi', '.mov']
+}
+
+if not os.path.exists(UPLOAD_DIRECTORY):
+    os.makedirs(UPLOAD_DIRECTORY)
+
+class StoredFile(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+
+# 파일 확장자 검증 함수
+def is_allowed_file(filename: str) -> bool:
+    ext = os.path.splitext(filename)[1].lower()
+    return any(ext in exts for exts in ALLOWED_EXTENSIONS.values())
+
+def file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"파일 크기는 {MAX_FILE_SIZE/1024/1024}MB를 초과할 수 없습니다"
+    )
+
+def _copy_to_disk(source: BinaryIO, path: str, max_size: Optional[int]):
+    """
+    source를 청크 단위로 읽어 path에 쓰면서 크기와 SHA-256을 함께 계산 (스레드에서 실행)
+    - max_size를 넘는 순간 중단
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "wb") as buffer:
+        while True:
+            chunk = source.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise file_too_large()
+            digest.update(chunk)
+            buffer.write(chunk)
+    return size, digest.hexdigest()
+
+def file_sha256(path: str) -> str:
+    """디스크에 있는 파일의 SHA-256(hex)을 청크 단위로 읽어 계산 (스레드에서 실행)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _remove_if_exists(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+async def save_upload(file: UploadFile, destination: str, max_size: Optional[int] = MAX_FILE_SIZE) -> StoredFile:
+    """
+    업로드 파일을 destination에 저장
+    - 파일 전체를 메모리에 올리지 않고 UPLOAD_CHUNK_SIZE 단위로 복사
+    - 디스크 쓰기와 해시 계산은 스레드풀에서 실행해 이벤트 루프를 막지 않음
+    - 임시 파일에 쓴 뒤 완료되면 이름을 바꾸므로 중간에 실패해도 반쯤 쓴 파일이 남지 않음
+
+    Args:
+        file (UploadFile): 업로드 파일
+        destination (str): 저장할 경로
+        max_size (int, optional): 최대 크기 (넘으면 400, None이면 제한 없음)
+
+    Returns:
+        StoredFile: 저장 경로, 크기, SHA-256(hex)
+    """
+    # 크기를 이미 알고 있으면 복사 전에 바로 거절
+    if max_size is not None and file.size is not None and file.size > max_size:
+        raise file_too_large()
+
+    await file.seek(0)
+    temp_path = f"{destination}.{uuid.uuid4().hex}.part"
+    try:
+        size, sha256 = await run_in_threadpool(_copy_to_disk, file.file, temp_path, max_size)
+        await run_in_threadpool(os.replace, temp_path, destination)
+    except BaseException:
+        await run_in_threadpool(_remove_if_exists, temp_path)
+        raise
+    return StoredFile(destination, size, sha256)
+
+async def remove_file(path: str):
+    """파일이 있으면 삭제 (스레드풀에서 실행)"""
+    await run_in_threadpool(_remove_if_exists, path)
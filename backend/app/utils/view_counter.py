@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+from sqlalchemy import case, update
+from ..database import AsyncSessionLocal
+from ..models.yj_posts import YJPosts
+from .events import event_broker, post_channel
+
+logger = logging.getLogger(__name__)
+
+# 누적된 조회수를 DB에 반영하는 주기(초)와 즉시 반영할 누적 건수 기준
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "5"))
+VIEW_FLUSH_THRESHOLD = int(os.getenv("VIEW_FLUSH_THRESHOLD", "1000"))
+
+class ViewCountBuffer:
+    """
+    게시글 조회수 쓰기 지연(write-behind) 버퍼
+    - 상세 조회 시에는 메모리에만 누적하고 UPDATE/COMMIT을 하지 않음
+    - 주기적으로 또는 누적 건수가 기준을 넘으면 게시글별 증가분을 한 번의 UPDATE로 반영
+    - 서버 종료 시 남은 증가분을 모두 반영
+    """
+
+    def __init__(self, interval: float = VIEW_FLUSH_INTERVAL, threshold: int = VIEW_FLUSH_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._pending: Dict[int, int] = {}
+        self._inflight: Dict[int, int] = {}
+        self._pending_total = 0
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._threshold_task: Optional[asyncio.Task] = None
+
+    def add(self, post_no: int, count: int = 1):
+        """조회수 증가분 누적 (기준 건수를 넘으면 백그라운드에서 즉시 반영)"""
+        self._pending[post_no] = self._pending.get(post_no, 0) + count
+        self._pending_total += count
+        if self._pending_total >= self.threshold and not (self._threshold_task and not self._threshold_task.done()):
+            self._threshold_task = asyncio.create_task(self.flush())
+
+    def pending(self, post_no: int) -> int:
+        """아직 DB에 반영되지 않은 게시글 조회수 증가분 (반영 중인 값 포함)"""
+        return self._pending.get(post_no, 0) + self._inflight.get(post_no, 0)
+
+    async def flush(self):
+        """
+        누적된 증가분을 게시글 번호 순으로 한 번의 UPDATE로 반영
+        - 반영된 게시글의 최신 조회수를 게시글 이벤트로 발행
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._pending_total = 0
+            self._inflight = pending
+            post_nos = sorted(pending)
+            try:
+                async with AsyncSessionLocal() as db:
+                    updated = (await db.execute(
+                        update(YJPosts)
+                        .where(YJPosts.post_no.in_(post_nos))
+                        .values(view_cnt=YJPosts.view_cnt + case(pending, value=YJPosts.post_no, else_=0))
+                        .returning(YJPosts.post_no, YJPosts.view_cnt)
+                    )).all()
+                    await db.commit()
+            except Exception:
+                # 반영에 실패한 증가분은 다음 주기에 다시 시도
+                logger.exception("조회수 반영 실패 (%d건)", len(post_nos))
+                for post_no, count in pending.items():
+                    self._pending[post_no] = self._pending.get(post_no, 0) + count
+                    self._pending_total += count
+            else:
+                for post_no, view_cnt in updated:
+                    await event_broker.publish(
+                        post_channel(post_no), "view_count", {"post_no": post_no, "view_cnt": view_cnt}
+                    )
+            finally:
+                self._inflight = {}
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self):
+        """주기적 반영 작업 시작 (서버 시작 시 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기적 반영 작업을 멈추고 남은 증가분을 반영 (서버 종료 시 호출)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+view_counter = ViewCountBuffer()
@@ -0,0 +1,134 @@
+import io
+import logging
+import os
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator, Iterable, NamedTuple, Optional, Set
+from starlette.concurrency import run_in_threadpool
+from .uploads import UPLOAD_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# 이미 압축된 형식이라 다시 압축해도 줄지 않는 확장자 (압축 없이 그대로 저장)
+ZIP_STORED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.mp4', '.avi', '.mov',
+    '.docx', '.xlsx', '.pptx'
+}
+
+class ZipEntry(NamedTuple):
+    """ZIP에 넣을 파일 (압축 파일 안의 이름, 디스크 경로, 수정 시각)"""
+    name: str
+    path: str
+    modified: Optional[datetime] = None
+
+class _ZipSink(io.RawIOBase):
+    """
+    ZipFile이 쓰는 내용을 모아 두었다가 pop()으로 꺼내는 출력 대상
+    - seek를 지원하지 않으므로 ZipFile은 각 파일 뒤에 데이터 디스크립터를 붙여 한 방향으로만 씀
+      (아카이브 전체를 메모리나 임시 파일에 만들지 않고 만든 만큼 바로 전송 가능)
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def unique_name(name: str, used: Set[str]) -> str:
+    """
+    ZIP 안에서 겹치지 않는 파일명 (경로 구분자는 제거, 겹치면 "이름 (1).확장자")
+    """
+    name = os.path.basename((name or "").replace("\\", "/")) or "file"
+    stem, ext = os.path.splitext(name)
+    candidate = name
+    index = 1
+    while candidate.lower() in used:
+        candidate = f"{stem} ({index}){ext}"
+        index += 1
+    used.add(candidate.lower())
+    return candidate
+
+def _zip_info(entry: ZipEntry, size: int) -> zipfile.ZipInfo:
+    modified = entry.modified or datetime.now()
+    info = zipfile.ZipInfo(entry.name, date_time=modified.timetuple()[:6])
+    if os.path.splitext(entry.name)[1].lower() in ZIP_STORED_EXTENSIONS:
+        info.compress_type = zipfile.ZIP_STORED
+    else:
+        info.compress_type = zipfile.ZIP_DEFLATED
+    # 미리 크기를 알려 주어야 4GB에 가까운 파일에 ZIP64 헤더를 사용
+    info.file_size = size
+    info.external_attr = 0o644 << 16
+    return info
+
+def _open_entry(archive: zipfile.ZipFile, entry: ZipEntry):
+    source = open(entry.path, "rb")
+    try:
+        size = os.fstat(source.fileno()).st_size
+        return source, archive.open(_zip_info(entry, size), "w")
+    except Exception:
+        source.close()
+        raise
+
+def _copy_chunk(source, target) -> bool:
+    # 원본에서 한 조각을 읽어 압축 파일에 씀 (읽기와 압축을 함께 스레드에서 실행)
+    chunk = source.read(UPLOAD_CHUNK_SIZE)
+    if chunk:
+        target.write(chunk)
+    return bool(chunk)
+
+def _close_entry(source, target):
+    try:
+        target.close()
+    finally:
+        source.close()
+
+async def stream_zip(entries: Iterable[ZipEntry]) -> AsyncIterator[bytes]:
+    """
+    파일들을 ZIP 아카이브로 묶어 만든 만큼씩 반환 (StreamingResponse 본문용)
+    - 파일을 UPLOAD_CHUNK_SIZE씩 읽어 압축하고, 나온 바이트를 바로 내보냄 (메모리에는 한 조각 분량만 유지)
+    - 파일 읽기와 압축은 스레드풀에서 실행해 이벤트 루프를 막지 않음
+    - 이미지/동영상 등 이미 압축된 형식(ZIP_STORED_EXTENSIONS)은 압축 없이 저장(stored)하고 나머지는 deflate
+    - 디스크에 없는 파일은 건너뜀 (이미 응답을 보내기 시작했으므로 오류 대신 경고 로그)
+
+    Args:
+        entries (Iterable[ZipEntry]): 넣을 파일 목록
+
+    Returns:
+        AsyncIterator[bytes]: ZIP 아카이브 바이트 조각
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for entry in entries:
+            try:
+                source, target = await run_in_threadpool(_open_entry, archive, entry)
+            except (FileNotFoundError, IsADirectoryError):
+                logger.warning("ZIP에 넣을 파일이 없어 건너뜁니다", extra={"path": entry.path})
+                continue
+            try:
+                while await run_in_threadpool(_copy_chunk, source, target):
+                    data = sink.pop()
+                    if data:
+                        yield data
+            finally:
+                await run_in_threadpool(_close_entry, source, target)
+            data = sink.pop()
+            if data:
+                yield data
+    # 중앙 디렉터리(파일 목록)는 아카이브를 닫을 때 기록됨
+    yield sink.pop()
@@ -0,0 +1,75 @@
+"""
+동시 요청 처리량 벤치마크
+
+단일 uvicorn 워커에 동시 요청을 보내 처리량(req/s)과 지연 시간을 측정합니다.
+DB 접근이 이벤트 루프를 막는지(동기 Session) 여부에 따라 결과가 크게 달라집니다.
+
+사용 예:
+    uvicorn app.main:app --workers 1
+    python bench_concurrency.py --username user1 --password pass --path /api/posts/1 -c 50 -n 2000
+
+httpx 패키지가 필요합니다.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post("/api/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run(args):
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        token = args.token or await login(client, args.username, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        latencies = []
+        errors = 0
+        remaining = args.requests
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(args.path, headers=headers)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"요청 수      : {len(latencies)} (오류 {errors})")
+    print(f"동시성       : {args.concurrency}")
+    print(f"소요 시간    : {elapsed:.2f}s")
+    print(f"처리량       : {len(latencies) / elapsed:.1f} req/s")
+    print(f"지연(p50/p95): {statistics.median(latencies) * 1000:.1f}ms / {p95 * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 요청 처리량 벤치마크")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/posts/1")
+    parser.add_argument("--token", help="JWT 토큰 (없으면 --username/--password로 로그인)")
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
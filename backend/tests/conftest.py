@@ -0,0 +1,49 @@
+import os
+import pytest
+from sqlalchemy import text
+
+# DB가 필요한 테스트는 TEST_DATABASE_URL(테스트 전용 PostgreSQL, psycopg2 URL)이 있을 때만 실행
+# app.database는 import 시 DATABASE_URL로 엔진을 만들므로 app 모듈을 import하기 전에 설정
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+
+requires_database = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL이 설정되지 않았습니다")
+
+@pytest.fixture(scope="session", autouse=True)
+def work_dir(tmp_path_factory):
+    """업로드 파일/업로드 세션/썸네일은 작업 디렉터리 기준 경로에 만들어지므로 임시 디렉터리에서 실행"""
+    original = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("work"))
+    yield
+    os.chdir(original)
+
+@pytest.fixture
+def anyio_backend():
+    # 비동기 테스트는 asyncio에서만 실행
+    return "asyncio"
+
+# API 서버 엔진의 커넥션은 이벤트 루프에 묶이므로 모든 테스트가 하나의 클라이언트(루프)를 공유
+@pytest.fixture(scope="session")
+def client():
+    """게시글/댓글/첨부파일/업로드 라우터를 올린 테스트 클라이언트 (인증은 tester 사용자로 대체, 테이블이 없으면 생성)"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app import database
+    from app.models import yj_posts, yj_attachments, yj_comments, yj_users, yj_counters, yj_blobs, yj_uploads
+    from app.routers import comments, files, posts, uploads
+    from app.utils.token import get_current_user_id
+
+    with database.engine.begin() as conn:
+        conn.execute(text("CREATE SCHEMA IF NOT EXISTS vibecoding"))
+    database.Base.metadata.create_all(database.engine)
+
+    app = FastAPI()
+    app.include_router(posts.router)
+    app.include_router(comments.router)
+    app.include_router(files.router)
+    app.include_router(uploads.router)
+    app.dependency_overrides[get_current_user_id] = lambda: "tester"
+    with TestClient(app) as test_client:
+        yield test_client
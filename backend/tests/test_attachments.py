@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import delete
+from conftest import requires_database
+
+pytestmark = requires_database
+
+@pytest.fixture
+def post_no():
+    """첨부파일 3개(마지막 하나는 소프트 삭제)가 있는 게시글, 테스트 후 삭제"""
+    from app.database import SessionLocal
+    from app.models.yj_posts import YJPosts
+    from app.models.yj_attachments import YJAttachments
+
+    db = SessionLocal()
+    post = YJPosts(title="제목", contents="내용", author_usrid="tester")
+    db.add(post)
+    db.flush()
+    for i, is_delete in enumerate(("N", "N", "Y")):
+        db.add(YJAttachments(
+            post_no=post.post_no, file_nm=f"{i}.txt", org_file_nm=f"{i}.txt",
+            file_path=f"./uploads/{i}.txt", file_size=1, mime_type="text/plain", is_delete=is_delete
+        ))
+    db.commit()
+
+    yield post.post_no
+
+    db.execute(delete(YJAttachments).where(YJAttachments.post_no == post.post_no))
+    db.execute(delete(YJPosts).where(YJPosts.post_no == post.post_no))
+    db.commit()
+    db.close()
+
+def test_list_stays_an_array_with_cursor_in_header(client, post_no):
+    response = client.get("/api/attachments", params={"post_id": post_no, "size": 1})
+    assert response.status_code == 200
+    first = response.json()
+    # 본문은 기존과 같은 첨부파일 배열, 다음 페이지 커서는 헤더로 전달
+    assert isinstance(first, list) and len(first) == 1
+    cursor = response.headers["x-next-cursor"]
+    assert f"after={cursor}" in response.headers["link"]
+
+    response = client.get("/api/attachments", params={"post_id": post_no, "size": 1, "after": cursor})
+    second = response.json()
+    assert [a["id"] for a in second] == [first[0]["id"] - 1]
+    # 소프트 삭제된 첨부파일은 기본으로 제외되므로 여기가 마지막 페이지
+    assert "x-next-cursor" not in response.headers
+    assert "link" not in response.headers
+
+    response = client.get("/api/attachments", params={"post_id": post_no, "deleted": "all"})
+    assert len(response.json()) == 3
+
+def test_same_content_upload_is_stored_once(client, post_no):
+    import os
+    from app.database import SessionLocal
+    from app.models.yj_attachments import YJAttachments
+    from app.models.yj_blobs import YJBlobs
+    from app.utils.uploads import UPLOAD_DIRECTORY
+
+    content = f"내용 {post_no}".encode()
+    ids = []
+    for _ in range(2):
+        response = client.post(f"/api/posts/{post_no}/files", files={"file": ("a.txt", content, "text/plain")})
+        assert response.status_code == 200
+        ids.append(response.json()["id"])
+
+    db = SessionLocal()
+    try:
+        first, second = (db.get(YJAttachments, i) for i in ids)
+        assert first.file_path == second.file_path
+        assert first.file_hash == second.file_hash
+        with open(second.file_path, "rb") as stored:
+            assert stored.read() == content
+        # 한 번 읽으며 받아 둔 임시 파일은 옮기거나 지워져 남지 않음
+        assert not [name for name in os.listdir(UPLOAD_DIRECTORY) if name.endswith(".upload")]
+        # 두 번째 업로드가 첫 번째를 교체하므로 참조 수는 1
+        assert db.get(YJBlobs, second.file_hash).ref_cnt == 1
+        db.delete(db.get(YJBlobs, second.file_hash))
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,71 @@
+import pytest
+from app.utils.cache import RedisCacheBackend, ResponseCache
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def server():
+    """여러 워커가 공유하는 Redis 서버 대신 사용하는 fakeredis 서버"""
+    return fakeredis.FakeServer()
+
+def make_backend(server) -> RedisCacheBackend:
+    return RedisCacheBackend(client=fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+
+async def test_redis_backend_get_set(server):
+    backend = make_backend(server)
+
+    assert await backend.get("missing") is None
+    await backend.set("key", "value")
+    assert await backend.get("key") == "value"
+
+    # TTL은 밀리초 단위 만료 시간으로 저장
+    await backend.set("expiring", "value", ttl=30)
+    assert 0 < await backend._client.pttl("expiring") <= 30000
+    assert await backend._client.pttl("key") == -1
+
+    assert await backend.counter("gen") == 0
+    assert await backend.incr("gen") == 1
+    assert await backend.counter("gen") == 1
+    await backend.close()
+
+async def test_response_cache_is_shared_across_workers(server):
+    # 워커마다 자기 클라이언트와 ResponseCache를 가지고 같은 서버를 사용
+    worker_a = ResponseCache(make_backend(server), "posts", ttl=60)
+    worker_b = ResponseCache(make_backend(server), "posts", ttl=60)
+    key_parts = (1, None, "", "all", None, "created_at", "desc")
+    response = {"posts": [{"id": 1, "title": "제목"}], "total": 1, "nextCursor": None}
+
+    assert await worker_b.get(await worker_b.key(key_parts)) is None
+    await worker_a.set(await worker_a.key(key_parts), response)
+    assert await worker_b.get(await worker_b.key(key_parts)) == response
+
+    # 한 워커의 무효화(세대 번호 증가)가 다른 워커의 캐시에도 적용됨
+    await worker_a.invalidate()
+    assert await worker_b.get(await worker_b.key(key_parts)) is None
+    assert await worker_a.get(await worker_a.key(key_parts)) is None
+
+    await worker_b.set(await worker_b.key(key_parts), {**response, "total": 2})
+    assert (await worker_a.get(await worker_a.key(key_parts)))["total"] == 2
+
+    # 적중/실패 횟수는 워커별로 집계
+    assert (worker_a.hits, worker_a.misses) == (1, 1)
+    assert (worker_b.hits, worker_b.misses) == (1, 2)
+    stats = await worker_b.stats()
+    assert stats["hitRatio"] == round(1 / 3, 4)
+
+async def test_response_built_before_invalidate_is_not_served(server):
+    reader = ResponseCache(make_backend(server), "posts", ttl=60)
+    writer = ResponseCache(make_backend(server), "posts", ttl=60)
+    key_parts = (1, 10, None, None, None, "createdAt", "desc", True)
+
+    # 목록 요청이 캐시를 놓치고 DB를 읽는 사이에 다른 워커가 글을 써서 무효화
+    key = await reader.key(key_parts)
+    assert await reader.get(key) is None
+    await writer.invalidate()
+    await reader.set(key, {"posts": [], "total": 0, "nextCursor": None})
+
+    # 이전 데이터로 만든 응답은 이전 세대에 저장되므로 다음 요청은 캐시를 놓침
+    assert await reader.get(await reader.key(key_parts)) is None
+    assert await writer.get(await writer.key(key_parts)) is None
@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import delete, select, update
+from conftest import requires_database
+
+pytestmark = requires_database
+
+@pytest.fixture
+def post_no():
+    """댓글을 달 게시글, 테스트 후 댓글과 함께 삭제"""
+    from app.database import SessionLocal
+    from app.models.yj_comments import YJComments
+    from app.models.yj_posts import YJPosts
+
+    db = SessionLocal()
+    post = YJPosts(title="제목", contents="내용", author_usrid="tester")
+    db.add(post)
+    db.commit()
+
+    yield post.post_no
+
+    db.execute(delete(YJComments).where(YJComments.post_no == post.post_no))
+    db.execute(delete(YJPosts).where(YJPosts.post_no == post.post_no))
+    db.commit()
+    db.close()
+
+def write_comment(client, post_no: int, parent: int = 0) -> int:
+    response = client.post(f"/api/posts/{post_no}/comments", data={"content": "댓글", "parent_comment_id": parent})
+    assert response.status_code == 200
+    return response.json()["comment_id"]
+
+def flatten(nodes: list) -> list:
+    """트리를 깊이 우선 순서의 (id, 부모, 깊이) 목록으로 변환"""
+    result = []
+    for node in nodes:
+        result.append((node["id"], node["parent_id"], node["depth"]))
+        result.extend(flatten(node["replies"]))
+    return result
+
+def test_thread_returns_every_depth_in_path_order(client, post_no):
+    root = write_comment(client, post_no)
+    first = write_comment(client, post_no, root)
+    second = write_comment(client, post_no, first)
+    third = write_comment(client, post_no, second)
+    removed = write_comment(client, post_no, first)
+    orphan = write_comment(client, post_no, removed)
+    last = write_comment(client, post_no, root)
+    assert client.delete(f"/api/comments/{removed}").status_code == 200
+
+    response = client.get(f"/api/comments/{root}/thread")
+    assert response.status_code == 200
+    body = response.json()
+    # 직속 답글 아래에 모든 깊이의 답글이 중첩되고, 삭제된 답글과 그 하위 답글은 제외
+    assert [node["id"] for node in body["comments"]] == [first, last]
+    assert flatten(body["comments"]) == [
+        (first, root, 1), (second, first, 2), (third, second, 3), (last, root, 1)
+    ]
+    assert orphan not in [id for id, _, _ in flatten(body["comments"])]
+    assert body["nextCursor"] is None
+
+    # 페이지를 나눠도 같은 깊이 우선 순서이며, 부모가 이전 페이지에 있는 답글은 최상위에 위치
+    seen = []
+    response = client.get(f"/api/comments/{root}/thread", params={"size": 2})
+    while True:
+        body = response.json()
+        seen.extend(flatten(body["comments"]))
+        if not body["nextCursor"]:
+            break
+        response = client.get(f"/api/comments/{root}/thread", params={"size": 2, "after": body["nextCursor"]})
+    assert seen == [(first, root, 1), (second, first, 2), (third, second, 3), (last, root, 1)]
+
+    # 다른 댓글의 커서는 거부
+    cursor = client.get(f"/api/comments/{root}/thread", params={"size": 1}).json()["nextCursor"]
+    assert client.get(f"/api/comments/{first}/thread", params={"after": cursor}).status_code == 400
+
+def test_comment_page_embeds_reply_previews(client, post_no):
+    root = write_comment(client, post_no)
+    replies = [write_comment(client, post_no, root) for _ in range(4)]
+    write_comment(client, post_no, replies[0])
+
+    body = client.get(f"/api/posts/{post_no}/comments").json()
+    assert [node["id"] for node in body["comments"]] == [root]
+    node = body["comments"][0]
+    assert node["replyCount"] == 4
+    # 직속 답글은 작성 순으로 미리보기 개수만큼만 포함
+    assert [reply["id"] for reply in node["replies"]] == replies[:3]
+    assert node["replies"][0]["replyCount"] == 1
+    assert node["replies"][0]["replies"] == []
+
+def test_migration_backfills_path_and_depth(client, post_no):
+    from app.database import SessionLocal
+    from app.models.yj_comments import YJComments
+    from app.utils.comment_migration import migrate_comment_path
+
+    root = write_comment(client, post_no)
+    child = write_comment(client, post_no, root)
+    grandchild = write_comment(client, post_no, child)
+
+    db = SessionLocal()
+    try:
+        stored = dict(db.execute(
+            select(YJComments.seq, YJComments.path).where(YJComments.post_no == post_no)
+        ).all())
+        db.execute(update(YJComments).where(YJComments.post_no == post_no).values(path=None, depth=0))
+        db.commit()
+
+        migrate_comment_path(db)
+
+        rows = db.execute(
+            select(YJComments.seq, YJComments.path, YJComments.depth).where(YJComments.post_no == post_no)
+        ).all()
+    finally:
+        db.close()
+    # 마이그레이션으로 채운 경로가 댓글 작성 시 저장한 경로와 같음
+    assert {seq: path for seq, path, _ in rows} == stored
+    assert {seq: depth for seq, _, depth in rows} == {root: 0, child: 1, grandchild: 2}
+    assert stored[grandchild].startswith(stored[child]) and stored[child].startswith(stored[root])
@@ -0,0 +1,53 @@
+from sqlalchemy import delete, func, select, update
+from conftest import requires_database
+
+pytestmark = requires_database
+
+def actual_total(db) -> int:
+    from app.models.yj_posts import YJPosts
+    return db.scalar(select(func.count()).select_from(YJPosts).where(YJPosts.is_delete == 'N'))
+
+def stored_total(db):
+    from app.models.yj_counters import YJCounters
+    from app.utils.counters import POST_TOTAL
+    return db.scalar(select(YJCounters.counter_val).where(YJCounters.counter_nm == POST_TOTAL))
+
+def test_post_total_is_seeded_outside_read_path(client):
+    from app.database import SessionLocal
+    from app.models.yj_counters import YJCounters
+    from app.models.yj_posts import YJPosts
+    from app.routers import posts
+    from app.utils.count_reconcile import reconcile_post_total
+    from app.utils.counters import POST_TOTAL
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(YJCounters).where(YJCounters.counter_nm == POST_TOTAL))
+        db.commit()
+
+        # 카운터가 없으면 목록 조회는 직접 계산만 하고 카운터를 만들지 않음
+        client.portal.call(posts.post_list_cache.invalidate)
+        response = client.get("/api/posts", params={"size": 1})
+        assert response.json()["total"] == actual_total(db)
+        assert stored_total(db) is None
+
+        # 시작 시 초기화 후에는 작성/삭제가 카운터에 반영됨
+        assert reconcile_post_total(db, missing_only=True) == actual_total(db)
+        response = client.post("/api/posts", data={"title": "제목", "content": "내용"})
+        assert response.status_code == 200
+        post_no = response.json()["id"]
+        db.expire_all()
+        assert stored_total(db) == actual_total(db)
+        assert client.get("/api/posts", params={"size": 1}).json()["total"] == actual_total(db)
+
+        # 어긋난 값은 count_reconcile로 보정 (missing_only이면 기존 값을 유지)
+        db.execute(update(YJCounters).where(YJCounters.counter_nm == POST_TOTAL).values(counter_val=-5))
+        db.commit()
+        assert reconcile_post_total(db, missing_only=True) == -5
+        assert reconcile_post_total(db) == actual_total(db)
+        assert stored_total(db) == actual_total(db)
+
+        db.execute(delete(YJPosts).where(YJPosts.post_no == post_no))
+        db.commit()
+    finally:
+        db.close()
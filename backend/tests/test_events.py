@@ -0,0 +1,90 @@
+import asyncio
+import json
+import pytest
+from app.utils.events import EventBroker, RedisEventBackend, post_channel
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.anyio
+
+async def start_worker(server) -> EventBroker:
+    """같은 fakeredis 서버를 쓰는 워커 하나의 브로커"""
+    backend = RedisEventBackend(client=fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    broker = EventBroker(backend)
+    await broker.start()
+    return broker
+
+async def wait_for_subscription(broker: EventBroker):
+    # psubscribe 확인 응답을 받아 구독이 시작된 뒤에 발행
+    for _ in range(100):
+        if broker.backend._pubsub.subscribed:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("구독이 시작되지 않았습니다")
+
+async def test_redis_backend_fans_out_across_workers():
+    server = fakeredis.FakeServer()
+    worker_a = await start_worker(server)
+    worker_b = await start_worker(server)
+    try:
+        await wait_for_subscription(worker_a)
+        await wait_for_subscription(worker_b)
+        async with worker_a.subscribe(post_channel(1)) as on_a, \
+                worker_b.subscribe(post_channel(1)) as on_b, \
+                worker_b.subscribe(post_channel(2)) as other_post:
+            # 워커 A에서 발행한 이벤트를 두 워커의 구독자가 모두 받음
+            await worker_a.publish(post_channel(1), "comment.created", {"id": 10, "content": "댓글"})
+            for subscription in (on_a, on_b):
+                message = await subscription.get(timeout=1)
+                assert json.loads(message) == {"type": "comment.created", "data": {"id": 10, "content": "댓글"}}
+
+            # 다른 게시글 채널의 구독자에게는 전달되지 않음
+            assert await other_post.get(timeout=0.1) is None
+
+            # 워커 B에서 발행해도 워커 A의 구독자가 받음
+            await worker_b.publish(post_channel(1), "comment.deleted", {"id": 10, "parent_id": 0})
+            assert json.loads(await on_a.get(timeout=1))["type"] == "comment.deleted"
+            assert json.loads(await on_b.get(timeout=1))["type"] == "comment.deleted"
+    finally:
+        await worker_a.stop()
+        await worker_b.stop()
+
+async def test_redis_backend_reconnects_after_connection_loss(caplog):
+    from redis.exceptions import ConnectionError
+
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    backend = RedisEventBackend(client=client, reconnect_delay=0.01)
+    broker = EventBroker(backend)
+
+    # 첫 구독 연결은 수신 중에 끊기도록 설정
+    make_pubsub = client.pubsub
+
+    def flaky_pubsub():
+        pubsub = make_pubsub()
+
+        async def lost_connection():
+            raise ConnectionError("Connection closed by server.")
+            yield
+
+        pubsub.listen = lost_connection
+        client.pubsub = make_pubsub
+        return pubsub
+
+    client.pubsub = flaky_pubsub
+    publisher = await start_worker(server)
+    try:
+        async with broker.subscribe(post_channel(1)) as subscription:
+            await broker.start()
+
+            # 다시 연결되면 끊긴 동안의 이벤트를 놓쳤으므로 resync를 받음
+            assert json.loads(await subscription.get(timeout=1))["type"] == "resync"
+            assert "이벤트 구독 연결이 끊어졌습니다" in caplog.text
+
+            # 다시 구독한 뒤의 이벤트는 정상적으로 전달됨
+            await wait_for_subscription(broker)
+            await publisher.publish(post_channel(1), "comment.created", {"id": 1})
+            assert json.loads(await subscription.get(timeout=1))["type"] == "comment.created"
+    finally:
+        await broker.stop()
+        await publisher.stop()
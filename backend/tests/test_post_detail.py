@@ -0,0 +1,104 @@
+import uuid
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import delete, event
+from conftest import requires_database
+
+pytestmark = requires_database
+
+# 게시글 상세 조회의 최대 쿼리 수
+# (ETag, 게시글+작성자, 첨부파일, 댓글 첫 페이지+작성자+답글 수, 답글 미리보기)
+MAX_GET_POST_QUERIES = 5
+
+@pytest.fixture
+def make_post():
+    """작성자가 모두 다른 댓글(각각 답글 1개 포함)이 달린 게시글을 만들고 테스트 후 삭제"""
+    from app.database import SessionLocal
+    from app.models.yj_comments import YJComments
+    from app.models.yj_posts import YJPosts
+    from app.models.yj_users import YJUsers
+
+    db = SessionLocal()
+    created_posts = []
+    created_users = []
+
+    def _make_post(commenters: int) -> int:
+        prefix = uuid.uuid4().hex[:8]
+        author = YJUsers(usr_id=f"{prefix}-author", usr_nm="작성자", pwd="x")
+        post = YJPosts(title="제목", contents="내용", author_usrid=author.usr_id)
+        db.add_all([author, post])
+        db.flush()
+        users = [YJUsers(usr_id=f"{prefix}-{i}", usr_nm=f"댓글 작성자 {i}", pwd="x") for i in range(commenters)]
+        db.add_all(users)
+        comments = [YJComments(post_no=post.post_no, author_usrid=user.usr_id, contents="댓글") for user in users]
+        db.add_all(comments)
+        db.flush()
+        db.add_all([
+            YJComments(post_no=post.post_no, author_usrid=users[-1 - i].usr_id, contents="답글",
+                       parent_cmmt_no=comment.seq, depth=1)
+            for i, comment in enumerate(comments)
+        ])
+        db.commit()
+        created_posts.append(post.post_no)
+        created_users.extend([author.usr_id, *(user.usr_id for user in users)])
+        return post.post_no
+
+    yield _make_post
+
+    db.execute(delete(YJComments).where(YJComments.post_no.in_(created_posts)))
+    db.execute(delete(YJPosts).where(YJPosts.post_no.in_(created_posts)))
+    db.execute(delete(YJUsers).where(YJUsers.usr_id.in_(created_users)))
+    db.commit()
+    db.close()
+
+@contextmanager
+def count_queries():
+    """블록 안에서 API 서버 엔진으로 실행된 SQL 문 수"""
+    from app.database import async_engine
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+def test_get_post_query_count_is_bounded(client, make_post):
+    small_post = make_post(commenters=1)
+    large_post = make_post(commenters=200)
+
+    with count_queries() as small:
+        response = client.get(f"/api/posts/{small_post}")
+    assert response.status_code == 200
+
+    with count_queries() as large:
+        response = client.get(f"/api/posts/{large_post}")
+    assert response.status_code == 200
+
+    body = response.json()
+    assert len({comment["author"]["name"] for comment in body["comments"]}) == len(body["comments"])
+    assert all(comment["replies"] for comment in body["comments"])
+    # 댓글 작성자 수와 관계없이 같은 쿼리 수
+    assert len(large) == len(small)
+    assert len(large) <= MAX_GET_POST_QUERIES
+
+def test_not_modified_revisit_counts_a_view(client, make_post):
+    from app.utils.view_counter import view_counter
+
+    post_no = make_post(commenters=1)
+    before = view_counter.pending(post_no)
+
+    response = client.get(f"/api/posts/{post_no}")
+    etag = response.headers["etag"]
+    # 같은 ETag에서도 본문의 조회수가 바뀌므로 약한 ETag
+    assert etag.startswith('W/"')
+
+    response = client.get(f"/api/posts/{post_no}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    # 304로 응답한 재방문도 조회수에 집계
+    assert view_counter.pending(post_no) == before + 2
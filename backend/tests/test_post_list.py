@@ -0,0 +1,151 @@
+import uuid
+import pytest
+from sqlalchemy import delete
+from conftest import requires_database
+
+pytestmark = requires_database
+
+@pytest.fixture
+def author_posts():
+    """한 작성자의 게시글 7개 (그중 3개는 작성일시가 없는 기존 게시글), 테스트 후 삭제"""
+    from datetime import datetime, timedelta
+    from app.database import SessionLocal
+    from app.models.yj_posts import YJPosts
+
+    author = f"list-{uuid.uuid4().hex[:8]}"
+    base = datetime(2024, 1, 1)
+    db = SessionLocal()
+    posts = [
+        YJPosts(title=f"글 {i}", contents="내용", author_usrid=author,
+                created_at=base + timedelta(days=i % 2))
+        for i in range(4)
+    ]
+    db.add_all(posts)
+    db.flush()
+    legacy = [YJPosts(title=f"기존 글 {i}", contents="내용", author_usrid=author) for i in range(3)]
+    db.add_all(legacy)
+    db.flush()
+    for post in legacy:
+        post.created_at = None
+    db.commit()
+    post_nos = [post.post_no for post in [*posts, *legacy]]
+
+    yield author, post_nos
+
+    db.execute(delete(YJPosts).where(YJPosts.post_no.in_(post_nos)))
+    db.commit()
+    db.close()
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_cursor_pages_include_posts_without_created_at(client, author_posts, sort_order):
+    author, post_nos = author_posts
+    params = {"author_id": author, "size": 2, "sortBy": "createdAt", "sortOrder": sort_order, "include_total": False}
+
+    seen = []
+    response = client.get("/api/posts", params=params)
+    while True:
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(post["id"] for post in body["posts"])
+        if not body["nextCursor"]:
+            break
+        response = client.get("/api/posts", params={**params, "after": body["nextCursor"]})
+
+    # 모든 게시글이 한 번씩, OFFSET 방식과 같은 순서로 조회됨
+    assert sorted(seen) == sorted(post_nos)
+    offset_page = client.get("/api/posts", params={**params, "size": len(post_nos)}).json()
+    assert seen == [post["id"] for post in offset_page["posts"]]
+
+def test_search_total_is_refreshed_after_update(client):
+    from app.database import SessionLocal
+    from app.models.yj_posts import YJPosts
+
+    keyword = f"검색어{uuid.uuid4().hex[:8]}"
+    created = client.post("/api/posts", data={"title": f"{keyword} 제목", "content": "내용"})
+    assert created.status_code == 200
+    post_no = created.json()["id"]
+    params = {"search": keyword, "search_type": "title"}
+    try:
+        assert client.get("/api/posts", params=params).json()["total"] == 1
+
+        # 수정으로 검색어가 빠지면 캐시된 게시글 수도 바로 바뀜
+        updated = client.put(f"/api/posts/{post_no}", data={"title": "다른 제목", "content": "내용"})
+        assert updated.status_code == 200
+        assert client.get("/api/posts", params=params).json()["total"] == 0
+    finally:
+        db = SessionLocal()
+        db.execute(delete(YJPosts).where(YJPosts.post_no == post_no))
+        db.commit()
+        db.close()
+
+def test_list_cache_is_invalidated_when_counts_change(client):
+    from app.database import SessionLocal
+    from app.models.yj_posts import YJPosts
+
+    author = f"counts-{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    post = YJPosts(title="제목", contents="내용", author_usrid=author)
+    db.add(post)
+    db.commit()
+    params = {"author_id": author}
+
+    def listed() -> dict:
+        return client.get("/api/posts", params=params).json()["posts"][0]
+
+    try:
+        assert (listed()["commentCount"], listed()["attachmentCount"]) == (0, 0)
+
+        # 댓글/첨부파일 추가와 삭제가 캐시된 목록에도 바로 반영됨
+        comment_id = client.post(f"/api/posts/{post.post_no}/comments", data={"content": "댓글"}).json()["comment_id"]
+        assert listed()["commentCount"] == 1
+        client.delete(f"/api/comments/{comment_id}")
+        assert listed()["commentCount"] == 0
+
+        upload_url = client.post(f"/api/posts/{post.post_no}/uploads", json={"filename": "a.txt", "size": 3}).headers["location"]
+        client.patch(upload_url, content=b"abc", headers={"Content-Type": "application/offset+octet-stream", "Upload-Offset": "0"})
+        assert client.post(f"{upload_url}/complete").status_code == 200
+        assert listed()["attachmentCount"] == 1
+    finally:
+        from app.models.yj_attachments import YJAttachments
+        from app.models.yj_comments import YJComments
+        db.execute(delete(YJAttachments).where(YJAttachments.post_no == post.post_no))
+        db.execute(delete(YJComments).where(YJComments.post_no == post.post_no))
+        db.execute(delete(YJPosts).where(YJPosts.post_no == post.post_no))
+        db.commit()
+        db.close()
+
+def test_author_search_uses_indexed_name(client):
+    from app.database import SessionLocal
+    from app.models.yj_posts import YJPosts
+    from app.models.yj_users import YJUsers
+
+    name = f"작성자{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    user = db.get(YJUsers, "tester")
+    created_user = user is None
+    if created_user:
+        user = YJUsers(usr_id="tester", usr_nm=name, pwd="x")
+        db.add(user)
+    original_name = user.usr_nm
+    user.usr_nm = name
+    db.commit()
+
+    created = client.post("/api/posts", data={"title": "제목", "content": "내용"})
+    assert created.status_code == 200
+    post_no = created.json()["id"]
+    try:
+        # 작성자 이름은 search_vector에 함께 색인되어 일부만 입력해도 찾음
+        found = client.get("/api/posts", params={"search": name[2:], "search_type": "author"}).json()
+        assert [post["id"] for post in found["posts"]] == [post_no]
+        # 기본(제목+내용) 검색에는 작성자 이름이 섞이지 않음
+        assert client.get("/api/posts", params={"search": name}).json()["total"] == 0
+        # 토큰이 없는 검색어는 ILIKE로 전체를 훑지 않고 결과 없음
+        assert client.get("/api/posts", params={"search": "!!", "search_type": "title"}).json()["total"] == 0
+    finally:
+        db.execute(delete(YJPosts).where(YJPosts.post_no == post_no))
+        if created_user:
+            db.delete(user)
+        else:
+            user.usr_nm = original_name
+        db.commit()
+        db.close()
@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+from sqlalchemy import delete
+from conftest import requires_database
+
+pytestmark = requires_database
+
+OFFSET_HEADERS = {"Content-Type": "application/offset+octet-stream"}
+
+@pytest.fixture
+def post_no():
+    """업로드할 게시글, 테스트 후 업로드 세션과 함께 삭제"""
+    from app.database import SessionLocal
+    from app.models.yj_posts import YJPosts
+    from app.models.yj_uploads import YJUploads
+
+    db = SessionLocal()
+    post = YJPosts(title="제목", contents="내용", author_usrid="tester")
+    db.add(post)
+    db.commit()
+
+    yield post.post_no
+
+    db.execute(delete(YJUploads).where(YJUploads.post_no == post.post_no))
+    db.execute(delete(YJPosts).where(YJPosts.post_no == post.post_no))
+    db.commit()
+    db.close()
+
+@pytest.fixture
+def upload_url(client, post_no):
+    """10바이트 업로드 세션의 URL"""
+    response = client.post(f"/api/posts/{post_no}/uploads", json={"filename": "a.txt", "size": 10})
+    assert response.status_code == 201
+    return response.headers["location"]
+
+def test_resumable_size_defaults_to_upload_limit(client, post_no):
+    from app.utils.uploads import MAX_FILE_SIZE
+
+    # 이어 올리기도 일반 업로드와 같은 최대 크기를 넘을 수 없음
+    response = client.post(f"/api/posts/{post_no}/uploads", json={"filename": "a.txt", "size": MAX_FILE_SIZE + 1})
+    assert response.status_code == 400
+    response = client.post(f"/api/posts/{post_no}/uploads", json={"filename": "a.txt", "size": MAX_FILE_SIZE})
+    assert response.status_code == 201
+
+def test_concurrent_patches_at_same_offset_do_not_mix(client, upload_url):
+    import httpx
+    from app.utils.upload_sessions import part_path
+
+    async def body(data: bytes):
+        # 두 요청이 동시에 본문을 받는 중이 되도록 나눠서 천천히 전송
+        for i in range(0, len(data), 2):
+            yield data[i:i + 2]
+            await asyncio.sleep(0.01)
+
+    async def send_both():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(
+                http.patch(upload_url, content=body(data), headers={**OFFSET_HEADERS, "Upload-Offset": "0"})
+                for data in (b"AAAAAAAAAA", b"BBBBBBBB")
+            ))
+
+    first, second = client.portal.call(send_both)
+    # 하나만 반영되고 나머지는 409
+    assert sorted([first.status_code, second.status_code]) == [204, 409]
+    winner = b"AAAAAAAAAA" if first.status_code == 204 else b"BBBBBBBB"
+    assert client.head(upload_url).headers["upload-offset"] == str(len(winner))
+
+    # 받는 중인 파일에는 반영된 요청의 데이터만 있음
+    upload_id = upload_url.rsplit("/", 1)[-1]
+    with open(part_path(upload_id), "rb") as part:
+        assert part.read() == winner
@@ -27,6 +27,7 @@ interface Post {
     mime_type: string;
   }>;
   comments: Comment[];  // Comment 인터페이스를 사용하도록 수정
+  commentsNextCursor?: string | null;  // 다음 댓글 페이지 커서 (마지막 페이지면 null)
 }
 
 // 댓글 응답 타입
@@ -46,9 +47,28 @@ interface Comment {
   updatedAt: string;
   parent_id: number;
   replies: Comment[];
+  replyCount?: number;  // 삭제되지 않은 직속 답글 수 (replies는 미리보기만 포함)
   isDeleted?: boolean;
 }
 
+// 댓글/답글 페이지 응답 타입
+interface CommentPage {
+  comments: Comment[];
+  nextCursor: string | null;
+}
+
+// 댓글 트리에서 commentId 댓글만 바꾼 새 목록 반환
+const updateComment = (
+  comments: Comment[],
+  commentId: number,
+  update: (comment: Comment) => Comment
+): Comment[] =>
+  comments.map(comment =>
+    comment.id === commentId
+      ? update(comment)
+      : { ...comment, replies: updateComment(comment.replies || [], commentId, update) }
+  );
+
 // 게시글 상세 페이지 컴포넌트
 const PostDetail: React.FC = () => {
   // 라우터 파라미터 및 상태 정의
@@ -58,6 +78,8 @@ const PostDetail: React.FC = () => {
   const [comment, setComment] = useState(''); // 댓글 입력값
   const [currentUserId, setCurrentUserId] = useState<string>(''); // 현재 로그인 유저 ID
   const [visibleComments, setVisibleComments] = useState(5); // 초기에 보여줄 댓글 수
+  const [commentsCursor, setCommentsCursor] = useState<string | null>(null); // 다음 댓글 페이지 커서
+  const [replyCursors, setReplyCursors] = useState<Record<number, string | null>>({}); // 댓글별 다음 답글 페이지 커서
   const [isLoading, setIsLoading] = useState(true); // 로딩 상태
   const [editingCommentId, setEditingCommentId] = useState<number | null>(null); // 수정 중인 댓글 ID
   const [editingCommentContent, setEditingCommentContent] = useState(''); // 수정 중인 댓글 내용
@@ -80,8 +102,11 @@ const PostDetail: React.FC = () => {
           'Authorization': `Bearer ${token}`
         }
       });
-      // setPost로 게시글 데이터 저장
-      setPost(response.data as Post);
+      // setPost로 게시글 데이터 저장 (댓글은 첫 페이지만 포함)
+      const data = response.data as Post;
+      setPost(data);
+      setCommentsCursor(data.commentsNextCursor ?? null);
+      setReplyCursors({});
       setIsLoading(false);
     } catch (error) {
       // 에러 발생 시 처리
@@ -212,9 +237,51 @@ const PostDetail: React.FC = () => {
     return '';
   };
 
-  // 댓글 더보기 처리
-  const handleLoadMoreComments = () => {
-    setVisibleComments(prev => prev + 5); // 5개씩 더 보여주기
+  // 댓글 더보기 처리 (받아 둔 댓글을 5개씩 더 보여주고, 다 보여줬으면 다음 페이지 조회)
+  const handleLoadMoreComments = async () => {
+    if (!post) return;
+    if (visibleComments < post.comments.length || !commentsCursor) {
+      setVisibleComments(prev => prev + 5); // 5개씩 더 보여주기
+      return;
+    }
+    try {
+      const response = await axios.get(`http://localhost:8000/api/posts/${id}/comments`, {
+        params: { sortOrder: 'desc', after: commentsCursor },
+        headers: {
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        }
+      });
+      const page = response.data as CommentPage;
+      setPost(prev => prev && { ...prev, comments: [...prev.comments, ...page.comments] });
+      setCommentsCursor(page.nextCursor);
+      setVisibleComments(prev => prev + 5);
+    } catch (error) {
+      alert('댓글을 불러오지 못했습니다.');
+    }
+  };
+
+  // 답글 더보기 처리 (처음에는 미리보기 답글부터 다시 조회하고, 이후에는 커서로 다음 페이지 조회)
+  const handleLoadMoreReplies = async (commentId: number) => {
+    const cursor = replyCursors[commentId];
+    try {
+      const response = await axios.get(`http://localhost:8000/api/comments/${commentId}/replies`, {
+        params: cursor ? { after: cursor } : {},
+        headers: {
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        }
+      });
+      const page = response.data as CommentPage;
+      setPost(prev => prev && {
+        ...prev,
+        comments: updateComment(prev.comments, commentId, target => ({
+          ...target,
+          replies: cursor ? [...target.replies, ...page.comments] : page.comments
+        }))
+      });
+      setReplyCursors(prev => ({ ...prev, [commentId]: page.nextCursor }));
+    } catch (error) {
+      alert('답글을 불러오지 못했습니다.');
+    }
   };
 
   // 첨부파일 다운로드 처리
@@ -487,6 +554,8 @@ const PostDetail: React.FC = () => {
         isCommentTooLong={isCommentTooLong}
         visibleComments={visibleComments}
         onLoadMoreComments={handleLoadMoreComments}
+        hasMoreComments={commentsCursor !== null}
+        onLoadMoreReplies={handleLoadMoreReplies}
         currentUserId={currentUserId}
         editingCommentId={editingCommentId}
         editingCommentContent={editingCommentContent}
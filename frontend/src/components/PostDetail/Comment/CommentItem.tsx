@@ -14,6 +14,7 @@ export interface Comment {
   updatedAt: string;
   parent_id: number;
   replies: Comment[];
+  replyCount?: number;  // 삭제되지 않은 직속 답글 수 (replies는 미리보기만 포함할 수 있음)
   isDeleted?: boolean;
 }
 
@@ -33,6 +34,7 @@ interface CommentItemProps {
   onChangeReplyContent: (v: string) => void;
   onSaveReply: (parentCommentId: number) => void;
   onCancelReply: () => void;
+  onLoadMoreReplies?: (commentId: number) => void;
 }
 
 // CommentItem: 개별 댓글/답글(수정, 삭제, 답글 등) 컴포넌트
@@ -52,7 +54,10 @@ const CommentItem: React.FC<CommentItemProps> = ({
   onChangeReplyContent,
   onSaveReply,
   onCancelReply,
+  onLoadMoreReplies,
 }) => {
+  const loadedReplies = comment.replies ? comment.replies.length : 0;
+
   const date = new Date(comment.createdAt);
   const formattedDate = new Intl.DateTimeFormat('ko-KR', {
     year: 'numeric',
@@ -159,10 +164,20 @@ const CommentItem: React.FC<CommentItemProps> = ({
                 onChangeReplyContent={onChangeReplyContent}
                 onSaveReply={onSaveReply}
                 onCancelReply={onCancelReply}
+                onLoadMoreReplies={onLoadMoreReplies}
               />
             ))}
         </div>
       )}
+      {/* 답글 더보기 (미리보기에 없는 답글은 필요할 때 조회) */}
+      {onLoadMoreReplies && (comment.replyCount ?? 0) > loadedReplies && (
+        <button
+          onClick={() => onLoadMoreReplies(comment.id)}
+          className="ml-4 mt-1 text-xs text-blue-500 hover:underline hover:text-blue-700 px-2 py-1 rounded transition"
+        >
+          답글 더보기 ({loadedReplies}/{comment.replyCount})
+        </button>
+      )}
     </div>
   );
 };
@@ -15,6 +15,7 @@ interface Comment {
   updatedAt: string;
   parent_id: number;
   replies: Comment[];
+  replyCount?: number;
   isDeleted?: boolean;
 }
 
@@ -26,6 +27,8 @@ interface PostDetailCommentsProps {
   isCommentTooLong: boolean;
   visibleComments: number;
   onLoadMoreComments: () => void;
+  hasMoreComments: boolean;
+  onLoadMoreReplies: (commentId: number) => void;
   currentUserId: string;
   editingCommentId: number | null;
   editingCommentContent: string;
@@ -50,6 +53,8 @@ const PostDetailComments: React.FC<PostDetailCommentsProps> = ({
   isCommentTooLong,
   visibleComments,
   onLoadMoreComments,
+  hasMoreComments,
+  onLoadMoreReplies,
   currentUserId,
   editingCommentId,
   editingCommentContent,
@@ -98,14 +103,16 @@ const PostDetailComments: React.FC<PostDetailCommentsProps> = ({
                 onChangeReplyContent={onChangeReplyContent}
                 onSaveReply={onSaveReply}
                 onCancelReply={onCancelReply}
+                onLoadMoreReplies={onLoadMoreReplies}
               />
             ))}
-          {comments.length > visibleComments && (
+          {/* 받아 둔 댓글을 다 보여줬으면 서버에서 다음 페이지를 조회 */}
+          {(comments.length > visibleComments || hasMoreComments) && (
             <button
               onClick={onLoadMoreComments}
               className="w-full py-2 mt-4 bg-gray-100 rounded text-gray-600 text-sm"
             >
-              댓글 더보기 ({visibleComments}/{comments.length})
+              댓글 더보기 ({Math.min(visibleComments, comments.length)}/{comments.length}{hasMoreComments ? '+' : ''})
             </button>
           )}
         </>